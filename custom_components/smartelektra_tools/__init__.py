@@ -1,26 +1,53 @@
 from __future__ import annotations
 
+import time
 from typing import Any
 
-import voluptuous as vol
+import yaml
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import config_validation as cv
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 
 from .const import (
     DOMAIN,
     CONF_HOST,
     CONF_PORT,
     CONF_TIMEOUT,
-    DEFAULT_HR_NEW_SLAVE,
-    DEFAULT_HR_BUTTON_MODE,
-    DEFAULT_HR_OUTPUT_LEVEL,
-    DEFAULT_COIL_TEST_OUTPUT,
+    CONF_BROADCAST_DELAY,
+    CONF_SCAN_INTERVAL,
+    CONF_WRITE_WINDOW,
+    CONF_CACHE_TTL,
+    CONF_CACHE_SIZE,
+    CONF_CONNECTIONS,
+    CONF_GATEWAY_TURNAROUND,
+    CONF_REGISTER_MAP,
+    CONF_PUBLISH_INTERVAL,
+    CONF_FULL_REFRESH_INTERVAL,
+    DATA_POOL,
+    DEFAULT_BROADCAST_DELAY,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WRITE_WINDOW,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_REGISTER_MAP,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_FULL_REFRESH_INTERVAL,
+    MAPS_DIR,
 )
-from .modbus_client import ModbusTcpClientCompat
+from .compat import load_api
+from .coordinator import SEToolsCoordinator
+from .devices import SlaveDirectory, parse_slave_identifier, slave_identifier
+from .journal import WriteJournal, async_remove_journal
+from .modbus_client import AsyncModbusTcpClientCompat, ModbusClientPool, async_gateway_key
+from .publisher import StatePublisher
+from .register_map import BUILTIN_MAPS_DIR, RegisterMap, list_maps, load_map
+from .services import async_setup_services
 
 
-PLATFORMS: list[str] = ["number", "button", "select", "switch"]
+PLATFORMS: list[str] = ["number", "button", "select", "switch", "sensor"]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 def _get_store(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
@@ -28,7 +55,7 @@ def _get_store(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
     return hass.data[DOMAIN][entry_id]
 
 
-def get_client(hass: HomeAssistant, entry_id: str) -> ModbusTcpClientCompat:
+def get_client(hass: HomeAssistant, entry_id: str) -> AsyncModbusTcpClientCompat:
     return _get_store(hass, entry_id)["client"]
 
 
@@ -36,121 +63,199 @@ def get_state(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
     return _get_store(hass, entry_id)["state"]
 
 
-async def async_run_blocking(hass: HomeAssistant, func, *args):
-    return await hass.async_add_executor_job(func, *args)
+def get_coordinator(hass: HomeAssistant, entry_id: str) -> SEToolsCoordinator:
+    return _get_store(hass, entry_id)["coordinator"]
+
+
+def get_slaves(hass: HomeAssistant, entry_id: str) -> SlaveDirectory:
+    return _get_store(hass, entry_id)["slaves"]
+
+
+def get_publisher(hass: HomeAssistant, entry_id: str) -> StatePublisher:
+    return _get_store(hass, entry_id)["publisher"]
+
+
+def get_register_map(hass: HomeAssistant, entry_id: str) -> RegisterMap:
+    return _get_store(hass, entry_id)["map"]
+
+
+def map_dirs(hass: HomeAssistant) -> tuple[str, str]:
+    """Built-in map directory first, then the user's (whose files win on equal names)."""
+    return BUILTIN_MAPS_DIR, hass.config.path(DOMAIN, MAPS_DIR)
+
+
+def _load_register_map(dirs: tuple[str, ...], map_id: str) -> RegisterMap:
+    maps = list_maps(*dirs)
+    if map_id not in maps:
+        raise ValueError(f"register map {map_id!r} not found")
+    return load_map(maps[map_id])
+
+
+def _prepare(dirs: tuple[str, ...], map_id: str) -> RegisterMap:
+    """Blocking part of the setup: import pymodbus (once per process) and compile the map."""
+    load_api()
+    return _load_register_map(dirs, map_id)
+
+
+def get_pool(hass: HomeAssistant) -> ModbusClientPool:
+    """Return the process-wide gateway pool shared by all entries."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_POOL, ModbusClientPool())
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    t_setup = time.monotonic()
     host = entry.data[CONF_HOST]
     port = entry.data[CONF_PORT]
     timeout = entry.data[CONF_TIMEOUT]
+    broadcast_delay = entry.data.get(CONF_BROADCAST_DELAY, DEFAULT_BROADCAST_DELAY)
+    map_id = entry.options.get(CONF_REGISTER_MAP, DEFAULT_REGISTER_MAP)
+    try:
+        # parsed and compiled once; entities and the poller use the precomputed tables
+        register_map = await hass.async_add_executor_job(_prepare, map_dirs(hass), map_id)
+    except (OSError, ValueError, yaml.YAMLError) as err:
+        raise ConfigEntryError(f"Cannot load register map {map_id}: {err}") from err
 
-    client = ModbusTcpClientCompat(host=host, port=port, timeout=timeout)
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
-        "client": client,
-        "state": {
-            # Values exposed as entities (restored on first add)
-            "target_slave": 0,
-            "new_slave": 1,
-            "hr_new_slave": DEFAULT_HR_NEW_SLAVE,
-            "hr_button_mode": DEFAULT_HR_BUTTON_MODE,
-            "hr_output_level": DEFAULT_HR_OUTPUT_LEVEL,
-            "coil_test_output": DEFAULT_COIL_TEST_OUTPUT,
-            "button_mode": "mono",  # mono|bi
-            "output_level": "high",  # low|high
-            "test_output": False,
-        },
-    }
-
-    async def handle_set_slave_id(call: ServiceCall) -> None:
-        new_slave = call.data["new_slave"]
-        # use broadcast by default (0)
-        target_slave = call.data.get("target_slave", 0)
-        hr_address = call.data.get("hr_address", DEFAULT_HR_NEW_SLAVE)
-
-        # Validate ranges
-        if not (1 <= new_slave <= 247):
-            raise vol.Invalid("new_slave must be in range 1..247")
-        if not (0 <= target_slave <= 247):
-            raise vol.Invalid("target_slave must be in range 0..247 (0=broadcast)")
-
-        # Broadcast often yields no reply; pymodbus may throw because of timeout/None.
-        # We treat broadcast as 'best effort' and do not fail on missing response.
-        try:
-            await async_run_blocking(hass, client.write_register, hr_address, int(new_slave), int(target_slave))
-        except Exception:
-            if int(target_slave) == 0:
-                # swallow broadcast no-reply errors
-                return
-            raise
-
-    async def handle_write_coil(call: ServiceCall) -> None:
-        slave = call.data["slave"]
-        address = call.data["address"]
-        value = call.data["value"]
-        await async_run_blocking(hass, client.write_coil, int(address), bool(value), int(slave))
-
-    async def handle_write_register(call: ServiceCall) -> None:
-        slave = call.data["slave"]
-        address = call.data["address"]
-        value = call.data["value"]
-        await async_run_blocking(hass, client.write_register, int(address), int(value), int(slave))
-
-    hass.services.async_register(
-        DOMAIN,
-        "set_slave_id",
-        handle_set_slave_id,
-        schema=vol.Schema(
-            {
-                vol.Required("new_slave"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
-                vol.Optional("target_slave", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
-                vol.Optional("hr_address", default=DEFAULT_HR_NEW_SLAVE): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-            }
-        ),
+    # entries for one gateway share its client, however the host was spelled
+    client = get_pool(hass).acquire(
+        host,
+        port,
+        key=await async_gateway_key(host, port),
+        timeout=timeout,
+        broadcast_delay=broadcast_delay,
+        write_window=entry.options.get(CONF_WRITE_WINDOW, DEFAULT_WRITE_WINDOW),
+        cache_ttl=entry.options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+        cache_size=entry.options.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE),
+        connections=entry.options.get(CONF_CONNECTIONS),
+        turnaround=entry.options.get(CONF_GATEWAY_TURNAROUND),
     )
+    startup: dict[str, Any] = {"prepare_ms": round((time.monotonic() - t_setup) * 1000, 1)}
+
+    async def _prewarm() -> None:
+        # open the first socket now rather than on the first user action
+        t0 = time.monotonic()
+        startup["first_connect_ok"] = await client.connect()
+        startup["first_connect_ms"] = round((time.monotonic() - t0) * 1000, 1)
 
-    hass.services.async_register(
-        DOMAIN,
-        "write_coil",
-        handle_write_coil,
-        schema=vol.Schema(
-            {
-                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
-                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-                vol.Required("value"): cv.boolean,
-            }
-        ),
+    entry.async_on_unload(
+        hass.async_create_background_task(_prewarm(), f"{DOMAIN} connect {host}:{port}").cancel
     )
+    state: dict[str, Any] = {
+        # Values of the gateway's tool entities (restored on first add)
+        "target_slave": 0,
+        "new_slave": 1,
+    }
 
-    hass.services.async_register(
-        DOMAIN,
-        "write_register",
-        handle_write_register,
-        schema=vol.Schema(
-            {
-                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
-                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-                vol.Required("value"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-            }
-        ),
+    # The gateway is a device of its own; every slave hangs below it (via_device)
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.entry_id)},
+        name="SmartElektra Tools",
+        manufacturer="SmartElektra",
+        model="Modbus TCP gateway",
     )
+    # Slaves found by scan/provisioning or targeted by hand; the device registry remembers them
+    known = []
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        for domain, identifier in device.identifiers:
+            slave_id = parse_slave_identifier(entry.entry_id, identifier) if domain == DOMAIN else None
+            if slave_id is not None:
+                known.append(slave_id)
+    slaves = SlaveDirectory(register_map, known)
+    coordinator = SEToolsCoordinator(
+        hass,
+        client,
+        slaves,
+        register_map,
+        entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        entry.options.get(CONF_FULL_REFRESH_INTERVAL, DEFAULT_FULL_REFRESH_INTERVAL),
+    )
+    journal = WriteJournal(hass, client, entry.entry_id)
+    await journal.async_load()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "client": client,
+        "state": state,
+        "slaves": slaves,
+        "coordinator": coordinator,
+        "map": register_map,
+        "publisher": StatePublisher(entry.options.get(CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL)),
+        "journal": journal,
+        "startup": startup,
+    }
 
     # Create entities (numbers/buttons/selects/switches)
+    t_platforms = time.monotonic()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    startup["platforms_ms"] = round((time.monotonic() - t_platforms) * 1000, 1)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    @callback
+    def _availability_changed() -> None:
+        # push the new availability to entities; re-poll as soon as the link is back
+        coordinator.async_update_listeners()
+        if client.available:
+            hass.async_create_task(coordinator.async_request_refresh())
 
+    entry.async_on_unload(client.add_listener(_availability_changed))
+
+    @callback
+    def _slaves_changed(added: list[int], removed: list[int]) -> None:
+        # re-addressed or forgotten slaves take their device (and entities) with them
+        for slave_id in removed:
+            identifier = (DOMAIN, slave_identifier(entry.entry_id, slave_id))
+            device = device_registry.async_get_device(identifiers={identifier})
+            if device is not None:
+                device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+        if added:
+            hass.async_create_task(coordinator.async_request_refresh())
+
+    entry.async_on_unload(slaves.add_listener(_slaves_changed))
+    # writes queued before a restart go out as soon as the gateway answers
+    journal.start()
+    if slaves:
+        # first poll in the background; setup does not wait for the bus
+        hass.async_create_task(coordinator.async_request_refresh())
+    startup["setup_ms"] = round((time.monotonic() - t_setup) * 1000, 1)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: dr.DeviceEntry
+) -> bool:
+    """Allow deleting a slave device; the gateway device stays with the entry."""
+    for domain, identifier in device_entry.identifiers:
+        if domain != DOMAIN:
+            continue
+        slave_id = parse_slave_identifier(entry.entry_id, identifier)
+        if slave_id is None:
+            return False
+        if entry.entry_id in hass.data.get(DOMAIN, {}):
+            get_slaves(hass, entry.entry_id).forget(slave_id)
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await async_remove_journal(hass, entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     store = hass.data[DOMAIN].pop(entry.entry_id)
-    client: ModbusTcpClientCompat = store["client"]
-    await hass.async_add_executor_job(client.close)
-    if not hass.data[DOMAIN]:
+    store["publisher"].cancel()
+    await store["journal"].async_close()
+    pool = get_pool(hass)
+    await pool.release(store["client"])
+    if not pool and list(hass.data[DOMAIN]) == [DATA_POOL]:
         hass.data.pop(DOMAIN)
     return unload_ok
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Iterable, Optional
+
+from .const import DEFAULT_BACKUP_CONCURRENCY, PRIORITY_BULK
+from .modbus_client import AsyncModbusTcpClientCompat
+from .reader import async_read_range
+from .register_map import plan_runs
+
+BACKUP_VERSION = 1
+
+# backup table -> reader table
+_TABLES = {"coils": "coils", "registers": "holding_registers"}
+
+
+def backup_path(base_dir: str, slave_id: int) -> str:
+    return os.path.join(base_dir, f"slave_{slave_id}.json")
+
+
+def save_backup(path: str, data: dict[str, Any]) -> None:
+    """Write a backup atomically (blocking, run in the executor)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_backup(path: str) -> Optional[dict[str, Any]]:
+    """Return the stored backup or None if there is none (blocking)."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return None
+    if data.get("version") != BACKUP_VERSION:
+        raise ValueError(f"{path}: unsupported backup version {data.get('version')}")
+    return data
+
+
+async def async_backup_device(
+    client: AsyncModbusTcpClientCompat,
+    slave_id: int,
+    coil_ranges: Iterable[tuple[int, int]],
+    register_ranges: Iterable[tuple[int, int]],
+) -> dict[str, Any]:
+    """Block-read the given (address, count) ranges of one slave into a backup dict."""
+    ranges = {"coils": list(coil_ranges), "registers": list(register_ranges)}
+    jobs = [
+        async_read_range(client, _TABLES[table], address, count, slave_id, priority=PRIORITY_BULK)
+        for table, table_ranges in ranges.items()
+        for address, count in table_ranges
+    ]
+    blocks = iter(await asyncio.gather(*jobs))
+    data: dict[str, Any] = {"version": BACKUP_VERSION, "slave": slave_id, "created": int(time.time())}
+    for table, table_ranges in ranges.items():
+        data[table] = [
+            {"address": address, "values": [int(v) for v in next(blocks)]} for address, _count in table_ranges
+        ]
+    return data
+
+
+async def async_backup_devices(
+    client: AsyncModbusTcpClientCompat,
+    slaves: Iterable[int],
+    coil_ranges: Iterable[tuple[int, int]],
+    register_ranges: Iterable[tuple[int, int]],
+    concurrency: int = DEFAULT_BACKUP_CONCURRENCY,
+) -> list[tuple[int, Optional[dict[str, Any]], Optional[str]]]:
+    """Back up several slaves, at most ``concurrency`` at a time; returns (slave, backup, error)."""
+    coil_ranges = list(coil_ranges)
+    register_ranges = list(register_ranges)
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(slave_id: int) -> tuple[int, Optional[dict[str, Any]], Optional[str]]:
+        async with sem:
+            try:
+                return slave_id, await async_backup_device(client, slave_id, coil_ranges, register_ranges), None
+            except Exception as err:
+                return slave_id, None, str(err) or type(err).__name__
+
+    return list(await asyncio.gather(*(run(slave_id) for slave_id in slaves)))
+
+
+async def _restore_one(
+    client: AsyncModbusTcpClientCompat,
+    slave_id: int,
+    data: Optional[dict[str, Any]],
+    skip_registers: set[int],
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    result: dict[str, Any] = {"slave": slave_id, "written": 0, "mismatched": []}
+    if data is None:
+        return {**result, "status": "failed", "error": "no backup", "elapsed": 0.0}
+    wanted: dict[str, dict[int, int]] = {}
+    for table in _TABLES:
+        values: dict[int, int] = {}
+        for block in data.get(table, []):
+            for offset, value in enumerate(block["values"]):
+                values[block["address"] + offset] = int(value)
+        if table == "registers":
+            for addr in skip_registers:
+                values.pop(addr, None)
+        wanted[table] = values
+    try:
+        writes = []
+        for start, values in plan_runs(wanted["coils"]):
+            writes.append(
+                client.write_coils(start, [bool(v) for v in values], slave_id, force=True, priority=PRIORITY_BULK)
+            )
+        for start, values in plan_runs(wanted["registers"]):
+            writes.append(client.write_registers(start, values, slave_id, force=True, priority=PRIORITY_BULK))
+        await asyncio.gather(*writes)
+        result["written"] = sum(len(v) for v in wanted.values())
+        # verify against the device, not against what the cache just stored
+        client.invalidate_slave(slave_id)
+        for table, values in wanted.items():
+            runs = plan_runs(values)
+            blocks = await asyncio.gather(
+                *(
+                    async_read_range(client, _TABLES[table], start, len(run), slave_id, priority=PRIORITY_BULK)
+                    for start, run in runs
+                )
+            )
+            for (start, run), block in zip(runs, blocks):
+                result["mismatched"].extend(
+                    start + i for i, (want, got) in enumerate(zip(run, block)) if int(got) != want
+                )
+    except Exception as err:
+        error = str(err) or type(err).__name__
+        return {**result, "status": "failed", "error": error, "elapsed": round(loop.time() - t0, 3)}
+    ok = not result["mismatched"]
+    return {
+        **result,
+        "status": "ok" if ok else "failed",
+        "error": None if ok else "read-back differs",
+        "elapsed": round(loop.time() - t0, 3),
+    }
+
+
+async def async_restore_devices(
+    client: AsyncModbusTcpClientCompat,
+    backups: Iterable[tuple[int, Optional[dict[str, Any]]]],
+    skip_registers: Iterable[int] = (),
+    concurrency: int = DEFAULT_BACKUP_CONCURRENCY,
+) -> dict[str, Any]:
+    """Write (slave, backup) pairs back with FC15/FC16, at most ``concurrency`` slaves at a time.
+
+    Registers in ``skip_registers`` (by default the slave-ID register) are left
+    untouched so a restore never re-addresses a device.
+    """
+    skip = set(skip_registers)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+
+    async def run(slave_id: int, data: Optional[dict[str, Any]]) -> dict[str, Any]:
+        async with sem:
+            return await _restore_one(client, slave_id, data, skip)
+
+    devices = list(await asyncio.gather(*(run(slave_id, data) for slave_id, data in backups)))
+    ok = sum(1 for d in devices if d["status"] == "ok")
+    return {"devices": devices, "ok": ok, "failed": len(devices) - ok, "elapsed": round(loop.time() - t0, 3)}
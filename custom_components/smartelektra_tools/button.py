@@ -6,8 +6,9 @@ from homeassistant.components.button import ButtonEntity, ButtonEntityDescriptio
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from . import async_run_blocking, get_client, get_state
-from .const import DOMAIN
+from . import get_client, get_register_map, get_slaves, get_state
+from .const import DOMAIN, PRIORITY_INTERACTIVE
+from .provisioning import async_set_slave_id
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -42,23 +43,33 @@ class SEToolsButton(ButtonEntity):
             "name": "SmartElektra Tools",
         }
 
+    @property
+    def available(self) -> bool:
+        return get_client(self.hass, self.entry.entry_id).available
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        client = get_client(self.hass, self.entry.entry_id)
+        self.async_on_remove(client.add_listener(self.async_write_ha_state))
+
     async def async_press(self) -> None:
         state = get_state(self.hass, self.entry.entry_id)
         client = get_client(self.hass, self.entry.entry_id)
 
         target_slave = int(state.get("target_slave", 0))
         new_slave = int(state.get("new_slave", 1))
-        hr_address = int(state.get("hr_new_slave", 0))
+        hr_address = get_register_map(self.hass, self.entry.entry_id).slave_id_address
 
         if not (1 <= new_slave <= 247):
             raise ValueError("New slave must be 1..247")
         if not (0 <= target_slave <= 247):
             raise ValueError("Target slave must be 0..247")
 
-        try:
-            await async_run_blocking(self.hass, client.write_register, hr_address, new_slave, target_slave)
-        except Exception:
-            # broadcast commonly yields no reply
-            if target_slave == 0:
-                return
-            raise
+        await async_set_slave_id(
+            client,
+            get_slaves(self.hass, self.entry.entry_id),
+            new_slave,
+            target_slave,
+            hr_address,
+            priority=PRIORITY_INTERACTIVE,
+        )
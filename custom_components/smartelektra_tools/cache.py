@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+
+class ShadowCache:
+    """Last known value per (slave, table, address), filled from reads and writes.
+
+    Entries expire after ``ttl`` seconds (0 disables the cache) and the least
+    recently used ones are evicted beyond ``max_entries``. ``hits`` counts writes
+    skipped because the device already holds the value, ``misses`` writes that
+    had to go to the bus.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple[int, str, int], tuple[Any, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, slave_id: int, table: str, address: int) -> Optional[Any]:
+        key = (slave_id, table, address)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stamp = entry
+        if time.monotonic() - stamp > self._ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put_block(self, slave_id: int, table: str, address: int, values: Sequence[Any]) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        for offset, value in enumerate(values):
+            key = (slave_id, table, address + offset)
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def is_noop(self, slave_id: int, table: str, address: int, values: Sequence[Any]) -> bool:
+        """Return True (and count a hit) if every value is already on the device."""
+        if not self.enabled:
+            return False
+        for offset, value in enumerate(values):
+            if self.get(slave_id, table, address + offset) != value:
+                self.misses += 1
+                return False
+        self.hits += 1
+        return True
+
+    def invalidate_slave(self, slave_id: int) -> None:
+        for key in [k for k in self._entries if k[0] == slave_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else None,
+        }
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+
+class ChangeCounters:
+    """Per-slave state of the change counter register, deciding when a full read can be skipped.
+
+    A slave's last full read is reused while its counter still holds the value
+    read just before that full read and ``full_refresh_interval`` has not passed.
+    Slaves whose firmware rejects the counter read are ``rejected`` and always read
+    in full.
+    """
+
+    def __init__(self, full_refresh_interval: float) -> None:
+        self.full_refresh_interval = full_refresh_interval
+        # slave -> (counter read before the last full read, when that read was)
+        self._seen: dict[int, tuple[int, float]] = {}
+        self._rejected: set[int] = set()
+
+    def supported(self, slave: int) -> bool:
+        return slave not in self._rejected
+
+    def reject(self, slave: int) -> None:
+        """The slave has no counter register: read it in full from now on."""
+        self._rejected.add(slave)
+        self._seen.pop(slave, None)
+
+    def unchanged(self, slave: int, counter: int, now: float) -> bool:
+        """True if the last full read of ``slave`` is still current."""
+        seen: Optional[tuple[int, float]] = self._seen.get(slave)
+        return seen is not None and seen[0] == counter and now - seen[1] < self.full_refresh_interval
+
+    def record(self, slave: int, counter: int, now: float) -> None:
+        """Remember the counter read just before a full read made at ``now``."""
+        self._seen[slave] = (counter, now)
+
+    def retain(self, slaves: Iterable[int]) -> None:
+        """Drop the state of slaves that are no longer polled."""
+        keep = set(slaves)
+        for slave in set(self._seen) - keep:
+            del self._seen[slave]
+        self._rejected &= keep
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "full_refresh_interval": self.full_refresh_interval,
+            "tracked": len(self._seen),
+            "without_counter": sorted(self._rejected),
+        }
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .const import DEFAULT_CONNECTIONS, DEFAULT_CONNECTIONS_SERIALIZED
+
+# Client methods called with a slave id; the adapters are built for these only
+CALLS = (
+    "read_coils",
+    "read_discrete_inputs",
+    "read_holding_registers",
+    "read_input_registers",
+    "write_coil",
+    "write_register",
+    "write_coils",
+    "write_registers",
+)
+BROADCAST_CALLS = ("write_coil", "write_register", "write_coils", "write_registers")
+
+# pymodbus renamed the slave keyword twice: unit (2.x) -> slave (3.0) -> device_id (3.10)
+_UNIT_KEYWORDS = ("slave", "device_id", "unit")
+
+Adapter = Callable[..., Any]
+
+
+def _unit_keyword(func: Callable[..., Any]) -> Optional[str]:
+    parameters = inspect.signature(func).parameters
+    for keyword in _UNIT_KEYWORDS:
+        if keyword in parameters:
+            return keyword
+    return None
+
+
+def _adapter(name: str, keyword: Optional[str], extra: Optional[dict[str, Any]] = None) -> Adapter:
+    """Return ``call(client, slave_id, *args, **kwargs)`` invoking ``client.<name>``."""
+    fixed = dict(extra or {})
+    if keyword is None:
+
+        def call(client: Any, slave_id: int, *args: Any, **kwargs: Any) -> Any:
+            return getattr(client, name)(*args, **kwargs, **fixed)
+
+    else:
+
+        def call(client: Any, slave_id: int, *args: Any, **kwargs: Any) -> Any:
+            kwargs[keyword] = slave_id
+            return getattr(client, name)(*args, **kwargs, **fixed)
+
+    return call
+
+
+class PymodbusApi:
+    """The installed pymodbus, resolved once per process.
+
+    ``calls[name]`` / ``sync_calls[name]`` pass the slave id under whatever keyword
+    this release expects; ``broadcast[name]`` also asks for no reply where the
+    release supports it. Nothing is looked up per frame.
+    """
+
+    def __init__(self) -> None:
+        t0 = time.monotonic()
+        import pymodbus
+        from pymodbus.client import AsyncModbusTcpClient, ModbusTcpClient
+        from pymodbus.exceptions import ModbusIOException
+
+        self.version: str = getattr(pymodbus, "__version__", "unknown")
+        self.AsyncModbusTcpClient = AsyncModbusTcpClient
+        self.ModbusTcpClient = ModbusTcpClient
+        self.timeout_errors: tuple[type[BaseException], ...] = (ModbusIOException,)
+        self.pipelines = _pipelines(self.version)
+        # without pipelining, concurrency comes from extra sockets only
+        self.default_connections = DEFAULT_CONNECTIONS if self.pipelines else DEFAULT_CONNECTIONS_SERIALIZED
+        self.keywords: dict[str, Optional[str]] = {}
+        self.calls: dict[str, Adapter] = {}
+        self.sync_calls: dict[str, Adapter] = {}
+        self.broadcast: dict[str, Adapter] = {}
+        for name in CALLS:
+            func = getattr(AsyncModbusTcpClient, name)
+            keyword = self.keywords[name] = _unit_keyword(func)
+            self.calls[name] = _adapter(name, keyword)
+            sync_func = getattr(ModbusTcpClient, name)
+            self.sync_calls[name] = _adapter(name, _unit_keyword(sync_func))
+            if name in BROADCAST_CALLS:
+                extra = (
+                    {"no_response_expected": True}
+                    if "no_response_expected" in inspect.signature(func).parameters
+                    else None
+                )
+                self.broadcast[name] = _adapter(name, keyword, extra)
+        self.load_time = time.monotonic() - t0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "pipelines": self.pipelines,
+            "default_connections": self.default_connections,
+            "slave_keyword": sorted({str(keyword) for keyword in self.keywords.values()}),
+            "load_ms": round(self.load_time * 1000, 1),
+        }
+
+
+def _pipelines(version: str) -> bool:
+    """Return True if the async client keeps several transactions in flight.
+
+    pymodbus < 3.6 matches replies to requests by transaction id; later releases
+    serialize every request behind a lock, so queueing more than one frame there
+    would only make per-request timeouts include time spent waiting for the lock.
+    """
+    try:
+        major, minor = (int(p) for p in version.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) < (3, 6)
+
+
+_api: Optional[PymodbusApi] = None
+_api_lock = threading.Lock()
+
+
+def load_api() -> PymodbusApi:
+    """Import pymodbus and build the adapters (blocking; run it in the executor)."""
+    global _api
+    if _api is None:
+        with _api_lock:
+            if _api is None:
+                _api = PymodbusApi()
+    return _api
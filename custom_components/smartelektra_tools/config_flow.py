@@ -2,31 +2,64 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_HOST, CONF_PORT, CONF_TIMEOUT, DEFAULT_PORT, DEFAULT_TIMEOUT
+from . import map_dirs
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_TIMEOUT,
+    CONF_BROADCAST_DELAY,
+    CONF_SCAN_INTERVAL,
+    CONF_WRITE_WINDOW,
+    CONF_CACHE_TTL,
+    CONF_CACHE_SIZE,
+    CONF_CONNECTIONS,
+    CONF_GATEWAY_TURNAROUND,
+    CONF_REGISTER_MAP,
+    CONF_PUBLISH_INTERVAL,
+    CONF_FULL_REFRESH_INTERVAL,
+    DEFAULT_PORT,
+    DEFAULT_TIMEOUT,
+    DEFAULT_BROADCAST_DELAY,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WRITE_WINDOW,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_REGISTER_MAP,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_FULL_REFRESH_INTERVAL,
+)
+from .compat import load_api
+from .register_map import list_maps
 
 
 class SmartElektraToolsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return SmartElektraToolsOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         errors = {}
         if user_input is not None:
             host = user_input[CONF_HOST].strip()
             port = user_input[CONF_PORT]
             timeout = user_input[CONF_TIMEOUT]
+            broadcast_delay = user_input[CONF_BROADCAST_DELAY]
 
-            await self.async_set_unique_id(f"{host}:{port}")
-            self._abort_if_unique_id_configured()
-
+            # no unique_id: several entries (e.g. one per register map) may share a gateway
             return self.async_create_entry(
                 title=f"SmartElektra Tools ({host}:{port})",
                 data={
                     CONF_HOST: host,
                     CONF_PORT: port,
                     CONF_TIMEOUT: timeout,
+                    CONF_BROADCAST_DELAY: broadcast_delay,
                 },
             )
 
@@ -35,6 +68,56 @@ class SmartElektraToolsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_HOST): str,
                 vol.Required(CONF_PORT, default=DEFAULT_PORT): vol.Coerce(int),
                 vol.Required(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): vol.Coerce(float),
+                vol.Required(CONF_BROADCAST_DELAY, default=DEFAULT_BROADCAST_DELAY): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=5)
+                ),
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+
+class SmartElektraToolsOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        maps = sorted(await self.hass.async_add_executor_job(list_maps, *map_dirs(self.hass)))
+        api = await self.hass.async_add_executor_job(load_api)
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SCAN_INTERVAL, default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.2, max=3600)),
+                vol.Required(
+                    CONF_WRITE_WINDOW, default=options.get(CONF_WRITE_WINDOW, DEFAULT_WRITE_WINDOW)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                vol.Required(
+                    CONF_CACHE_TTL, default=options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+                vol.Required(
+                    CONF_CACHE_SIZE, default=options.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000000)),
+                vol.Required(
+                    CONF_CONNECTIONS, default=options.get(CONF_CONNECTIONS, api.default_connections)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+                vol.Required(
+                    CONF_GATEWAY_TURNAROUND,
+                    default=options.get(CONF_GATEWAY_TURNAROUND, self._entry.data[CONF_TIMEOUT]),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=60)),
+                vol.Required(
+                    CONF_REGISTER_MAP, default=options.get(CONF_REGISTER_MAP, DEFAULT_REGISTER_MAP)
+                ): vol.In(maps),
+                vol.Required(
+                    CONF_PUBLISH_INTERVAL, default=options.get(CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+                vol.Required(
+                    CONF_FULL_REFRESH_INTERVAL,
+                    default=options.get(CONF_FULL_REFRESH_INTERVAL, DEFAULT_FULL_REFRESH_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
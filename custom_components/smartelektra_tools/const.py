@@ -3,19 +3,136 @@ DOMAIN = "smartelektra_tools"
 CONF_HOST = "host"
 CONF_PORT = "port"
 CONF_TIMEOUT = "timeout"
+CONF_BROADCAST_DELAY = "broadcast_delay"
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_WRITE_WINDOW = "write_window"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_CACHE_SIZE = "cache_size"
+CONF_CONNECTIONS = "connections"
+CONF_REGISTER_MAP = "register_map"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+CONF_FULL_REFRESH_INTERVAL = "full_refresh_interval"
+CONF_GATEWAY_TURNAROUND = "gateway_turnaround"
+
+# hass.data[DOMAIN] key of the shared gateway connection pool
+DATA_POOL = "pool"
 
 DEFAULT_PORT = 502
+# Upper bound of the reply timeout; the one actually used is learnt per slave
 DEFAULT_TIMEOUT = 5.0
+# Broadcasts get no reply; wait only the RTU turnaround delay before the next frame
+DEFAULT_BROADCAST_DELAY = 0.1
+
+# Max Modbus frames outstanding at once on one gateway TCP connection
+DEFAULT_MAX_INFLIGHT = 4
+# Parallel TCP connections per gateway (cheap gateways accept only one or two).
+# pymodbus 3.6+ carries one frame at a time per socket, so there a second socket is
+# the only way to keep two frames in flight; sockets the gateway refuses are skipped.
+DEFAULT_CONNECTIONS = 1
+DEFAULT_CONNECTIONS_SERIALIZED = 2
+
+# Request scheduler priority classes (lower value is served first)
+PRIORITY_INTERACTIVE = 0  # entity actions
+PRIORITY_SERVICE = 1  # service calls
+PRIORITY_POLL = 2  # coordinator polling
+PRIORITY_BULK = 3  # scans, provisioning and other whole-bus jobs
+
+# Adaptive pacing: reply timeout = factor x p99 round trip of the slave (or of the link)
+PACING_TIMEOUT_FACTOR = 4.0
+DEFAULT_TIMEOUT_MIN = 0.1
+# Replies needed before a learnt timeout is used, and how often it is recomputed
+PACING_MIN_SAMPLES = 8
+PACING_RECALC_EVERY = 16
+# Each miss doubles the slave's timeout, up to this multiple; a slave that missed
+# this many requests in a row is offline and gets the plain timeout again
+PACING_MAX_BOOST = 4.0
+PACING_OFFLINE_AFTER = 3
+# Inter-frame gap (s): doubled when the gateway drops frames, shrunk by a tenth of the step per reply
+DEFAULT_FRAME_GAP_STEP = 0.005
+DEFAULT_FRAME_GAP_MAX = 0.2
 
-# Modbus register map (Arduino firmware)
-# HR0 (holding register 0) = new slave id (1..247)
+# Reconnect backoff (s) while the gateway refuses connections; calls fail fast meanwhile
+DEFAULT_BACKOFF_MIN = 1.0
+DEFAULT_BACKOFF_MAX = 60.0
+
+# HR0 (holding register 0) = new slave id (1..247); register maps may move it
 DEFAULT_HR_NEW_SLAVE = 0
 
-# Optional configuration registers (defaults can be changed via entities)
-# HR1 = button mode (0=mono, 1=bi)
-DEFAULT_HR_BUTTON_MODE = 1
-# HR2 = output polarity/level (0=LOW, 1=HIGH)
-DEFAULT_HR_OUTPUT_LEVEL = 2
+# Firmware register maps (maps/*.json|yaml, plus <config>/smartelektra_tools/maps)
+DEFAULT_REGISTER_MAP = "default"
+MAPS_DIR = "maps"
+
+# Bus scan: short per-probe timeout, bounded number of probes in flight
+DEFAULT_SCAN_TIMEOUT = 0.3
+DEFAULT_SCAN_MIN_TIMEOUT = 0.05
+DEFAULT_SCAN_CONCURRENCY = 4
+# Once a slave answered, probe timeout shrinks to this multiple of the slowest reply
+SCAN_TIMEOUT_FACTOR = 4.0
+
+# Bulk slave-ID provisioning
+DEFAULT_PROVISION_CONCURRENCY = 4
+DEFAULT_PROVISION_VERIFY_TIMEOUT = 1.0
+DEFAULT_PROVISION_INTERVAL = 0.0
+
+# Device configuration backup/restore (files live in <config>/smartelektra_tools/backups)
+BACKUP_DIR = "backups"
+DEFAULT_BACKUP_CONCURRENCY = 4
+
+# Devices converged in parallel by apply_profile
+DEFAULT_PROFILE_CONCURRENCY = 8
+
+# link_test service: budget, concurrency levels and what counts as a safe level
+DEFAULT_LINK_TEST_OPERATIONS = 400
+DEFAULT_LINK_TEST_CONCURRENCY = 8
+LINK_TEST_MAX_TIMEOUT_RATE = 0.01
+LINK_TEST_BEST_FRACTION = 0.9
+# Register map key of the test output coil (rewritten by link_test, swept by default by sweep)
+LINK_TEST_COIL_KEY = "test_output"
+
+# Output sweep (commissioning): step length, lead time before the first step, and
+# how long after its due time a frame may be confirmed before it counts as late
+DEFAULT_SWEEP_ON_TIME = 0.5
+SWEEP_START_DELAY = 0.1
+SWEEP_LATE_FRACTION = 0.5
+# Missed/late frames listed individually in the response
+SWEEP_MAX_REPORTED = 50
+# After the link dropped mid-sweep, keep retrying the restore / all-off this long
+# (covers the first reconnect backoff steps)
+SWEEP_CLEANUP_TIMEOUT = 5.0
+SWEEP_CLEANUP_RETRY = 0.5
+
+# Durable "deliver eventually" write journal (.storage/smartelektra_tools.journal.<entry>)
+JOURNAL_STORE_VERSION = 1
+JOURNAL_SAVE_DELAY = 1.0
+# Queued writes that timed out (slave offline) are retried this often (s)
+JOURNAL_RETRY_INTERVAL = 30.0
+
+# Polling (the addresses read every cycle come from the register map)
+DEFAULT_SCAN_INTERVAL = 10
+# With a change counter in the register map a cycle reads only the counter of each
+# slave; its full block is read when the counter moves and at least this often (s)
+DEFAULT_FULL_REFRESH_INTERVAL = 300.0
+# Minimum time (s) between two state writes of one entity; changes in between are merged
+DEFAULT_PUBLISH_INTERVAL = 1.0
+# Protocol limits per read request (FC3/FC4 registers, FC1/FC2 bits)
+MAX_READ_REGISTERS = 125
+MAX_READ_BITS = 2000
+# Unused addresses a merged block read may span to save a round trip
+DEFAULT_POLL_MAX_GAP_REGISTERS = 16
+DEFAULT_POLL_MAX_GAP_BITS = 256
+# Protocol limits per write request (FC16 registers, FC15 bits)
+MAX_WRITE_REGISTERS = 123
+MAX_WRITE_BITS = 1968
+
+# Exception codes a gateway answers with when it could not reach the slave
+# (0x0A path unavailable, 0x0B target failed to respond): the request may succeed later
+GATEWAY_EXCEPTION_CODES = (0x0A, 0x0B)
+# Pending writes to neighbouring addresses within this window share one FC15/FC16 frame
+DEFAULT_WRITE_WINDOW = 0.01
+# Shadow cache of device values used to skip no-op writes (TTL 0 disables it)
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_CACHE_SIZE = 4096
 
-# Optional coil for quick test (toggle output)
-DEFAULT_COIL_TEST_OUTPUT = 0
+# Exception codes meaning the firmware lacks the function or address (0x01 illegal
+# function, 0x02 illegal data address); anything else may be transient
+UNSUPPORTED_EXCEPTION_CODES = (0x01, 0x02)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .change_counter import ChangeCounters
+from .const import DEFAULT_FULL_REFRESH_INTERVAL, DOMAIN, PRIORITY_POLL, UNSUPPORTED_EXCEPTION_CODES
+from .devices import SlaveDirectory
+from .exceptions import ModbusExceptionError
+from .modbus_client import AsyncModbusTcpClientCompat
+from .register_map import RegisterMap
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SEToolsCoordinator(DataUpdateCoordinator[dict[int, dict[str, dict[int, Any]]]]):
+    """Poll coils and holding registers of every known slave with the register map's block plan.
+
+    Data layout: ``{slave: {"coils": {address: bool}, "registers": {address: int}}}``.
+    Slaves that did not answer are left out of the data. Every result is also
+    decoded into the slaves' records, which the per-device entities read.
+
+    If the register map has a change counter, each cycle reads just that register
+    of every slave (all slaves at once). A slave's full block is read only when its
+    counter moved, when it was not polled last cycle, or once
+    ``full_refresh_interval`` has passed. Slaves that reject the counter read with
+    illegal function/address are always read in full; other errors (e.g. a slave
+    that is briefly offline) only fail that cycle.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: AsyncModbusTcpClientCompat,
+        slaves: SlaveDirectory,
+        register_map: RegisterMap,
+        scan_interval: float,
+        full_refresh_interval: float = DEFAULT_FULL_REFRESH_INTERVAL,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=scan_interval),
+        )
+        self.client = client
+        self._slaves = slaves
+        self._map = register_map
+        self._wanted = {table: frozenset(addrs) for table, addrs in register_map.addresses.items()}
+        # slaves whose firmware rejected a read spanning unused addresses
+        self._strict: set[int] = set()
+        self._counters = ChangeCounters(full_refresh_interval)
+        self.full_reads = 0
+        self.unchanged = 0
+
+    def polled_slaves(self) -> list[int]:
+        return sorted(self._slaves)
+
+    async def _read_blocks(self, table: str, slave: int) -> dict[int, Any]:
+        read = self.client.read_coils if table == "coils" else self.client.read_holding_registers
+        strict = slave in self._strict
+        blocks = (self._map.strict_plan if strict else self._map.read_plan)[table]
+        try:
+            results = await asyncio.gather(*(read(start, count, slave, priority=PRIORITY_POLL) for start, count in blocks))
+        except ModbusExceptionError as err:
+            # illegal function/address: retry with exact ranges only and remember that
+            if strict or blocks == self._map.strict_plan[table] or err.code not in UNSUPPORTED_EXCEPTION_CODES:
+                raise
+            self._strict.add(slave)
+            return await self._read_blocks(table, slave)
+        wanted = self._wanted[table]
+        values: dict[int, Any] = {}
+        for (start, _count), block in zip(blocks, results):
+            for offset, value in enumerate(block):
+                if start + offset in wanted:
+                    values[start + offset] = value
+        return values
+
+    async def _read_slave(self, slave: int) -> dict[str, dict[int, Any]]:
+        coil_values, register_values = await asyncio.gather(
+            self._read_blocks("coils", slave),
+            self._read_blocks("registers", slave),
+        )
+        self.full_reads += 1
+        return {"coils": coil_values, "registers": register_values}
+
+    async def _poll_slave(self, slave: int) -> dict[str, dict[int, Any]]:
+        address = self._map.change_counter_address
+        if address is None or not self._counters.supported(slave):
+            return await self._read_slave(slave)
+        try:
+            (counter,) = await self.client.read_holding_registers(address, 1, slave, priority=PRIORITY_POLL)
+        except ModbusExceptionError as err:
+            if err.code not in UNSUPPORTED_EXCEPTION_CODES:
+                raise
+            # firmware without the counter: read it in full from now on
+            self._counters.reject(slave)
+            return await self._read_slave(slave)
+        now = time.monotonic()
+        previous = (self.data or {}).get(slave)
+        if previous is not None and self._counters.unchanged(slave, counter, now):
+            self.unchanged += 1
+            return previous
+        # the counter is read first: a change during the full read shows up next cycle
+        result = await self._read_slave(slave)
+        self._counters.record(slave, counter, now)
+        return result
+
+    async def _async_update_data(self) -> dict[int, dict[str, dict[int, Any]]]:
+        slaves = self.polled_slaves()
+        if not slaves:
+            return {}
+        self._counters.retain(slaves)
+        results = await asyncio.gather(*(self._poll_slave(s) for s in slaves), return_exceptions=True)
+        data: dict[int, dict[str, dict[int, Any]]] = {}
+        errors: list[str] = []
+        for slave, result in zip(slaves, results):
+            if isinstance(result, BaseException):
+                errors.append(f"{slave}: {result}")
+                continue
+            data[slave] = result
+        self._slaves.apply(data)
+        if not data:
+            raise UpdateFailed(f"No slave answered ({'; '.join(errors)})")
+        if errors:
+            _LOGGER.debug("Polling failed for %s", ", ".join(errors))
+        return data
+
+    def change_counter_snapshot(self) -> dict[str, Any]:
+        return {
+            "register": self._map.change_counter_address,
+            **self._counters.snapshot(),
+            "full_reads": self.full_reads,
+            "unchanged": self.unchanged,
+        }
+
+    def register_value(self, slave: int, address: int) -> int | None:
+        return ((self.data or {}).get(slave) or {}).get("registers", {}).get(address)
+
+    def coil_value(self, slave: int, address: int) -> bool | None:
+        return ((self.data or {}).get(slave) or {}).get("coils", {}).get(address)
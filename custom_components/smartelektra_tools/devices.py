@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .register_map import RegisterMap
+
+# Device registry identifier of a slave: (DOMAIN, "<entry_id>_<slave>"); the gateway itself is (DOMAIN, entry_id)
+def slave_identifier(entry_id: str, slave_id: int) -> str:
+    return f"{entry_id}_{slave_id}"
+
+
+def parse_slave_identifier(entry_id: str, identifier: str) -> Optional[int]:
+    prefix = f"{entry_id}_"
+    if not identifier.startswith(prefix) or not identifier[len(prefix) :].isdigit():
+        return None
+    return int(identifier[len(prefix) :])
+
+
+# callback(added slave ids, removed slave ids)
+SlaveListener = Callable[[list[int], list[int]], None]
+
+
+class SlaveRecord:
+    """Last known values of one slave, in register-map order."""
+
+    __slots__ = ("slave_id", "values", "online")
+
+    def __init__(self, slave_id: int, size: int) -> None:
+        self.slave_id = slave_id
+        self.values: list[Any] = [None] * size
+        self.online = False
+
+
+class SlaveDirectory:
+    """The slaves known on one gateway entry, each with its own record.
+
+    Behaves like a set of slave IDs for the scan/provisioning code; listeners hear
+    about slaves appearing or disappearing so platforms can add entities lazily.
+    """
+
+    def __init__(self, register_map: RegisterMap, slave_ids: Iterable[int] = ()) -> None:
+        self._map = register_map
+        self._records: dict[int, SlaveRecord] = {
+            slave_id: SlaveRecord(slave_id, len(register_map.entries)) for slave_id in slave_ids
+        }
+        self._listeners: list[SlaveListener] = []
+
+    def __contains__(self, slave_id: object) -> bool:
+        return slave_id in self._records
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._records))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, slave_id: int) -> Optional[SlaveRecord]:
+        return self._records.get(slave_id)
+
+    def add_listener(self, callback: SlaveListener) -> Callable[[], None]:
+        self._listeners.append(callback)
+
+        def remove() -> None:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+        return remove
+
+    def _notify(self, added: list[int], removed: list[int]) -> None:
+        if added or removed:
+            for callback in list(self._listeners):
+                callback(added, removed)
+
+    def update(self, slave_ids: Iterable[int]) -> None:
+        added = []
+        for slave_id in slave_ids:
+            if slave_id not in self._records:
+                self._records[slave_id] = SlaveRecord(slave_id, len(self._map.entries))
+                added.append(slave_id)
+        self._notify(sorted(added), [])
+
+    def add(self, slave_id: int) -> None:
+        self.update((slave_id,))
+
+    def discard(self, slave_id: int) -> None:
+        if self._records.pop(slave_id, None) is not None:
+            self._notify([], [slave_id])
+
+    def forget(self, slave_id: int) -> None:
+        """Drop a slave whose device Home Assistant is already removing (no notification)."""
+        self._records.pop(slave_id, None)
+
+    def apply(self, data: dict[int, dict[str, dict[int, Any]]]) -> None:
+        """Decode one poll result into the records; slaves missing from it go offline."""
+        entries = self._map.entries
+        for slave_id, record in self._records.items():
+            polled = data.get(slave_id)
+            record.online = polled is not None
+            if polled is None:
+                continue
+            values = record.values
+            for entry in entries:
+                raw = polled[entry.table].get(entry.address)
+                if raw is not None:
+                    values[entry.index] = entry.decode(raw)
+
+
+def track_slaves(
+    directory: SlaveDirectory, add_entities: Callable[[list[Any]], None], factory: Callable[[SlaveRecord], list[Any]]
+) -> Callable[[], None]:
+    """Create entities for the slaves known now and for every slave added later; returns a remover."""
+
+    def added(slave_ids: list[int], _removed: list[int]) -> None:
+        entities = [entity for slave_id in slave_ids for entity in factory(directory.get(slave_id))]
+        if entities:
+            add_entities(entities)
+
+    added(sorted(directory), [])
+    return directory.add_listener(added)
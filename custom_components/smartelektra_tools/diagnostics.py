@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import _get_store, get_pool
+from .compat import load_api
+from .const import CONF_HOST
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    store = _get_store(hass, entry.entry_id)
+    client = store["client"]
+    coordinator = store["coordinator"]
+    register_map = store["map"]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "startup": {**store["startup"], "pymodbus": load_api().snapshot()},
+        "slaves": {
+            "known": sorted(store["slaves"]),
+            "online": [slave for slave in sorted(store["slaves"]) if store["slaves"].get(slave).online],
+        },
+        "register_map": {
+            "id": register_map.map_id,
+            "name": register_map.name,
+            "entities": len(register_map.entries),
+            "read_plan": {table: list(plan) for table, plan in register_map.read_plan.items()},
+        },
+        "polling": {
+            "last_update_success": coordinator.last_update_success,
+            "polled_slaves": coordinator.polled_slaves(),
+            "change_counter": coordinator.change_counter_snapshot(),
+        },
+        "connection": {
+            **client.breaker.snapshot(),
+            "sockets": client.connections_snapshot(),
+            "shared_by_entries": get_pool(hass).refs(client),
+        },
+        "link": client.stats.snapshot(),
+        "pacing": client.pacer.snapshot(),
+        "scheduler": client.scheduler.snapshot(),
+        "publisher": store["publisher"].snapshot(),
+        "journal": store["journal"].snapshot(),
+        "cache": client.cache.stats(),
+    }
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import get_client, get_publisher, get_register_map
+from .const import DOMAIN
+from .coordinator import SEToolsCoordinator
+from .devices import SlaveRecord, slave_identifier
+from .register_map import MapEntry
+
+
+class SEToolsSlaveEntity(CoordinatorEntity[SEToolsCoordinator]):
+    """Base for entities bound to one slave device and one register-map entry.
+
+    The value lives in the slave's record (filled by the coordinator), so reads and
+    writes are a list index away; the entity writes only to its own slave.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: SEToolsCoordinator,
+        record: SlaveRecord,
+        description: EntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.hass = hass
+        self.entry = entry
+        self.entity_description = description
+        self._record = record
+        self._map_entry: MapEntry = description.map_entry
+        self._attr_unique_id = f"{entry.entry_id}_{record.slave_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, slave_identifier(entry.entry_id, record.slave_id))},
+            "name": f"Slave {record.slave_id}",
+            "manufacturer": "SmartElektra",
+            "model": get_register_map(hass, entry.entry_id).name,
+            "via_device": (DOMAIN, entry.entry_id),
+        }
+
+    @property
+    def _value(self) -> Any:
+        return self._record.values[self._map_entry.index]
+
+    def _set_value(self, value: Any) -> None:
+        self._record.values[self._map_entry.index] = value
+
+    def _publish(self) -> None:
+        """Publish right after a user action (still batched and change-checked)."""
+        get_publisher(self.hass, self.entry.entry_id).schedule(self, immediate=True)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        get_publisher(self.hass, self.entry.entry_id).schedule(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        get_publisher(self.hass, self.entry.entry_id).forget(self)
+        await super().async_will_remove_from_hass()
+
+    @property
+    def available(self) -> bool:
+        return (
+            super().available
+            and self._record.online
+            and get_client(self.hass, self.entry.entry_id).available
+        )
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from .const import GATEWAY_EXCEPTION_CODES
+
+
+class ModbusExceptionError(RuntimeError):
+    """Exception reply from the slave itself (illegal function, address, value...)."""
+
+    def __init__(self, message: str, code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class GatewayError(Exception):
+    """Gateway exception reply (0x0A/0x0B): the slave was not reached, retrying may succeed."""
+
+    def __init__(self, message: str, code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def exception_error(name: str, rr: Any) -> Exception:
+    """Error to raise for an isError() reply, by who answered it."""
+    code = getattr(rr, "exception_code", None)
+    if code in GATEWAY_EXCEPTION_CODES:
+        return GatewayError(f"Modbus {name}: gateway could not reach the slave: {rr}", code)
+    return ModbusExceptionError(f"Modbus {name} error: {rr}", code)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    JOURNAL_RETRY_INTERVAL,
+    JOURNAL_SAVE_DELAY,
+    JOURNAL_STORE_VERSION,
+    MAX_WRITE_BITS,
+    MAX_WRITE_REGISTERS,
+    PRIORITY_SERVICE,
+)
+from .exceptions import ModbusExceptionError
+from .modbus_client import AsyncModbusTcpClientCompat
+from .register_map import plan_runs
+
+_LOGGER = logging.getLogger(__name__)
+
+_LIMITS = {"coils": MAX_WRITE_BITS, "registers": MAX_WRITE_REGISTERS}
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, JOURNAL_STORE_VERSION, f"{DOMAIN}.journal.{entry_id}")
+
+
+async def async_remove_journal(hass: HomeAssistant, entry_id: str) -> None:
+    await _store(hass, entry_id).async_remove()
+
+
+class WriteJournal:
+    """Durable queue of "deliver eventually" writes of one config entry.
+
+    ``submit`` only records the write (keyed by table, slave and address, so a
+    newer value replaces a queued one) and returns; the journal is saved to
+    ``.storage`` shortly after. It is drained whenever the gateway is available:
+    on setup, on every submit and when the link comes back. Queued writes are sent
+    as FC15/FC16 runs of neighbouring addresses, all slaves at once. Writes a slave
+    rejects with an exception reply are dropped; those that time out or that the
+    gateway could not deliver (0x0A/0x0B) are retried every
+    ``JOURNAL_RETRY_INTERVAL`` seconds.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: AsyncModbusTcpClientCompat, entry_id: str) -> None:
+        self._hass = hass
+        self._client = client
+        self._store = _store(hass, entry_id)
+        # (table, slave, address) -> value, oldest first
+        self._pending: dict[tuple[str, int, int], Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._retry: Optional[asyncio.TimerHandle] = None
+        self._remove_listener: Optional[Callable[[], None]] = None
+        self.delivered = 0
+        self.dropped = 0
+        self.collapsed = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        for table, slave_id, address, value in data.get("writes", []):
+            if table in _LIMITS:
+                self._pending[(table, int(slave_id), int(address))] = value
+
+    def start(self) -> None:
+        self._remove_listener = self._client.add_listener(self._kick)
+        self._kick()
+
+    async def async_close(self) -> None:
+        """Stop draining and save what is still queued."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._store.async_save(self._data_to_save())
+
+    def submit(self, table: str, slave_id: int, address: int, values: list[Any]) -> None:
+        """Queue values for ``address`` onwards; returns at once."""
+        for offset, value in enumerate(values):
+            key = (table, slave_id, address + offset)
+            if self._pending.pop(key, None) is not None:
+                self.collapsed += 1
+            self._pending[key] = value
+        self._store.async_delay_save(self._data_to_save, JOURNAL_SAVE_DELAY)
+        self._kick()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"writes": [[table, slave_id, address, value] for (table, slave_id, address), value in self._pending.items()]}
+
+    @callback
+    def _kick(self) -> None:
+        if not self._pending or not self._client.available:
+            return
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_background_task(self._drain(), f"{DOMAIN} write journal")
+
+    def _schedule_retry(self) -> None:
+        if self._retry is None:
+            self._retry = asyncio.get_running_loop().call_later(JOURNAL_RETRY_INTERVAL, self._retry_now)
+
+    def _retry_now(self) -> None:
+        self._retry = None
+        self._kick()
+
+    async def _drain(self) -> None:
+        while self._pending and self._client.available:
+            groups: dict[tuple[str, int], dict[int, Any]] = {}
+            for (table, slave_id, address), value in self._pending.items():
+                groups.setdefault((table, slave_id), {})[address] = value
+            batch = [
+                (table, slave_id, start, values)
+                for (table, slave_id), slot in groups.items()
+                for start, values in plan_runs(slot, _LIMITS[table])
+            ]
+            results = await asyncio.gather(*(self._send(*item) for item in batch), return_exceptions=True)
+            progress = False
+            failed = False
+            for (table, slave_id, start, values), result in zip(batch, results):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, ModbusExceptionError):
+                    # the slave itself refused the write: retrying cannot help
+                    _LOGGER.warning(
+                        "Dropping queued %s write to slave %s at %s: %s", table, slave_id, start, result
+                    )
+                    self.dropped += len(values)
+                elif isinstance(result, BaseException):
+                    failed = True
+                    continue
+                else:
+                    self.delivered += len(values)
+                progress = True
+                for offset, value in enumerate(values):
+                    key = (table, slave_id, start + offset)
+                    # a newer value submitted meanwhile stays queued
+                    if key in self._pending and self._pending[key] == value:
+                        del self._pending[key]
+            if progress:
+                self._store.async_delay_save(self._data_to_save, JOURNAL_SAVE_DELAY)
+            if failed:
+                # slave offline or link lost: retry later (or when the link is back)
+                self._schedule_retry()
+                return
+
+    async def _send(self, table: str, slave_id: int, start: int, values: list[Any]) -> None:
+        # the device may have been reset during the outage: never skip as a no-op
+        if table == "coils":
+            await self._client.write_coils(start, values, slave_id, force=True, priority=PRIORITY_SERVICE)
+        else:
+            await self._client.write_registers(start, values, slave_id, force=True, priority=PRIORITY_SERVICE)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "queued": len(self._pending),
+            "slaves": sorted({slave_id for _table, slave_id, _address in self._pending}),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "collapsed": self.collapsed,
+            "draining": self._task is not None and not self._task.done(),
+        }
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from .const import LINK_TEST_BEST_FRACTION, LINK_TEST_MAX_TIMEOUT_RATE, PRIORITY_BULK
+from .modbus_client import AsyncModbusTcpClientCompat
+from .stats import OUTCOME_TIMEOUT, LatencyWindow, outcome_of
+
+MODES = ("read", "write", "mixed")
+# Latency samples kept per concurrency level and for the whole test
+LINK_TEST_WINDOW = 4096
+
+
+def _levels(max_concurrency: int) -> list[int]:
+    """1, 2, 4, ... up to ``max_concurrency`` (always included)."""
+    levels = [1]
+    while levels[-1] * 2 < max_concurrency:
+        levels.append(levels[-1] * 2)
+    if levels[-1] != max_concurrency:
+        levels.append(max_concurrency)
+    return levels
+
+
+def best_concurrency(levels: list[dict[str, Any]]) -> tuple[Optional[int], bool]:
+    """Pick the best concurrency from per-level results; returns (level, within timeout limit).
+
+    That is the smallest level reaching ``LINK_TEST_BEST_FRACTION`` of the highest
+    throughput among levels with at most ``LINK_TEST_MAX_TIMEOUT_RATE`` timeouts or,
+    if no level stays under that rate, among those with the lowest rate seen.
+    """
+    measured = [level for level in levels if level["ops_s"] and level["timeout_rate"] is not None]
+    safe = [level for level in measured if level["timeout_rate"] <= LINK_TEST_MAX_TIMEOUT_RATE]
+    candidates = safe
+    if not safe and measured:
+        # on a lossy link no level is within the limit: fall back to the least lossy ones
+        lowest = min(level["timeout_rate"] for level in measured)
+        candidates = [level for level in measured if level["timeout_rate"] == lowest]
+    if not candidates:
+        return None, False
+    top = max(level["ops_s"] for level in candidates)
+    best = min(level["concurrency"] for level in candidates if level["ops_s"] >= top * LINK_TEST_BEST_FRACTION)
+    return best, bool(safe)
+
+
+async def async_link_test(
+    client: AsyncModbusTcpClientCompat,
+    slave_id: int,
+    mode: str,
+    register_address: int,
+    coil_address: Optional[int],
+    operations: int,
+    duration: Optional[float],
+    max_concurrency: int,
+) -> dict[str, Any]:
+    """Stress the link with reads of ``register_address`` and/or writes of ``coil_address``.
+
+    Writes force the coil value read at the start, so the output does not change;
+    a toggle of that output during the test is reverted by the next write. The
+    budget (``operations`` or, if given, ``duration`` seconds) is split evenly over
+    concurrency levels 1, 2, 4, ... ``max_concurrency``; see ``best_concurrency``
+    for how the recommended level is picked.
+    """
+    loop = asyncio.get_running_loop()
+    t_start = loop.time()
+    coil_value = False
+    if mode != "read":
+        coil_value = (await client.read_coils(coil_address, 1, slave_id, priority=PRIORITY_BULK))[0]
+
+    async def read(_i: int) -> None:
+        await client.read_holding_registers(register_address, 1, slave_id, priority=PRIORITY_BULK)
+
+    async def write(_i: int) -> None:
+        await client.write_coil(coil_address, coil_value, slave_id, force=True, priority=PRIORITY_BULK)
+
+    async def mixed(i: int) -> None:
+        await (write(i) if i % 2 else read(i))
+
+    op: Callable[[int], Awaitable[None]] = {"read": read, "write": write, "mixed": mixed}[mode]
+    levels = _levels(max_concurrency)
+    overall = LatencyWindow(LINK_TEST_WINDOW)
+    totals = {"ops": 0, "timeouts": 0, "errors": 0}
+    aborted: Optional[str] = None
+    results: list[dict[str, Any]] = []
+
+    for concurrency in levels:
+        window = LatencyWindow(LINK_TEST_WINDOW)
+        counts = {"started": 0, "timeouts": 0, "errors": 0}
+        limit = None if duration else max(concurrency, operations // len(levels))
+        deadline = loop.time() + duration / len(levels) if duration else None
+
+        async def worker() -> None:
+            nonlocal aborted
+            while aborted is None:
+                if limit is not None and counts["started"] >= limit:
+                    return
+                if deadline is not None and loop.time() >= deadline:
+                    return
+                counts["started"] += 1
+                t0 = loop.time()
+                try:
+                    await op(counts["started"])
+                except ConnectionError as err:
+                    aborted = str(err)
+                    return
+                except Exception as err:
+                    # gateway exceptions 0x0A/0x0B are timeouts too: the slave never answered
+                    counts["timeouts" if outcome_of(err) == OUTCOME_TIMEOUT else "errors"] += 1
+                    continue
+                latency = loop.time() - t0
+                window.add(latency)
+                overall.add(latency)
+
+        t_level = loop.time()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = loop.time() - t_level
+        ops = counts["started"]
+        totals["ops"] += ops
+        totals["timeouts"] += counts["timeouts"]
+        totals["errors"] += counts["errors"]
+        summary = window.summary()
+        results.append(
+            {
+                "concurrency": concurrency,
+                "ops": ops,
+                "ops_s": round(window.count / elapsed, 1) if elapsed > 0 else None,
+                "p50_ms": summary["p50_ms"],
+                "p99_ms": summary["p99_ms"],
+                "timeout_rate": round(counts["timeouts"] / ops, 4) if ops else None,
+                "errors": counts["errors"],
+            }
+        )
+        if aborted is not None:
+            break
+
+    best, within_limit = best_concurrency(results)
+
+    elapsed = loop.time() - t_start
+    summary = overall.summary()
+    return {
+        "slave": slave_id,
+        "mode": mode,
+        "operations": totals["ops"],
+        "elapsed": round(elapsed, 3),
+        "ops_s": round(overall.count / elapsed, 1) if elapsed > 0 else None,
+        "latency": {key: summary[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+        "timeouts": totals["timeouts"],
+        "timeout_rate": round(totals["timeouts"] / totals["ops"], 4) if totals["ops"] else None,
+        "errors": totals["errors"],
+        "levels": results,
+        "best_concurrency": best,
+        "best_within_timeout_limit": within_limit,
+        "aborted": aborted,
+    }
@@ -1,10 +1,92 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import inspect
+import logging
+import socket
 import threading
-from typing import List, Optional
+import time
+from typing import Any, Callable, List, Optional, Sequence
 
-from pymodbus.client import ModbusTcpClient
+from .cache import ShadowCache
+from .compat import PymodbusApi, load_api
+from .const import (
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_BACKOFF_MIN,
+    DEFAULT_BROADCAST_DELAY,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_MAX_INFLIGHT,
+    DEFAULT_WRITE_WINDOW,
+    GATEWAY_EXCEPTION_CODES,
+    MAX_WRITE_BITS,
+    MAX_WRITE_REGISTERS,
+    PRIORITY_SERVICE,
+)
+from .exceptions import exception_error
+from .pacing import AdaptivePacer
+from .register_map import plan_runs
+from .scheduler import RequestScheduler
+from .stats import OUTCOME_ERROR, OUTCOME_OK, LinkStats, outcome_of
+
+_LOGGER = logging.getLogger(__name__)
+
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Connection state machine with exponential reconnect backoff.
+
+    closed: connecting is allowed. A failed connect opens the breaker; while open,
+    callers fail fast until the backoff expires. The next caller then becomes the
+    single half-open probe: success closes the breaker, failure re-opens it with
+    twice the delay (capped at ``backoff_max``).
+    """
+
+    def __init__(self, backoff_min: float = DEFAULT_BACKOFF_MIN, backoff_max: float = DEFAULT_BACKOFF_MAX) -> None:
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._delay = backoff_min
+        self._open_until = 0.0
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and time.monotonic() >= self._open_until:
+            self.state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._delay = self._backoff_min
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == STATE_CLOSED:
+            self.trips += 1
+        self.state = STATE_OPEN
+        self._open_until = time.monotonic() + self._delay
+        self._delay = min(self._delay * 2, self._backoff_max)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": round(self.retry_in(), 2),
+        }
 
 
 class ModbusTcpClientCompat:
@@ -13,8 +95,11 @@ class ModbusTcpClientCompat:
     def __init__(self, host: str, port: int, timeout: float = 5.0) -> None:
         self._host = host
         self._port = port
-        self._client = ModbusTcpClient(host=host, port=port, timeout=timeout)
+        self._api = load_api()
+        self._client = self._api.ModbusTcpClient(host=host, port=port, timeout=timeout)
         self._lock = threading.Lock()
+        self.stats = LinkStats()
+        self.breaker = CircuitBreaker()
 
     def close(self) -> None:
         with self._lock:
@@ -24,51 +109,675 @@ class ModbusTcpClientCompat:
                 pass
 
     def _ensure_connected(self) -> None:
-        if not self._client.connect():
+        if self._client.connected:
+            return
+        if not self.breaker.allow():
+            raise ConnectionError(
+                f"{self._host}:{self._port} unavailable, next attempt in {self.breaker.retry_in():.1f}s"
+            )
+        ok = bool(self._client.connect())
+        self.stats.record_connect(ok)
+        if not ok:
+            self.breaker.record_failure()
             raise ConnectionError(f"Cannot connect to {self._host}:{self._port}")
+        self.breaker.record_success()
 
-    def _unit_kw(self, func, slave_id: int) -> dict:
-        sig = inspect.signature(func)
-        if "slave" in sig.parameters:
-            return {"slave": slave_id}
-        if "device_id" in sig.parameters:
-            return {"device_id": slave_id}
-        if "unit" in sig.parameters:
-            return {"unit": slave_id}
-        return {}
-
-    def read_coils(self, address: int, count: int, slave_id: int) -> List[bool]:
+    def _call(self, name: str, slave_id: int, *args, **kwargs):
+        """Run one request under the lock, recording lock wait, latency and outcome."""
+        t_wait = time.monotonic()
         with self._lock:
-            self._ensure_connected()
-            kw = self._unit_kw(self._client.read_coils, slave_id)
-            rr = self._client.read_coils(address, count=count, **kw)
+            t0 = time.monotonic()
+            self.stats.record_lock_wait(t0 - t_wait)
+            try:
+                self._ensure_connected()
+                rr = self._api.sync_calls[name](self._client, slave_id, *args, **kwargs)
+            except Exception as err:
+                self.stats.record(name, slave_id, time.monotonic() - t0, outcome_of(err))
+                raise
+            latency = time.monotonic() - t0
             if rr is None:
+                self.stats.record(name, slave_id, latency, OUTCOME_ERROR)
                 self._client.close()
-                raise ConnectionError("No response (None) from read_coils")
-            if rr.isError():
-                raise RuntimeError(f"Modbus read_coils error: {rr}")
-            return list(rr.bits[:count])
+                raise ConnectionError(f"No response (None) from {name}")
+            # Broadcast (unit/slave 0) usually returns no response; pymodbus may return None/timeout.
+            # If we got a response object, validate it.
+            if hasattr(rr, "isError") and rr.isError():
+                err = exception_error(name, rr)
+                self.stats.record(name, slave_id, latency, outcome_of(err))
+                raise err
+            self.stats.record(name, slave_id, latency)
+            return rr
+
+    def read_coils(self, address: int, count: int, slave_id: int) -> List[bool]:
+        rr = self._call("read_coils", slave_id, address, count=count)
+        return list(rr.bits[:count])
 
     def write_coil(self, address: int, value: bool, slave_id: int) -> None:
-        with self._lock:
-            self._ensure_connected()
-            kw = self._unit_kw(self._client.write_coil, slave_id)
-            rr = self._client.write_coil(address, value, **kw)
-            if rr is None:
-                self._client.close()
-                raise ConnectionError("No response (None) from write_coil")
-            if rr.isError():
-                raise RuntimeError(f"Modbus write_coil error: {rr}")
+        self._call("write_coil", slave_id, address, value)
 
     def write_register(self, address: int, value: int, slave_id: int) -> None:
-        with self._lock:
-            self._ensure_connected()
-            kw = self._unit_kw(self._client.write_register, slave_id)
-            rr = self._client.write_register(address, value, **kw)
-            if rr is None:
-                self._client.close()
-                raise ConnectionError("No response (None) from write_register")
-            # Broadcast (unit/slave 0) usually returns no response; pymodbus may return None/timeout.
-            # If we got a response object, validate it.
-            if hasattr(rr, "isError") and rr.isError():
-                raise RuntimeError(f"Modbus write_register error: {rr}")
+        self._call("write_register", slave_id, address, value)
+
+
+class _WriteCoalescer:
+    """Collect single writes for a short window and send neighbours as one frame.
+
+    Writes to the same (slave, table, address) within the window collapse to the
+    last value; runs of consecutive addresses go out as FC15/FC16, lone writes
+    keep using FC5/FC6. A merged frame takes the most urgent priority of its writes.
+    """
+
+    def __init__(self, client: "AsyncModbusTcpClientCompat", window: float) -> None:
+        self._client = client
+        self._window = window
+        self._pending: dict[tuple[int, str], dict[int, tuple[Any, list[asyncio.Future]]]] = {}
+        self._priority: dict[tuple[int, str], int] = {}
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(
+        self, table: str, slave_id: int, address: int, value: Any, priority: int = PRIORITY_SERVICE
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        key = (slave_id, table)
+        slot = self._pending.setdefault(key, {})
+        self._priority[key] = min(priority, self._priority.get(key, priority))
+        _old, futures = slot.get(address, (None, []))
+        slot[address] = (value, futures + [fut])
+        if self._handle is None:
+            self._handle = loop.call_later(self._window, self._start_flush)
+        return fut
+
+    def _start_flush(self) -> None:
+        self._handle = None
+        pending, self._pending = self._pending, {}
+        priorities, self._priority = self._priority, {}
+        task = asyncio.get_running_loop().create_task(self._flush(pending, priorities))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(
+        self,
+        pending: dict[tuple[int, str], dict[int, tuple[Any, list[asyncio.Future]]]],
+        priorities: dict[tuple[int, str], int],
+    ) -> None:
+        jobs = []
+        for (slave_id, table), slot in pending.items():
+            limit = MAX_WRITE_BITS if table == "coils" else MAX_WRITE_REGISTERS
+            priority = priorities.get((slave_id, table), PRIORITY_SERVICE)
+            for start, items in plan_runs(slot, limit):
+                values = [value for value, _ in items]
+                futures = [fut for _, futs in items for fut in futs]
+                jobs.append(self._send(table, slave_id, start, values, futures, priority))
+        await asyncio.gather(*jobs)
+
+    async def _send(
+        self, table: str, slave_id: int, address: int, values: list, futures: list[asyncio.Future], priority: int
+    ) -> None:
+        client = self._client
+        try:
+            # no-op writes were already dropped by the cache check at submit time
+            if table == "coils":
+                if len(values) == 1:
+                    await client.write_coil(address, values[0], slave_id, force=True, priority=priority)
+                else:
+                    await client.write_coils(address, values, slave_id, force=True, priority=priority)
+            elif len(values) == 1:
+                await client.write_register(address, values[0], slave_id, force=True, priority=priority)
+            else:
+                await client.write_registers(address, values, slave_id, force=True, priority=priority)
+        except Exception as err:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(err)
+            return
+        for fut in futures:
+            if not fut.done():
+                fut.set_result(None)
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for slot in self._pending.values():
+            for _value, futures in slot.values():
+                for fut in futures:
+                    if not fut.done():
+                        fut.set_exception(ConnectionError("Client closed"))
+        self._pending = {}
+        self._priority = {}
+
+
+class _Connection:
+    """One TCP socket to the gateway; frames are admitted FIFO, ``max_inflight`` at a time."""
+
+    def __init__(self, api: PymodbusApi, host: str, port: int, timeout: float, max_inflight: int) -> None:
+        self.client = api.AsyncModbusTcpClient(host=host, port=port, timeout=timeout)
+        self.max_inflight = max_inflight
+        self.slots = asyncio.Semaphore(max_inflight)
+        self.connect_lock = asyncio.Lock()
+        # frames waiting for or holding a slot
+        self.queued = 0
+        # set when the gateway refused this extra socket (connection limit reached)
+        self.refused_until = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return bool(self.client.connected)
+
+    async def drop(self) -> None:
+        try:
+            res = self.client.close()
+            if inspect.isawaitable(res):
+                await res
+        except Exception:
+            pass
+
+
+class AsyncModbusTcpClientCompat:
+    """Asyncio Modbus TCP client running on the event loop.
+
+    Requests are not serialized behind a lock: up to ``max_inflight`` frames may be
+    outstanding on each TCP connection and pymodbus pairs each response with its
+    request through the MBAP transaction id (on pymodbus releases that serialize
+    internally a connection carries one frame at a time). With ``connections`` > 1
+    frames are spread over several sockets, each served in FIFO order; sockets the
+    gateway refuses are left alone for a while. ``connections`` defaults to one
+    socket where pymodbus pipelines and to two where it does not.
+
+    Every frame first passes the :class:`RequestScheduler`, which hands out the
+    socket slots by ``priority`` (``PRIORITY_*`` in const) so entity actions are not
+    stuck behind polling or a bus scan. Reply timeouts and the spacing between
+    frames come from the :class:`AdaptivePacer`; ``timeout`` is only the upper
+    bound of the learnt value (and the connect timeout). ``turnaround`` is the
+    gateway's own RTU wait (``timeout`` unless given): no frame is abandoned before
+    the gateway could have answered it and every frame ahead of it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = 5.0,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        broadcast_delay: float = DEFAULT_BROADCAST_DELAY,
+        write_window: float = DEFAULT_WRITE_WINDOW,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        backoff_min: float = DEFAULT_BACKOFF_MIN,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        connections: Optional[int] = None,
+        turnaround: Optional[float] = None,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._broadcast_delay = broadcast_delay
+        self.turnaround = float(timeout if turnaround is None else turnaround)
+        self._backoff_max = backoff_max
+        # resolved once per process (already in the executor during setup)
+        self._api = load_api()
+        max_inflight = max(1, int(max_inflight)) if self._api.pipelines else 1
+        connections = self._api.default_connections if connections is None else max(1, int(connections))
+        self._connections = [_Connection(self._api, host, port, timeout, max_inflight) for _ in range(connections)]
+        self._broadcast_lock = asyncio.Lock()
+        self.scheduler = RequestScheduler(sum(conn.max_inflight for conn in self._connections))
+        self._writes = _WriteCoalescer(self, write_window)
+        self.cache = ShadowCache(cache_ttl, cache_size)
+        self.stats = LinkStats()
+        self.pacer = AdaptivePacer(self.stats, timeout, turnaround=self.turnaround)
+        self.breaker = CircuitBreaker(backoff_min, backoff_max)
+        self._listeners: list[Callable[[], None]] = []
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def connected(self) -> bool:
+        return any(conn.connected for conn in self._connections)
+
+    @property
+    def available(self) -> bool:
+        """False while the breaker is open: calls fail fast and entities show unavailable."""
+        return self.breaker.state == STATE_CLOSED
+
+    def add_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call ``callback`` whenever availability changes; returns a remover."""
+        self._listeners.append(callback)
+
+        def remove() -> None:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+        return remove
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            callback()
+
+    def connections_snapshot(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "connected": conn.connected,
+                "queued": conn.queued,
+                "refused_for": round(max(0.0, conn.refused_until - now), 1),
+            }
+            for conn in self._connections
+        ]
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._writes.cancel()
+        for conn in self._connections:
+            await conn.drop()
+
+    async def connect(self) -> bool:
+        """Try to (re)connect now; returns False instead of raising."""
+        try:
+            await self._ensure_connected(self._connections[0])
+        except ConnectionError:
+            return False
+        return True
+
+    async def _ensure_connected(self, conn: _Connection) -> None:
+        if conn.connected:
+            return
+        async with conn.connect_lock:
+            if conn.connected:
+                return
+            if self._closed:
+                raise ConnectionError(f"{self._host}:{self._port} client closed")
+            # an extra socket failing while others are up means the gateway's limit, not a dead link
+            extra = any(c.connected for c in self._connections if c is not conn)
+            if not extra and not self.breaker.allow():
+                raise ConnectionError(
+                    f"{self._host}:{self._port} unavailable, next attempt in {self.breaker.retry_in():.1f}s"
+                )
+            was_available = self.available
+            try:
+                ok = bool(await asyncio.wait_for(conn.client.connect(), self._timeout))
+            except asyncio.CancelledError:
+                # never leave the breaker stuck half-open
+                if not extra:
+                    self.breaker.record_failure()
+                raise
+            except Exception:
+                ok = False
+            self.stats.record_connect(ok)
+            if not ok:
+                await conn.drop()
+                if extra:
+                    conn.refused_until = time.monotonic() + self._backoff_max
+                    raise ConnectionError(f"{self._host}:{self._port} refused an additional connection")
+                self.breaker.record_failure()
+                self._schedule_reconnect()
+                if was_available:
+                    self._notify()
+                raise ConnectionError(f"Cannot connect to {self._host}:{self._port}")
+            conn.refused_until = 0.0
+            self.breaker.record_success()
+            if not was_available:
+                self._notify()
+
+    def _schedule_reconnect(self) -> None:
+        if self._closed or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        """Half-open probing in the background so the link comes back without user traffic."""
+        while not self._closed and self.breaker.state != STATE_CLOSED:
+            await asyncio.sleep(self.breaker.retry_in())
+            if self.connected:
+                return
+            if await self.connect():
+                return
+
+    def _pick(self) -> _Connection:
+        now = time.monotonic()
+        usable = [c for c in self._connections if c.refused_until <= now] or self._connections[:1]
+        return min(usable, key=lambda c: (c.queued, not c.connected))
+
+    async def _connection(self) -> _Connection:
+        """Return the least loaded usable socket, connected."""
+        conn = self._pick()
+        try:
+            await self._ensure_connected(conn)
+        except ConnectionError:
+            fallback = [c for c in self._connections if c.connected]
+            if not fallback:
+                raise
+            conn = min(fallback, key=lambda c: c.queued)
+        return conn
+
+    @contextlib.asynccontextmanager
+    async def _lease(self, priority: int, slave_id: int):
+        """Wait for the scheduler, then reserve a socket for one frame, connect it and hold one of its slots."""
+        async with self.scheduler.slot(priority, slave_id):
+            async with self._socket() as conn:
+                yield conn
+
+    @contextlib.asynccontextmanager
+    async def _socket(self):
+        conn = self._pick()
+        # count the frame before awaiting so concurrent callers spread over sockets
+        conn.queued += 1
+        try:
+            try:
+                await self._ensure_connected(conn)
+            except ConnectionError:
+                fallback = [c for c in self._connections if c.connected]
+                if not fallback:
+                    raise
+                conn.queued -= 1
+                conn = min(fallback, key=lambda c: c.queued)
+                conn.queued += 1
+            loop = asyncio.get_running_loop()
+            t_wait = loop.time()
+            async with conn.slots:
+                self.stats.record_lock_wait(loop.time() - t_wait)
+                yield conn
+        finally:
+            conn.queued -= 1
+
+    def _reply_timeout(self, slave_id: int, timeout: Optional[float]) -> float:
+        """Timeout for a frame that holds a slot: never below the gateway floor for the frames ahead."""
+        queued = self.scheduler.active - 1
+        if timeout:
+            return max(timeout, self.pacer.floor(queued))
+        return self.pacer.timeout(slave_id, queued)
+
+    def _record(self, name: str, slave_id: int, seconds: float, outcome: str) -> None:
+        self.stats.record(name, slave_id, seconds, outcome)
+        self.pacer.record(slave_id, outcome)
+
+    async def _execute(
+        self,
+        name: str,
+        slave_id: int,
+        *args,
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_SERVICE,
+        **kwargs,
+    ):
+        loop = asyncio.get_running_loop()
+        async with self._lease(priority, slave_id) as conn:
+            call = self._api.calls[name]
+            await self.pacer.wait_turn()
+            t0 = loop.time()
+            try:
+                rr = await asyncio.wait_for(
+                    call(conn.client, slave_id, *args, **kwargs), self._reply_timeout(slave_id, timeout)
+                )
+            except Exception as err:
+                self._record(name, slave_id, loop.time() - t0, outcome_of(err))
+                raise
+            latency = loop.time() - t0
+        if rr is None:
+            self._record(name, slave_id, latency, OUTCOME_ERROR)
+            await conn.drop()
+            raise ConnectionError(f"No response (None) from {name}")
+        if hasattr(rr, "isError") and rr.isError():
+            err = exception_error(name, rr)
+            self._record(name, slave_id, latency, outcome_of(err))
+            raise err
+        self._record(name, slave_id, latency, OUTCOME_OK)
+        return rr
+
+    async def _broadcast(self, name: str, *args, priority: int = PRIORITY_SERVICE) -> None:
+        """Send a frame to slave 0 without waiting for the (never coming) reply.
+
+        The whole bus (every slot on every socket) is held for the turnaround delay so
+        that RTU slaves have time to process the broadcast before the gateway
+        forwards the next frame.
+        """
+        conn = await self._connection()
+        call = self._api.broadcast[name]
+        # a broadcast touches every slave (and may re-address them)
+        self.cache.clear()
+        async with self.scheduler.slot(priority, 0), self._broadcast_lock:
+            for c in self._connections:
+                for _ in range(c.max_inflight):
+                    await c.slots.acquire()
+            try:
+                start = asyncio.get_running_loop().time()
+                try:
+                    await asyncio.wait_for(call(conn.client, 0, *args), self._broadcast_delay)
+                except Exception:
+                    # older pymodbus waits for a reply; the timeout here is expected
+                    pass
+                remaining = self._broadcast_delay - (asyncio.get_running_loop().time() - start)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+            finally:
+                for c in self._connections:
+                    for _ in range(c.max_inflight):
+                        c.slots.release()
+
+    async def broadcast_write_coil(self, address: int, value: bool, priority: int = PRIORITY_SERVICE) -> None:
+        await self._broadcast("write_coil", address, value, priority=priority)
+
+    async def broadcast_write_register(self, address: int, value: int, priority: int = PRIORITY_SERVICE) -> None:
+        await self._broadcast("write_register", address, value, priority=priority)
+
+    async def probe(
+        self, slave_id: int, address: int = 0, timeout: Optional[float] = None, priority: int = PRIORITY_SERVICE
+    ) -> Optional[float]:
+        """Return the round trip time if the slave answers a 1-register read, else None.
+
+        An exception reply from the slave counts as an answer; gateway exceptions
+        (0x0A path unavailable, 0x0B target failed to respond) do not. The wait is at
+        least ``turnaround`` for this probe and every frame ahead of it: an abandoned
+        probe would keep the gateway busy while the next frame queues behind it.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._lease(priority, slave_id) as conn:
+            call = self._api.calls["read_holding_registers"]
+            await self.pacer.wait_turn()
+            t0 = loop.time()
+            try:
+                rr = await asyncio.wait_for(
+                    call(conn.client, slave_id, address, count=1), self._reply_timeout(slave_id, timeout)
+                )
+            except Exception as err:
+                if not conn.connected:
+                    raise ConnectionError(f"Connection to {self._host}:{self._port} lost during probe") from err
+                return None
+            rtt = loop.time() - t0
+        if rr is None or getattr(rr, "exception_code", None) in GATEWAY_EXCEPTION_CODES:
+            return None
+        return rtt
+
+    def invalidate_slave(self, slave_id: int) -> None:
+        """Forget cached values of a slave, e.g. after it was re-addressed."""
+        self.cache.invalidate_slave(slave_id)
+
+    async def read_coils(
+        self, address: int, count: int, slave_id: int, priority: int = PRIORITY_SERVICE
+    ) -> List[bool]:
+        rr = await self._execute("read_coils", slave_id, address, count=count, priority=priority)
+        bits = list(rr.bits[:count])
+        self.cache.put_block(slave_id, "coils", address, bits)
+        return bits
+
+    async def read_holding_registers(
+        self, address: int, count: int, slave_id: int, priority: int = PRIORITY_SERVICE
+    ) -> List[int]:
+        rr = await self._execute("read_holding_registers", slave_id, address, count=count, priority=priority)
+        registers = list(rr.registers[:count])
+        self.cache.put_block(slave_id, "registers", address, registers)
+        return registers
+
+    async def read_discrete_inputs(
+        self, address: int, count: int, slave_id: int, priority: int = PRIORITY_SERVICE
+    ) -> List[bool]:
+        rr = await self._execute("read_discrete_inputs", slave_id, address, count=count, priority=priority)
+        return list(rr.bits[:count])
+
+    async def read_input_registers(
+        self, address: int, count: int, slave_id: int, priority: int = PRIORITY_SERVICE
+    ) -> List[int]:
+        rr = await self._execute("read_input_registers", slave_id, address, count=count, priority=priority)
+        return list(rr.registers[:count])
+
+    async def write_coil(
+        self, address: int, value: bool, slave_id: int, force: bool = False, priority: int = PRIORITY_SERVICE
+    ) -> None:
+        if not force and self.cache.is_noop(slave_id, "coils", address, [bool(value)]):
+            return
+        await self._execute("write_coil", slave_id, address, value, priority=priority)
+        self.cache.put_block(slave_id, "coils", address, [bool(value)])
+
+    async def write_register(
+        self, address: int, value: int, slave_id: int, force: bool = False, priority: int = PRIORITY_SERVICE
+    ) -> None:
+        if not force and self.cache.is_noop(slave_id, "registers", address, [int(value)]):
+            return
+        await self._execute("write_register", slave_id, address, value, priority=priority)
+        self.cache.put_block(slave_id, "registers", address, [int(value)])
+
+    async def write_coils(
+        self,
+        address: int,
+        values: Sequence[bool],
+        slave_id: int,
+        force: bool = False,
+        priority: int = PRIORITY_SERVICE,
+    ) -> None:
+        """FC15, split into protocol-sized frames sent back to back."""
+        values = [bool(v) for v in values]
+        if not force and slave_id and self.cache.is_noop(slave_id, "coils", address, values):
+            return
+        chunks = [(address + i, values[i : i + MAX_WRITE_BITS]) for i in range(0, len(values), MAX_WRITE_BITS)]
+        if slave_id == 0:
+            for start, chunk in chunks:
+                await self._broadcast("write_coils", start, chunk, priority=priority)
+            return
+        await asyncio.gather(
+            *(self._execute("write_coils", slave_id, start, chunk, priority=priority) for start, chunk in chunks)
+        )
+        self.cache.put_block(slave_id, "coils", address, values)
+
+    async def write_registers(
+        self,
+        address: int,
+        values: Sequence[int],
+        slave_id: int,
+        force: bool = False,
+        priority: int = PRIORITY_SERVICE,
+    ) -> None:
+        """FC16, split into protocol-sized frames sent back to back."""
+        values = [int(v) for v in values]
+        if not force and slave_id and self.cache.is_noop(slave_id, "registers", address, values):
+            return
+        chunks = [(address + i, values[i : i + MAX_WRITE_REGISTERS]) for i in range(0, len(values), MAX_WRITE_REGISTERS)]
+        if slave_id == 0:
+            for start, chunk in chunks:
+                await self._broadcast("write_registers", start, chunk, priority=priority)
+            return
+        await asyncio.gather(
+            *(self._execute("write_registers", slave_id, start, chunk, priority=priority) for start, chunk in chunks)
+        )
+        self.cache.put_block(slave_id, "registers", address, values)
+
+    async def queue_write_coil(
+        self, address: int, value: bool, slave_id: int, force: bool = False, priority: int = PRIORITY_SERVICE
+    ) -> None:
+        """Write a coil through the short coalescing window (merged into FC15 with neighbours)."""
+        if slave_id == 0:
+            await self.broadcast_write_coil(address, bool(value), priority=priority)
+            return
+        if not force and self.cache.is_noop(slave_id, "coils", address, [bool(value)]):
+            return
+        await self._writes.submit("coils", slave_id, address, bool(value), priority)
+
+    async def queue_write_register(
+        self, address: int, value: int, slave_id: int, force: bool = False, priority: int = PRIORITY_SERVICE
+    ) -> None:
+        """Write a register through the short coalescing window (merged into FC16 with neighbours)."""
+        if slave_id == 0:
+            await self.broadcast_write_register(address, int(value), priority=priority)
+            return
+        if not force and self.cache.is_noop(slave_id, "registers", address, [int(value)]):
+            return
+        await self._writes.submit("registers", slave_id, address, int(value), priority)
+
+
+async def async_gateway_key(host: str, port: int) -> tuple[str, int]:
+    """Pool key for a gateway: its resolved address, so a hostname and its IP share a client.
+
+    Falls back to the lowercased host when it does not resolve (yet).
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError):
+        infos = []
+    return (infos[0][4][0] if infos else host.strip().lower(), int(port))
+
+
+class ModbusClientPool:
+    """Gateway clients shared by every config entry pointing at the same gateway.
+
+    Clients are reference counted: the first entry creates the client and its
+    connection settings win, later ones reuse it (a warning lists the settings they
+    could not apply), and the last release closes the sockets.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str, int], AsyncModbusTcpClientCompat] = {}
+        self._refs: dict[tuple[str, int], int] = {}
+        self._settings: dict[tuple[str, int], dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def acquire(
+        self, host: str, port: int, key: Optional[tuple[str, int]] = None, **kwargs: Any
+    ) -> AsyncModbusTcpClientCompat:
+        key = key or (host, port)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = AsyncModbusTcpClientCompat(host=host, port=port, **kwargs)
+            self._settings[key] = kwargs
+        else:
+            ignored = sorted(k for k, v in kwargs.items() if self._settings[key].get(k) != v)
+            if ignored:
+                _LOGGER.warning(
+                    "Gateway %s:%s is shared with another entry; keeping its settings, ignoring %s",
+                    host,
+                    port,
+                    ", ".join(ignored),
+                )
+        self._refs[key] = self._refs.get(key, 0) + 1
+        return client
+
+    def _key(self, client: AsyncModbusTcpClientCompat) -> Optional[tuple[str, int]]:
+        return next((key for key, c in self._clients.items() if c is client), None)
+
+    async def release(self, client: AsyncModbusTcpClientCompat) -> None:
+        key = self._key(client)
+        if key is None:
+            await client.close()
+            return
+        self._refs[key] -= 1
+        if self._refs[key] <= 0:
+            del self._refs[key]
+            del self._clients[key]
+            del self._settings[key]
+            await client.close()
+
+    def refs(self, client: AsyncModbusTcpClientCompat) -> int:
+        key = self._key(client)
+        return self._refs.get(key, 0) if key else 0
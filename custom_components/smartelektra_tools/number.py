@@ -9,8 +9,11 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity
 
-from . import get_state
-from .const import DOMAIN
+from . import get_client, get_coordinator, get_register_map, get_slaves, get_state
+from .const import DOMAIN, PRIORITY_INTERACTIVE
+from .devices import SlaveRecord, track_slaves
+from .entity import SEToolsSlaveEntity
+from .register_map import MapEntry
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -18,6 +21,25 @@ class SEToolsNumberDescription(NumberEntityDescription):
     key_state: str
 
 
+@dataclass(frozen=True, kw_only=True)
+class SEToolsRegisterNumberDescription(NumberEntityDescription):
+    map_entry: MapEntry
+
+
+def _register_description(map_entry: MapEntry) -> SEToolsRegisterNumberDescription:
+    return SEToolsRegisterNumberDescription(
+        key=map_entry.key,
+        name=map_entry.name,
+        icon=map_entry.icon,
+        native_min_value=map_entry.min_value,
+        native_max_value=map_entry.max_value,
+        native_step=map_entry.step,
+        native_unit_of_measurement=map_entry.unit,
+        entity_category=EntityCategory(map_entry.category) if map_entry.category else None,
+        map_entry=map_entry,
+    )
+
+
 DESCRIPTIONS: tuple[SEToolsNumberDescription, ...] = (
     SEToolsNumberDescription(
         key="target_slave",
@@ -37,52 +59,21 @@ DESCRIPTIONS: tuple[SEToolsNumberDescription, ...] = (
         native_max_value=247,
         native_step=1,
     ),
-    SEToolsNumberDescription(
-        key="hr_new_slave",
-        key_state="hr_new_slave",
-        name="HR address: new slave",
-        icon="mdi:format-list-numbered",
-        native_min_value=0,
-        native_max_value=65535,
-        native_step=1,
-        entity_category=EntityCategory.CONFIG,
-    ),
-    SEToolsNumberDescription(
-        key="hr_button_mode",
-        key_state="hr_button_mode",
-        name="HR address: button mode",
-        icon="mdi:format-list-numbered",
-        native_min_value=0,
-        native_max_value=65535,
-        native_step=1,
-        entity_category=EntityCategory.CONFIG,
-    ),
-    SEToolsNumberDescription(
-        key="hr_output_level",
-        key_state="hr_output_level",
-        name="HR address: output level",
-        icon="mdi:format-list-numbered",
-        native_min_value=0,
-        native_max_value=65535,
-        native_step=1,
-        entity_category=EntityCategory.CONFIG,
-    ),
-    SEToolsNumberDescription(
-        key="coil_test_output",
-        key_state="coil_test_output",
-        name="Coil address: test output",
-        icon="mdi:format-list-numbered",
-        native_min_value=0,
-        native_max_value=65535,
-        native_step=1,
-        entity_category=EntityCategory.CONFIG,
-    ),
 )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     async_add_entities([SEToolsNumber(hass, entry, d) for d in DESCRIPTIONS])
 
+    coordinator = get_coordinator(hass, entry.entry_id)
+    descriptions = [_register_description(m) for m in get_register_map(hass, entry.entry_id).for_platform("number")]
+
+    def factory(record: SlaveRecord) -> list[SEToolsRegisterNumber]:
+        return [SEToolsRegisterNumber(hass, entry, coordinator, record, d) for d in descriptions]
+
+    if descriptions:
+        entry.async_on_unload(track_slaves(get_slaves(hass, entry.entry_id), async_add_entities, factory))
+
 
 class SEToolsNumber(NumberEntity, RestoreEntity):
     _attr_has_entity_name = True
@@ -110,12 +101,33 @@ class SEToolsNumber(NumberEntity, RestoreEntity):
         if last is None or last.state in (None, "unknown", "unavailable"):
             return
         try:
-            restored = float(last.state)
+            restored = int(float(last.state))
         except ValueError:
             return
-        await self.async_set_native_value(restored)
+        get_state(self.hass, self.entry.entry_id)[self.entity_description.key_state] = restored
+        self.async_write_ha_state()
 
     async def async_set_native_value(self, value: float) -> None:
         state = get_state(self.hass, self.entry.entry_id)
         state[self.entity_description.key_state] = int(value)
         self.async_write_ha_state()
+        if self.entity_description.key_state == "target_slave" and 1 <= int(value) <= 247:
+            # a targeted slave becomes a device of its own (polled as soon as it is added)
+            get_slaves(self.hass, self.entry.entry_id).add(int(value))
+
+
+class SEToolsRegisterNumber(SEToolsSlaveEntity, NumberEntity):
+    """A holding register declared as a number in the register map."""
+
+    @property
+    def native_value(self) -> float | None:
+        value = self._value
+        return float(value) if value is not None else None
+
+    async def async_set_native_value(self, value: float) -> None:
+        client = get_client(self.hass, self.entry.entry_id)
+        await client.queue_write_register(
+            self._map_entry.address, int(value), self._record.slave_id, priority=PRIORITY_INTERACTIVE
+        )
+        self._set_value(int(value))
+        self._publish()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from .const import (
+    DEFAULT_FRAME_GAP_MAX,
+    DEFAULT_FRAME_GAP_STEP,
+    DEFAULT_TIMEOUT_MIN,
+    PACING_MAX_BOOST,
+    PACING_MIN_SAMPLES,
+    PACING_OFFLINE_AFTER,
+    PACING_RECALC_EVERY,
+    PACING_TIMEOUT_FACTOR,
+)
+from .stats import OUTCOME_ERROR, OUTCOME_OK, OUTCOME_TIMEOUT, LinkStats
+
+
+class _SlavePacing:
+    __slots__ = ("timeout", "samples", "failures", "boost")
+
+    def __init__(self) -> None:
+        # learnt from this slave's p99; None until enough replies were seen
+        self.timeout: Optional[float] = None
+        self.samples = 0
+        # consecutive requests without a reply
+        self.failures = 0
+        # timeout multiplier after the first misses, halved again by every reply
+        self.boost = 1.0
+
+
+class AdaptivePacer:
+    """Per-gateway timeouts and inter-frame gap learnt from observed round trips.
+
+    A slave's timeout is ``PACING_TIMEOUT_FACTOR`` x its p99 round trip (the link-wide
+    p99 for slaves without enough replies yet), kept between ``min_timeout`` and the
+    configured ``max_timeout``. A miss of a slave that answered before doubles its
+    timeout (up to ``PACING_MAX_BOOST`` x) so a slow reply is not cut off twice; after
+    ``PACING_OFFLINE_AFTER`` misses in a row the slave is taken as offline and
+    gets the plain timeout again, so absent slaves stay cheap to poll.
+
+    No timeout is shorter than the gateway's ``turnaround`` (its own wait for an RTU
+    reply) for every frame ahead of it at the gateway plus itself: the learnt value
+    only measures the bus, and a frame given up earlier keeps the gateway busy while
+    the next one is already counting. This floor may exceed ``max_timeout``.
+
+    Frames are spaced by ``gap`` (AIMD): a timeout or broken reply from a slave that
+    answered its previous request means the gateway is being overrun, so the gap
+    doubles; every reply shrinks it again by a tenth of ``gap_step``. Misses of dead slaves do
+    not count as congestion.
+    """
+
+    def __init__(
+        self,
+        stats: LinkStats,
+        max_timeout: float,
+        min_timeout: float = DEFAULT_TIMEOUT_MIN,
+        gap_step: float = DEFAULT_FRAME_GAP_STEP,
+        max_gap: float = DEFAULT_FRAME_GAP_MAX,
+        turnaround: float = 0.0,
+    ) -> None:
+        self._stats = stats
+        self._max_timeout = max(float(max_timeout), min_timeout)
+        self._min_timeout = min_timeout
+        self._gap_step = gap_step
+        self._max_gap = max_gap
+        self._turnaround = max(0.0, float(turnaround))
+        self._slaves: dict[int, _SlavePacing] = {}
+        self._link_timeout: Optional[float] = None
+        self._link_samples = 0
+        self._next_send = 0.0
+        self.gap = 0.0
+        self.gap_increases = 0
+
+    def _bounded(self, seconds: float) -> float:
+        return min(self._max_timeout, max(self._min_timeout, seconds))
+
+    def floor(self, queued: int = 0) -> float:
+        """Shortest timeout for a frame with ``queued`` frames ahead of it at the gateway."""
+        return self._turnaround * (1 + max(0, queued))
+
+    def timeout(self, slave_id: int, queued: int = 0) -> float:
+        """Reply timeout to use for the next request to ``slave_id``."""
+        pacing = self._slaves.get(slave_id)
+        if pacing is None:
+            learnt = self._link_timeout or self._max_timeout
+        else:
+            base = pacing.timeout or self._link_timeout or self._max_timeout
+            if pacing.failures >= PACING_OFFLINE_AFTER:
+                learnt = self._bounded(base)
+            else:
+                learnt = self._bounded(base * pacing.boost)
+        return max(learnt, self.floor(queued))
+
+    async def wait_turn(self) -> None:
+        """Wait until the gap after the previous frame has passed."""
+        if self.gap <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_send)
+        self._next_send = start + self.gap
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def record(self, slave_id: int, outcome: str) -> None:
+        """Feed the result of one request (after :meth:`LinkStats.record`)."""
+        pacing = self._slaves.get(slave_id)
+        if pacing is None:
+            pacing = self._slaves[slave_id] = _SlavePacing()
+        if outcome in (OUTCOME_TIMEOUT, OUTCOME_ERROR):
+            if pacing.samples:
+                if pacing.failures == 0:
+                    self.gap = min(self._max_gap, max(self._gap_step, self.gap * 2))
+                    self.gap_increases += 1
+                pacing.boost = min(PACING_MAX_BOOST, pacing.boost * 2)
+            pacing.failures += 1
+            return
+        # an exception reply from the slave is still a reply: the slave and the link
+        # work (gateway exceptions 0x0A/0x0B arrive here as timeouts)
+        pacing.failures = 0
+        pacing.boost = max(1.0, pacing.boost / 2)
+        if self.gap > 0:
+            self.gap = max(0.0, self.gap - self._gap_step / 10)
+        if outcome != OUTCOME_OK:
+            return
+        pacing.samples += 1
+        if pacing.samples >= PACING_MIN_SAMPLES and (
+            pacing.timeout is None or pacing.samples % PACING_RECALC_EVERY == 0
+        ):
+            window = self._stats.by_slave.get(slave_id)
+            p99 = window.percentile(99) if window is not None else None
+            if p99 is not None:
+                pacing.timeout = self._bounded(p99 * PACING_TIMEOUT_FACTOR)
+        self._link_samples += 1
+        if self._link_samples >= PACING_MIN_SAMPLES and (
+            self._link_timeout is None or self._link_samples % PACING_RECALC_EVERY == 0
+        ):
+            p99 = self._stats.latency.percentile(99)
+            if p99 is not None:
+                self._link_timeout = self._bounded(p99 * PACING_TIMEOUT_FACTOR)
+
+    def snapshot(self) -> dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "gap_ms": ms(self.gap),
+            "gap_increases": self.gap_increases,
+            "max_timeout_ms": ms(self._max_timeout),
+            "turnaround_ms": ms(self._turnaround),
+            "link_timeout_ms": ms(self._link_timeout),
+            "timeout_ms": {str(slave): ms(self.timeout(slave)) for slave in sorted(self._slaves)},
+        }
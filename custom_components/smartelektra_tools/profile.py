@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Iterable
+
+from .const import (
+    DEFAULT_POLL_MAX_GAP_BITS,
+    DEFAULT_POLL_MAX_GAP_REGISTERS,
+    DEFAULT_PROFILE_CONCURRENCY,
+    MAX_READ_BITS,
+    MAX_READ_REGISTERS,
+    MAX_WRITE_BITS,
+    MAX_WRITE_REGISTERS,
+    PRIORITY_BULK,
+    UNSUPPORTED_EXCEPTION_CODES,
+)
+from .exceptions import ModbusExceptionError
+from .modbus_client import AsyncModbusTcpClientCompat
+from .register_map import plan_blocks, plan_runs
+
+
+async def _read_current(
+    client: AsyncModbusTcpClientCompat, table: str, addresses: list[int], slave_id: int
+) -> dict[int, Any]:
+    """Read the wanted addresses with as few block reads as possible (exact ranges if the slave refuses gaps)."""
+    if table == "coils":
+        read, limit, gap = client.read_coils, MAX_READ_BITS, DEFAULT_POLL_MAX_GAP_BITS
+    else:
+        read, limit, gap = client.read_holding_registers, MAX_READ_REGISTERS, DEFAULT_POLL_MAX_GAP_REGISTERS
+    for max_gap in (gap, 0):
+        blocks = plan_blocks(addresses, limit, max_gap)
+        try:
+            results = await asyncio.gather(
+                *(read(start, count, slave_id, priority=PRIORITY_BULK) for start, count in blocks)
+            )
+            break
+        except ModbusExceptionError as err:
+            # only a refused range is worth retrying, and only if the exact plan differs
+            if max_gap == 0 or err.code not in UNSUPPORTED_EXCEPTION_CODES:
+                raise
+            if blocks == plan_blocks(addresses, limit, 0):
+                raise
+    current: dict[int, Any] = {}
+    for (start, _count), block in zip(blocks, results):
+        for offset, value in enumerate(block):
+            current[start + offset] = value
+    return {addr: current[addr] for addr in addresses}
+
+
+async def _apply_one(
+    client: AsyncModbusTcpClientCompat,
+    slave_id: int,
+    profile: dict[str, dict[int, Any]],
+    dry_run: bool,
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    changes: list[dict[str, Any]] = []
+    try:
+        tables = [table for table in ("coils", "registers") if profile.get(table)]
+        # let both reads finish before reporting so no orphaned frame outlives the device
+        currents = await asyncio.gather(
+            *(_read_current(client, table, sorted(profile[table]), slave_id) for table in tables),
+            return_exceptions=True,
+        )
+        for current in currents:
+            if isinstance(current, BaseException):
+                raise current
+        diffs: dict[str, dict[int, Any]] = {}
+        for table, current in zip(tables, currents):
+            diff = {addr: want for addr, want in profile[table].items() if current[addr] != want}
+            diffs[table] = diff
+            changes.extend(
+                {"table": table, "address": addr, "old": current[addr], "new": want}
+                for addr, want in sorted(diff.items())
+            )
+        if not dry_run:
+            writes = []
+            for start, values in plan_runs(diffs.get("coils", {}), MAX_WRITE_BITS):
+                if len(values) == 1:
+                    writes.append(client.write_coil(start, values[0], slave_id, force=True, priority=PRIORITY_BULK))
+                else:
+                    writes.append(client.write_coils(start, values, slave_id, force=True, priority=PRIORITY_BULK))
+            for start, values in plan_runs(diffs.get("registers", {}), MAX_WRITE_REGISTERS):
+                if len(values) == 1:
+                    writes.append(client.write_register(start, values[0], slave_id, force=True, priority=PRIORITY_BULK))
+                else:
+                    writes.append(client.write_registers(start, values, slave_id, force=True, priority=PRIORITY_BULK))
+            await asyncio.gather(*writes)
+    except Exception as err:
+        return {
+            "slave": slave_id,
+            "status": "failed",
+            "changes": changes,
+            "error": str(err) or type(err).__name__,
+            "elapsed": round(loop.time() - t0, 3),
+        }
+    return {
+        "slave": slave_id,
+        "status": "changed" if changes else "unchanged",
+        "changes": changes,
+        "error": None,
+        "elapsed": round(loop.time() - t0, 3),
+    }
+
+
+async def async_apply_profile(
+    client: AsyncModbusTcpClientCompat,
+    slaves: Iterable[int],
+    coils: dict[int, bool],
+    registers: dict[int, int],
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_PROFILE_CONCURRENCY,
+) -> dict[str, Any]:
+    """Converge slaves to the desired coil/register values.
+
+    Each device costs one merged read per table plus one write per run of changed
+    addresses (FC15/FC16 for neighbours); devices already in the desired state
+    are not written at all. With ``dry_run`` only the diff is reported.
+    """
+    profile = {
+        "coils": {addr: bool(value) for addr, value in coils.items()},
+        "registers": {addr: int(value) for addr, value in registers.items()},
+    }
+    sem = asyncio.Semaphore(max(1, concurrency))
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+
+    async def run(slave_id: int) -> dict[str, Any]:
+        async with sem:
+            return await _apply_one(client, slave_id, profile, dry_run)
+
+    devices = list(await asyncio.gather(*(run(slave_id) for slave_id in slaves)))
+    failed = sum(1 for d in devices if d["status"] == "failed")
+    return {
+        "devices": devices,
+        "changed": sum(1 for d in devices if d["status"] == "changed"),
+        "unchanged": sum(1 for d in devices if d["status"] == "unchanged"),
+        "failed": failed,
+        "changes": sum(len(d["changes"]) for d in devices),
+        "dry_run": dry_run,
+        "elapsed": round(loop.time() - t0, 3),
+    }
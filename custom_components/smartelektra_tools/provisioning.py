@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Iterable, Optional
+
+from .const import (
+    DEFAULT_HR_NEW_SLAVE,
+    DEFAULT_PROVISION_CONCURRENCY,
+    DEFAULT_PROVISION_INTERVAL,
+    DEFAULT_PROVISION_VERIFY_TIMEOUT,
+    PRIORITY_BULK,
+    PRIORITY_SERVICE,
+)
+from .devices import SlaveDirectory
+from .modbus_client import AsyncModbusTcpClientCompat
+
+# Pause between read-back attempts while a re-addressed slave comes back up
+VERIFY_RETRY_DELAY = 0.05
+
+
+def check_pairs(pairs: Iterable[tuple[int, int]]) -> None:
+    """Validate a batch of (current, new) pairs against the state after the batch; raises ValueError.
+
+    Chains such as 1->2 with 2->3 are fine (``async_provision_slaves`` moves 2 away
+    first); cycles such as 1->2 with 2->1 need a free temporary ID and are rejected.
+    """
+    pairs = list(pairs)
+    currents = [current for current, _ in pairs]
+    news = [new for _, new in pairs]
+    if len(set(news)) != len(news):
+        raise ValueError("new slave IDs must be unique")
+    if len(set(currents)) != len(currents):
+        raise ValueError("current slave IDs must be unique")
+    moves = {current: new for current, new in pairs if current != new}
+    for start in moves:
+        seen = {start}
+        target = moves[start]
+        while target in moves:
+            if target in seen:
+                raise ValueError(f"slave IDs {sorted(seen)} form a cycle; move one of them to a free ID first")
+            seen.add(target)
+            target = moves[target]
+
+
+async def async_set_slave_id(
+    client: AsyncModbusTcpClientCompat,
+    slaves: SlaveDirectory,
+    new_slave: int,
+    target_slave: int = 0,
+    hr_address: int = DEFAULT_HR_NEW_SLAVE,
+    priority: int = PRIORITY_SERVICE,
+) -> None:
+    """Re-address one slave (``target_slave`` 0 = broadcast) and move it in the slave directory.
+
+    The write bypasses the shadow cache and both IDs are invalidated, so nothing
+    cached for the old address is served under the new one.
+    """
+    if target_slave == 0:
+        # broadcast never yields a reply; send it without waiting out the timeout
+        await client.broadcast_write_register(hr_address, new_slave, priority=priority)
+        client.invalidate_slave(new_slave)
+        return
+    await client.write_register(hr_address, new_slave, target_slave, force=True, priority=priority)
+    client.invalidate_slave(target_slave)
+    client.invalidate_slave(new_slave)
+    slaves.discard(target_slave)
+    slaves.add(new_slave)
+
+
+async def _verify(
+    client: AsyncModbusTcpClientCompat, new_slave: int, hr_address: int, verify_timeout: float
+) -> tuple[Optional[int], Optional[str]]:
+    """Read HR0 back from the new address until it answers or the deadline passes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + verify_timeout
+    error: Optional[str] = None
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None, error or "no response at new address"
+        try:
+            regs = await client.read_holding_registers(hr_address, 1, new_slave, priority=PRIORITY_BULK)
+            return regs[0], None
+        except ConnectionError:
+            raise
+        except Exception as err:
+            error = str(err) or type(err).__name__
+        await asyncio.sleep(min(VERIFY_RETRY_DELAY, max(0.0, deadline - loop.time())))
+
+
+async def _provision_one(
+    client: AsyncModbusTcpClientCompat,
+    current: int,
+    new_slave: int,
+    hr_address: int,
+    verify_timeout: float,
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    write_error: Optional[str] = None
+    readback: Optional[int] = None
+    verify_error: Optional[str] = None
+    try:
+        if current == 0:
+            await client.broadcast_write_register(hr_address, new_slave, priority=PRIORITY_BULK)
+        else:
+            try:
+                await client.write_register(hr_address, new_slave, current, force=True, priority=PRIORITY_BULK)
+            except ConnectionError:
+                raise
+            except Exception as err:
+                # the slave may switch address before replying; the read-back decides
+                write_error = str(err) or type(err).__name__
+        client.invalidate_slave(current)
+        client.invalidate_slave(new_slave)
+        readback, verify_error = await _verify(client, new_slave, hr_address, verify_timeout)
+    except ConnectionError as err:
+        verify_error = str(err)
+
+    if verify_error is None and readback != new_slave:
+        verify_error = f"read back {readback} instead of {new_slave}"
+    ok = verify_error is None
+    return {
+        "current": current,
+        "new": new_slave,
+        "status": "ok" if ok else "failed",
+        "readback": readback,
+        "error": None if ok else (write_error or verify_error),
+        "elapsed": round(loop.time() - t0, 3),
+    }
+
+
+async def async_provision_slaves(
+    client: AsyncModbusTcpClientCompat,
+    pairs: Iterable[tuple[int, int]],
+    hr_address: int = DEFAULT_HR_NEW_SLAVE,
+    concurrency: int = DEFAULT_PROVISION_CONCURRENCY,
+    verify_timeout: float = DEFAULT_PROVISION_VERIFY_TIMEOUT,
+) -> dict[str, Any]:
+    """Re-address many slaves in one pass: pipelined HR0 writes, each verified by read-back.
+
+    ``pairs`` must pass :func:`check_pairs`. A move onto an ID that another pair
+    vacates waits for that pair and fails if it failed.
+    """
+    pairs = list(pairs)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    vacated = {current: asyncio.Event() for current, new_slave in pairs if current != new_slave}
+    results: dict[int, dict[str, Any]] = {}
+
+    async def run(current: int, new_slave: int) -> dict[str, Any]:
+        try:
+            if new_slave != current and new_slave in vacated:
+                await vacated[new_slave].wait()
+                if results[new_slave]["status"] != "ok":
+                    result = {
+                        "current": current,
+                        "new": new_slave,
+                        "status": "failed",
+                        "readback": None,
+                        "error": f"slave {new_slave} was not moved away",
+                        "elapsed": 0.0,
+                    }
+                    results[current] = result
+                    return result
+            async with sem:
+                result = await _provision_one(client, current, new_slave, hr_address, verify_timeout)
+            results[current] = result
+            return result
+        finally:
+            if current in vacated:
+                vacated[current].set()
+
+    devices = await asyncio.gather(*(run(current, new_slave) for current, new_slave in pairs))
+    return _summary(list(devices), loop.time() - t0)
+
+
+async def async_provision_broadcast(
+    client: AsyncModbusTcpClientCompat,
+    start_id: int,
+    count: int,
+    hr_address: int = DEFAULT_HR_NEW_SLAVE,
+    verify_timeout: float = DEFAULT_PROVISION_VERIFY_TIMEOUT,
+    interval: float = DEFAULT_PROVISION_INTERVAL,
+) -> dict[str, Any]:
+    """Assign start_id, start_id + 1, ... over broadcast.
+
+    Only one unaddressed module may be on the bus per step; ``interval`` leaves time
+    to connect the next one.
+    """
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    devices: list[dict[str, Any]] = []
+    for i in range(count):
+        if i and interval > 0:
+            await asyncio.sleep(interval)
+        devices.append(await _provision_one(client, 0, start_id + i, hr_address, verify_timeout))
+    return _summary(devices, loop.time() - t0)
+
+
+def _summary(devices: list[dict[str, Any]], elapsed: float) -> dict[str, Any]:
+    ok = sum(1 for d in devices if d["status"] == "ok")
+    return {
+        "devices": devices,
+        "ok": ok,
+        "failed": len(devices) - ok,
+        "elapsed": round(elapsed, 3),
+    }
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from homeassistant.helpers.entity import Entity
+
+
+class StatePublisher:
+    """Write entity states to Home Assistant in batches, and only when they changed.
+
+    Entities ask for a publish instead of calling ``async_write_ha_state``. All
+    requests made while one poll cycle or bulk job runs are handled together on
+    the next event-loop tick. An entity whose (available, state) is what was last
+    published is skipped, and a changed entity is written at most once per
+    ``min_interval`` (the latest value goes out when the interval has passed).
+    User actions pass ``immediate`` to skip the interval.
+    """
+
+    def __init__(self, min_interval: float) -> None:
+        self._min_interval = max(0.0, float(min_interval))
+        self._pending: dict[Entity, bool] = {}
+        self._deferred: dict[Entity, None] = {}
+        self._last: dict[Entity, tuple[float, Any]] = {}
+        self._tick: Optional[asyncio.Handle] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.published = 0
+        self.unchanged = 0
+        self.deferred = 0
+
+    def schedule(self, entity: Entity, immediate: bool = False) -> None:
+        self._pending[entity] = self._pending.get(entity, False) or immediate
+        if self._tick is None:
+            self._tick = asyncio.get_running_loop().call_soon(self._flush)
+
+    def forget(self, entity: Entity) -> None:
+        """Drop an entity that is being removed."""
+        self._pending.pop(entity, None)
+        self._deferred.pop(entity, None)
+        self._last.pop(entity, None)
+
+    def cancel(self) -> None:
+        for handle in (self._tick, self._timer):
+            if handle is not None:
+                handle.cancel()
+        self._tick = self._timer = None
+        self._pending.clear()
+        self._deferred.clear()
+
+    def _release_deferred(self) -> None:
+        self._timer = None
+        for entity in self._deferred:
+            self._pending.setdefault(entity, False)
+        self._deferred.clear()
+        if self._tick is None:
+            self._tick = asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._tick = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending, self._pending = self._pending, {}
+        next_due: Optional[float] = None
+        for entity, immediate in pending.items():
+            if entity.hass is None or entity.platform is None:
+                continue
+            key = (entity.available, entity.state)
+            last = self._last.get(entity)
+            if last is not None and last[1] == key:
+                self.unchanged += 1
+                continue
+            if not immediate and last is not None and now - last[0] < self._min_interval:
+                due = last[0] + self._min_interval
+                next_due = due if next_due is None else min(next_due, due)
+                self._deferred[entity] = None
+                self.deferred += 1
+                continue
+            entity.async_write_ha_state()
+            self._last[entity] = (now, key)
+            self.published += 1
+        if next_due is not None and (self._timer is None or next_due < self._timer.when()):
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = loop.call_at(next_due, self._release_deferred)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "min_interval": self._min_interval,
+            "published": self.published,
+            "unchanged": self.unchanged,
+            "deferred": self.deferred,
+            "waiting": len(self._deferred),
+        }
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import struct
+from typing import Any, List, Sequence
+
+from .const import MAX_READ_BITS, MAX_READ_REGISTERS, PRIORITY_SERVICE
+from .modbus_client import AsyncModbusTcpClientCompat
+
+# table -> (client method, max items per frame)
+READ_TABLES: dict[str, tuple[str, int]] = {
+    "coils": ("read_coils", MAX_READ_BITS),
+    "discrete_inputs": ("read_discrete_inputs", MAX_READ_BITS),
+    "holding_registers": ("read_holding_registers", MAX_READ_REGISTERS),
+    "input_registers": ("read_input_registers", MAX_READ_REGISTERS),
+}
+
+# data type -> (struct format, registers per value)
+DATA_TYPES: dict[str, tuple[str, int]] = {
+    "uint16": ("H", 1),
+    "int16": ("h", 1),
+    "uint32": ("I", 2),
+    "int32": ("i", 2),
+    "float32": ("f", 2),
+}
+
+WORD_ORDERS = ("big", "little")
+
+
+async def async_read_range(
+    client: AsyncModbusTcpClientCompat,
+    table: str,
+    address: int,
+    count: int,
+    slave_id: int,
+    priority: int = PRIORITY_SERVICE,
+) -> List[Any]:
+    """Read ``count`` items from ``table``, split into protocol-sized frames.
+
+    All frames are submitted at once so they fill the client's pipeline (and every
+    socket); the result is reassembled in address order.
+    """
+    method, limit = READ_TABLES[table]
+    read = getattr(client, method)
+    chunks = [(address + i, min(limit, count - i)) for i in range(0, count, limit)]
+    blocks = await asyncio.gather(*(read(start, n, slave_id, priority=priority) for start, n in chunks))
+    return [value for block in blocks for value in block]
+
+
+def decode_registers(registers: Sequence[int], data_type: str = "uint16", word_order: str = "big") -> List[Any]:
+    """Decode raw 16-bit registers; 32-bit types use two registers, high word first for ``big``.
+
+    Non-finite floats come back as None so the result stays JSON serializable.
+    """
+    fmt, width = DATA_TYPES[data_type]
+    if len(registers) % width:
+        raise ValueError(f"{data_type} needs a multiple of {width} registers, got {len(registers)}")
+    values: List[Any] = []
+    for i in range(0, len(registers), width):
+        words = list(registers[i : i + width])
+        if word_order == "little":
+            words.reverse()
+        raw = struct.pack(f">{width}H", *words)
+        value = struct.unpack(f">{fmt}", raw)[0]
+        if isinstance(value, float) and not math.isfinite(value):
+            value = None
+        values.append(value)
+    return values
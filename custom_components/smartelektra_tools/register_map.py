@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+import yaml
+
+from .const import (
+    DEFAULT_POLL_MAX_GAP_BITS,
+    DEFAULT_POLL_MAX_GAP_REGISTERS,
+    MAX_READ_BITS,
+    MAX_READ_REGISTERS,
+)
+
+# Maps shipped with the integration; users may add their own to <config>/smartelektra_tools/maps
+BUILTIN_MAPS_DIR = os.path.join(os.path.dirname(__file__), "maps")
+MAP_SUFFIXES = (".json", ".yaml", ".yml")
+
+MAP_PLATFORMS = ("select", "switch", "number")
+CATEGORIES = ("config", "diagnostic")
+
+
+def plan_blocks(addresses: Iterable[int], max_count: int, max_gap: int = 0) -> list[tuple[int, int]]:
+    """Merge addresses into as few (start, count) reads as possible.
+
+    Neighbouring addresses end up in one block when at most ``max_gap`` unused
+    addresses lie between them and the block stays within ``max_count``.
+    """
+    blocks: list[tuple[int, int]] = []
+    start = end = None
+    for addr in sorted(set(addresses)):
+        if start is not None and addr - end - 1 <= max_gap and addr - start < max_count:
+            end = addr
+            continue
+        if start is not None:
+            blocks.append((start, end - start + 1))
+        start = end = addr
+    if start is not None:
+        blocks.append((start, end - start + 1))
+    return blocks
+
+
+def plan_runs(values: dict[int, Any], limit: Optional[int] = None) -> list[tuple[int, list[Any]]]:
+    """Split {address: value} into (start, values) runs of consecutive addresses, at most ``limit`` long."""
+    runs: list[tuple[int, list[Any]]] = []
+    for addr in sorted(values):
+        if runs and runs[-1][0] + len(runs[-1][1]) == addr and (limit is None or len(runs[-1][1]) < limit):
+            runs[-1][1].append(values[addr])
+        else:
+            runs.append((addr, [values[addr]]))
+    return runs
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class MapEntry:
+    """One firmware parameter, resolved to its table and address."""
+
+    key: str
+    index: int  # position in RegisterMap.entries (and in each slave's value list)
+    platform: str
+    table: str  # "coils" or "registers"
+    address: int
+    name: str
+    icon: Optional[str] = None
+    category: Optional[str] = None
+    # select: option -> raw value and back
+    to_raw: dict[str, int] = field(default_factory=dict)
+    from_raw: dict[int, str] = field(default_factory=dict)
+    # number
+    min_value: float = 0
+    max_value: float = 65535
+    step: float = 1
+    unit: Optional[str] = None
+
+    def decode(self, raw: Any) -> Any:
+        """Turn a polled coil/register value into the entity value."""
+        if raw is None:
+            return None
+        if self.platform == "select":
+            return self.from_raw.get(raw)
+        if self.platform == "switch":
+            return bool(raw)
+        return raw
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RegisterMap:
+    """A compiled map: entries plus precomputed address tables and read plans."""
+
+    map_id: str
+    name: str
+    slave_id_address: int
+    entries: tuple[MapEntry, ...]
+    by_key: dict[str, MapEntry]
+    # table -> sorted addresses polled every cycle
+    addresses: dict[str, tuple[int, ...]]
+    # table -> (start, count) blocks, merged over small gaps
+    read_plan: dict[str, tuple[tuple[int, int], ...]]
+    # table -> exact contiguous runs, for firmware that rejects reads over unused addresses
+    strict_plan: dict[str, tuple[tuple[int, int], ...]]
+    # holding register the firmware bumps on every change of a mapped value (None: no counter)
+    change_counter_address: Optional[int] = None
+
+    def for_platform(self, platform: str) -> tuple[MapEntry, ...]:
+        return tuple(entry for entry in self.entries if entry.platform == platform)
+
+
+def _entry(index: int, raw: dict[str, Any]) -> MapEntry:
+    key = raw.get("key")
+    if not isinstance(key, str) or not key:
+        raise ValueError(f"entity without key: {raw}")
+    platform = raw.get("platform")
+    if platform not in MAP_PLATFORMS:
+        raise ValueError(f"{key}: platform must be one of {', '.join(MAP_PLATFORMS)}")
+    if ("coil" in raw) == ("register" in raw):
+        raise ValueError(f"{key}: give exactly one of coil or register")
+    table = "coils" if "coil" in raw else "registers"
+    address = int(raw["coil"] if table == "coils" else raw["register"])
+    if not 0 <= address <= 65535:
+        raise ValueError(f"{key}: address {address} out of range")
+    if (platform == "switch") != (table == "coils"):
+        raise ValueError(f"{key}: switches map to coils, selects and numbers to registers")
+    category = raw.get("category")
+    if category is not None and category not in CATEGORIES:
+        raise ValueError(f"{key}: category must be one of {', '.join(CATEGORIES)}")
+    to_raw = {str(option): int(value) for option, value in (raw.get("options") or {}).items()}
+    if platform == "select" and not to_raw:
+        raise ValueError(f"{key}: a select needs options")
+    return MapEntry(
+        key=key,
+        index=index,
+        platform=platform,
+        table=table,
+        address=address,
+        name=str(raw.get("name", key)),
+        icon=raw.get("icon"),
+        category=category,
+        to_raw=to_raw,
+        from_raw={value: option for option, value in to_raw.items()},
+        min_value=float(raw.get("min", 0)),
+        max_value=float(raw.get("max", 65535)),
+        step=float(raw.get("step", 1)),
+        unit=raw.get("unit"),
+    )
+
+
+def compile_map(raw: dict[str, Any], map_id: str) -> RegisterMap:
+    """Validate a parsed map file and precompute its lookup tables; raises ValueError."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{map_id}: map must be a mapping")
+    entries = tuple(_entry(index, item) for index, item in enumerate(raw.get("entities") or ()))
+    by_key = {entry.key: entry for entry in entries}
+    if len(by_key) != len(entries):
+        raise ValueError(f"{map_id}: duplicate entity keys")
+    slave_id_address = int(raw.get("slave_id_register", 0))
+    change_counter_address = raw.get("change_counter_register")
+    if change_counter_address is not None:
+        change_counter_address = int(change_counter_address)
+        if not 0 <= change_counter_address <= 65535:
+            raise ValueError(f"{map_id}: change_counter_register {change_counter_address} out of range")
+        if change_counter_address == slave_id_address or any(
+            entry.table == "registers" and entry.address == change_counter_address for entry in entries
+        ):
+            raise ValueError(f"{map_id}: change_counter_register must not be a mapped register")
+    wanted: dict[str, set[int]] = {"coils": set(), "registers": {slave_id_address}}
+    for entry in entries:
+        wanted[entry.table].add(entry.address)
+    limits = {
+        "coils": (MAX_READ_BITS, DEFAULT_POLL_MAX_GAP_BITS),
+        "registers": (MAX_READ_REGISTERS, DEFAULT_POLL_MAX_GAP_REGISTERS),
+    }
+    return RegisterMap(
+        map_id=map_id,
+        name=str(raw.get("name", map_id)),
+        slave_id_address=slave_id_address,
+        entries=entries,
+        by_key=by_key,
+        addresses={table: tuple(sorted(addrs)) for table, addrs in wanted.items()},
+        read_plan={
+            table: tuple(plan_blocks(addrs, limits[table][0], limits[table][1])) for table, addrs in wanted.items()
+        },
+        strict_plan={table: tuple(plan_blocks(addrs, limits[table][0])) for table, addrs in wanted.items()},
+        change_counter_address=change_counter_address,
+    )
+
+
+def list_maps(*dirs: str) -> dict[str, str]:
+    """Return {map id: path} for every map file in ``dirs``; later dirs override earlier ones (blocking)."""
+    found: dict[str, str] = {}
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            map_id, suffix = os.path.splitext(name)
+            if suffix in MAP_SUFFIXES:
+                found[map_id] = os.path.join(directory, name)
+    return found
+
+
+def load_map(path: str) -> RegisterMap:
+    """Read and compile one map file (blocking)."""
+    map_id = os.path.splitext(os.path.basename(path))[0]
+    with open(path, encoding="utf-8") as fh:
+        raw = json.load(fh) if path.endswith(".json") else yaml.safe_load(fh)
+    return compile_map(raw, map_id)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from .const import (
+    DEFAULT_HR_NEW_SLAVE,
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_MIN_TIMEOUT,
+    DEFAULT_SCAN_TIMEOUT,
+    PRIORITY_BULK,
+    SCAN_TIMEOUT_FACTOR,
+)
+from .modbus_client import AsyncModbusTcpClientCompat
+
+
+async def async_scan_bus(
+    client: AsyncModbusTcpClientCompat,
+    start: int = 1,
+    end: int = 247,
+    address: int = DEFAULT_HR_NEW_SLAVE,
+    timeout: float = DEFAULT_SCAN_TIMEOUT,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    max_found: Optional[int] = None,
+) -> dict[str, Any]:
+    """Probe slave IDs start..end concurrently and return the ones that answered.
+
+    The probe timeout adapts to the slowest reply seen so far but never drops below
+    the gateway's turnaround (``client.turnaround``), so no abandoned probe is still
+    queued at the gateway when the next frame arrives. The scan stops early once
+    ``max_found`` slaves answered and aborts if the gateway keeps refusing connections.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for slave_id in range(start, end + 1):
+        queue.put_nowait(slave_id)
+
+    found: list[int] = []
+    probed = 0
+    slowest = 0.0
+    probe_timeout = max(timeout, client.turnaround)
+    aborted: Optional[str] = None
+    conn_errors = 0
+    max_conn_errors = 2 * max(1, concurrency)
+    done = asyncio.Event()
+
+    async def worker() -> None:
+        nonlocal probed, slowest, probe_timeout, aborted, conn_errors
+        while not done.is_set():
+            try:
+                slave_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                rtt = await client.probe(slave_id, address, probe_timeout, priority=PRIORITY_BULK)
+            except ConnectionError as err:
+                # retry the ID after reconnecting; give up if the gateway stays away
+                conn_errors += 1
+                if conn_errors > max_conn_errors:
+                    aborted = str(err)
+                    done.set()
+                    return
+                queue.put_nowait(slave_id)
+                continue
+            conn_errors = 0
+            probed += 1
+            if rtt is None:
+                continue
+            found.append(slave_id)
+            slowest = max(slowest, rtt)
+            probe_timeout = max(
+                client.turnaround, min(timeout, max(DEFAULT_SCAN_MIN_TIMEOUT, slowest * SCAN_TIMEOUT_FACTOR))
+            )
+            if max_found is not None and len(found) >= max_found:
+                done.set()
+
+    t_start = loop.time()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return {
+        "slaves": sorted(found),
+        "probed": probed,
+        "elapsed": round(loop.time() - t_start, 3),
+        "probe_timeout": round(probe_timeout, 3),
+        "aborted": aborted,
+    }
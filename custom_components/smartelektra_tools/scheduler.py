@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import OrderedDict, deque
+from typing import Any, Optional
+
+from .const import PRIORITY_BULK, PRIORITY_INTERACTIVE, PRIORITY_POLL, PRIORITY_SERVICE
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_SERVICE: "service",
+    PRIORITY_POLL: "poll",
+    PRIORITY_BULK: "bulk",
+}
+
+
+class RequestScheduler:
+    """Admit Modbus frames to the transport by priority class.
+
+    At most ``capacity`` frames are on the sockets at once, so a waiting frame never
+    sits behind more than that. When a slot frees up, the highest priority class with
+    waiters goes first and, within a class, slaves take turns (round robin), so one
+    busy slave cannot starve the others. Long jobs submit frame by frame and are
+    therefore overtaken between any two of their frames.
+
+    With more than one slot, background traffic (``PRIORITY_POLL`` and below) gets
+    at most ``capacity - 1`` of them: one slot stays free for interactive and service
+    frames, which then only wait for the background frames already at the gateway
+    (with the default two sockets: one, for at most one RTU turnaround), not for a
+    slot. A frame keeps its slot until it has its reply or its turnaround-bounded
+    timeout ran out, so a freed slot never hides a frame the gateway still works on.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = max(1, int(capacity))
+        self._active = 0
+        # background frames holding a slot, kept below capacity when it can be
+        self._background = 0
+        self._background_limit = max(1, self._capacity - 1)
+        self._queues: list[OrderedDict[int, deque[asyncio.Future]]] = [
+            OrderedDict() for _ in PRIORITY_NAMES
+        ]
+        self.granted = [0] * len(PRIORITY_NAMES)
+
+    @property
+    def active(self) -> int:
+        """Frames currently holding a slot."""
+        return self._active
+
+    def _waiting(self) -> int:
+        return sum(len(w) for q in self._queues for w in q.values())
+
+    def _admits(self, priority: int) -> bool:
+        return priority < PRIORITY_POLL or self._background < self._background_limit
+
+    def _take(self, priority: int) -> None:
+        self._active += 1
+        if priority >= PRIORITY_POLL:
+            self._background += 1
+        self.granted[priority] += 1
+
+    def _next(self) -> Optional[tuple[int, asyncio.Future]]:
+        for priority, slaves in enumerate(self._queues):
+            if not self._admits(priority):
+                break
+            while slaves:
+                slave_id, waiters = next(iter(slaves.items()))
+                fut = None
+                while waiters and fut is None:
+                    candidate = waiters.popleft()
+                    if not candidate.done():
+                        fut = candidate
+                if waiters:
+                    slaves.move_to_end(slave_id)
+                else:
+                    del slaves[slave_id]
+                if fut is not None:
+                    return priority, fut
+        return None
+
+    def _dispatch(self) -> None:
+        while self._active < self._capacity:
+            nxt = self._next()
+            if nxt is None:
+                return
+            priority, fut = nxt
+            self._take(priority)
+            fut.set_result(None)
+
+    def _priority(self, priority: int) -> int:
+        return min(max(priority, 0), len(self._queues) - 1)
+
+    async def acquire(self, priority: int, slave_id: int) -> None:
+        priority = self._priority(priority)
+        if self._active < self._capacity and self._admits(priority) and not self._waiting():
+            self._take(priority)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(slave_id, deque()).append(fut)
+        # background waiters held back by the reservation must not block this one
+        self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # granted right before the cancellation reached us
+                self.release(priority)
+            raise
+
+    def release(self, priority: int) -> None:
+        self._active -= 1
+        if self._priority(priority) >= PRIORITY_POLL:
+            self._background -= 1
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int, slave_id: int):
+        await self.acquire(priority, slave_id)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "capacity": self._capacity,
+            "active": self._active,
+            "background": self._background,
+            "background_limit": self._background_limit,
+            "waiting": {
+                PRIORITY_NAMES[p]: sum(len(w) for w in q.values()) for p, q in enumerate(self._queues)
+            },
+            "granted": {PRIORITY_NAMES[p]: n for p, n in enumerate(self.granted)},
+        }
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import get_client, get_coordinator, get_publisher
+from .const import DOMAIN
+from .coordinator import SEToolsCoordinator
+from .modbus_client import AsyncModbusTcpClientCompat
+
+
+@dataclass(frozen=True, kw_only=True)
+class SEToolsSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[AsyncModbusTcpClientCompat], Any]
+
+
+def _ms(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 1)
+
+
+def _latency(pct: float) -> SEToolsSensorDescription:
+    return SEToolsSensorDescription(
+        key=f"latency_p{pct:g}",
+        name=f"Request latency p{pct:g}",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: _ms(client.stats.latency.percentile(pct)),
+    )
+
+
+DESCRIPTIONS: tuple[SEToolsSensorDescription, ...] = (
+    SEToolsSensorDescription(
+        key="cache_hits",
+        name="Cache hits (skipped writes)",
+        icon="mdi:cached",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: client.cache.hits,
+    ),
+    SEToolsSensorDescription(
+        key="cache_misses",
+        name="Cache misses",
+        icon="mdi:cached",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: client.cache.misses,
+    ),
+    _latency(50),
+    _latency(95),
+    _latency(99),
+    SEToolsSensorDescription(
+        key="lock_wait_p95",
+        name="Queue wait p95",
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: _ms(client.stats.lock_wait.percentile(95)),
+    ),
+    SEToolsSensorDescription(
+        key="requests",
+        name="Requests",
+        icon="mdi:swap-horizontal",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: client.stats.requests,
+    ),
+    SEToolsSensorDescription(
+        key="timeouts",
+        name="Timeouts",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: client.stats.timeouts,
+    ),
+    SEToolsSensorDescription(
+        key="exception_responses",
+        name="Exception responses",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: client.stats.exceptions,
+    ),
+    SEToolsSensorDescription(
+        key="reconnects",
+        name="Reconnects",
+        icon="mdi:lan-connect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda client: client.stats.reconnects,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
+    coordinator = get_coordinator(hass, entry.entry_id)
+    async_add_entities([SEToolsSensor(hass, entry, coordinator, d) for d in DESCRIPTIONS])
+
+
+class SEToolsSensor(CoordinatorEntity[SEToolsCoordinator], SensorEntity):
+    """Diagnostic counter refreshed on every poll cycle."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: SEToolsCoordinator,
+        description: SEToolsSensorDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.hass = hass
+        self.entry = entry
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": "SmartElektra Tools",
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        get_publisher(self.hass, self.entry.entry_id).schedule(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        get_publisher(self.hass, self.entry.entry_id).forget(self)
+        await super().async_will_remove_from_hass()
+
+    @property
+    def available(self) -> bool:
+        # counters stay meaningful while the gateway is down
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        return self.entity_description.value_fn(get_client(self.hass, self.entry.entry_id))
@@ -0,0 +1,690 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import (
+    DOMAIN,
+    BACKUP_DIR,
+    DEFAULT_BACKUP_CONCURRENCY,
+    DEFAULT_PROFILE_CONCURRENCY,
+    DEFAULT_LINK_TEST_CONCURRENCY,
+    DEFAULT_LINK_TEST_OPERATIONS,
+    LINK_TEST_COIL_KEY,
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_TIMEOUT,
+    DEFAULT_PROVISION_CONCURRENCY,
+    DEFAULT_PROVISION_INTERVAL,
+    DEFAULT_PROVISION_VERIFY_TIMEOUT,
+    DEFAULT_SWEEP_ON_TIME,
+)
+from .backup import async_backup_devices, async_restore_devices, backup_path, load_backup, save_backup
+from .coordinator import SEToolsCoordinator
+from .devices import SlaveDirectory
+from .journal import WriteJournal
+from .link_test import MODES as LINK_TEST_MODES, async_link_test
+from .modbus_client import AsyncModbusTcpClientCompat
+from .profile import async_apply_profile
+from .provisioning import async_provision_broadcast, async_provision_slaves, async_set_slave_id, check_pairs
+from .register_map import RegisterMap
+from .reader import DATA_TYPES, READ_TABLES, WORD_ORDERS, async_read_range, decode_registers
+from .scanner import async_scan_bus
+from .sweep import PATTERNS as SWEEP_PATTERNS, async_sweep
+
+# entry_id value selecting every loaded gateway
+ALL_GATEWAYS = "all"
+
+
+@dataclass(frozen=True)
+class Gateway:
+    """One loaded config entry as seen by the services."""
+
+    entry_id: str
+    title: str
+    client: AsyncModbusTcpClientCompat
+    slaves: SlaveDirectory
+    coordinator: SEToolsCoordinator
+    register_map: RegisterMap
+    journal: WriteJournal
+
+
+Handler = Callable[[HomeAssistant, Gateway, ServiceCall], Awaitable[Optional[dict[str, Any]]]]
+
+
+def _loaded_entries(hass: HomeAssistant) -> dict[str, str]:
+    """entry_id -> title of every entry that is set up."""
+    stores = hass.data.get(DOMAIN, {})
+    return {
+        entry.entry_id: entry.title
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in stores
+    }
+
+
+def _targets(hass: HomeAssistant, call: ServiceCall) -> list[Gateway]:
+    """Gateways named by ``entry_id``/``device_id``; without either, the only one set up."""
+    loaded = _loaded_entries(hass)
+    if not loaded:
+        raise vol.Invalid("no SmartElektra gateway is set up")
+    entry_ids: list[str] = []
+    for entry_id in call.data.get("entry_id", []):
+        if entry_id == ALL_GATEWAYS:
+            entry_ids.extend(loaded)
+        elif entry_id in loaded:
+            entry_ids.append(entry_id)
+        else:
+            raise vol.Invalid(f"gateway {entry_id} is not set up")
+    device_registry = dr.async_get(hass)
+    for device_id in call.data.get("device_id", []):
+        device = device_registry.async_get(device_id)
+        found = [entry_id for entry_id in device.config_entries if entry_id in loaded] if device else []
+        if not found:
+            raise vol.Invalid(f"device {device_id} does not belong to a SmartElektra gateway that is set up")
+        entry_ids.extend(found)
+    if not entry_ids:
+        if len(loaded) > 1:
+            raise vol.Invalid(f"{len(loaded)} gateways are set up: pass entry_id (or {ALL_GATEWAYS}) or device_id")
+        entry_ids = list(loaded)
+    gateways = []
+    for entry_id in dict.fromkeys(entry_ids):
+        store = hass.data[DOMAIN][entry_id]
+        gateways.append(
+            Gateway(
+                entry_id,
+                loaded[entry_id],
+                store["client"],
+                store["slaves"],
+                store["coordinator"],
+                store["map"],
+                store["journal"],
+            )
+        )
+    return gateways
+
+
+def _fan_out(hass: HomeAssistant, handler: Handler) -> Callable[[ServiceCall], Awaitable[ServiceResponse]]:
+    """Run ``handler`` on every target gateway at once and collect the results per gateway.
+
+    The response maps entry_id to the gateway's result (or error). A lone target
+    that fails, or a call invalid for every target, raises as before; with several
+    targets a partial failure raises only if the caller did not ask for the response.
+    """
+
+    async def handle(call: ServiceCall) -> ServiceResponse:
+        gateways = _targets(hass, call)
+        started = time.monotonic()
+
+        async def run(gateway: Gateway) -> tuple[float, Optional[dict[str, Any]]]:
+            t0 = time.monotonic()
+            result = await handler(hass, gateway, call)
+            return time.monotonic() - t0, result
+
+        outcomes = await asyncio.gather(*(run(gateway) for gateway in gateways), return_exceptions=True)
+        results: dict[str, Any] = {}
+        errors: list[tuple[Gateway, Exception]] = []
+        for gateway, outcome in zip(gateways, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append((gateway, outcome))
+                results[gateway.entry_id] = {
+                    "title": gateway.title,
+                    "status": "failed",
+                    "error": str(outcome) or type(outcome).__name__,
+                }
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                elapsed, result = outcome
+                results[gateway.entry_id] = {
+                    "title": gateway.title,
+                    "status": "ok",
+                    "elapsed": round(elapsed, 3),
+                    "result": result,
+                }
+        if len(errors) == len(gateways) and (
+            len(errors) == 1 or all(isinstance(err, vol.Invalid) for _gateway, err in errors)
+        ):
+            raise errors[0][1]
+        if errors and not call.return_response:
+            failed = "; ".join(f"{gateway.title}: {results[gateway.entry_id]['error']}" for gateway, _err in errors)
+            raise HomeAssistantError(f"{len(errors)} of {len(gateways)} gateways failed: {failed}")
+        return {
+            "gateways": results,
+            "ok": len(gateways) - len(errors),
+            "failed": len(errors),
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+
+    return handle
+
+
+async def _set_slave_id(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> None:
+    new_slave = call.data["new_slave"]
+    # use broadcast by default (0)
+    target_slave = call.data.get("target_slave", 0)
+    hr_address = call.data.get("hr_address", gateway.register_map.slave_id_address)
+
+    # Validate ranges
+    if not (1 <= new_slave <= 247):
+        raise vol.Invalid("new_slave must be in range 1..247")
+    if not (0 <= target_slave <= 247):
+        raise vol.Invalid("target_slave must be in range 0..247 (0=broadcast)")
+
+    await async_set_slave_id(gateway.client, gateway.slaves, int(new_slave), int(target_slave), hr_address)
+
+
+async def _write_coil(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> None:
+    slave = call.data["slave"]
+    address = call.data["address"]
+    value = call.data["value"]
+    if call.data["deliver_eventually"]:
+        gateway.journal.submit("coils", int(slave), int(address), [bool(value)])
+        return
+    await gateway.client.queue_write_coil(int(address), bool(value), int(slave), force=call.data["force"])
+
+
+async def _write_register(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> None:
+    slave = call.data["slave"]
+    address = call.data["address"]
+    value = call.data["value"]
+    if call.data["deliver_eventually"]:
+        gateway.journal.submit("registers", int(slave), int(address), [int(value)])
+        return
+    await gateway.client.queue_write_register(int(address), int(value), int(slave), force=call.data["force"])
+
+
+async def _write_coils(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> None:
+    values = call.data["values"]
+    if call.data["address"] + len(values) > 65536:
+        raise vol.Invalid("address + number of values exceeds the coil address space")
+    if call.data["deliver_eventually"]:
+        gateway.journal.submit("coils", call.data["slave"], call.data["address"], values)
+        return
+    await gateway.client.write_coils(call.data["address"], values, call.data["slave"], force=call.data["force"])
+
+
+async def _write_registers(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> None:
+    values = call.data["values"]
+    if call.data["address"] + len(values) > 65536:
+        raise vol.Invalid("address + number of values exceeds the register address space")
+    if call.data["deliver_eventually"]:
+        gateway.journal.submit("registers", call.data["slave"], call.data["address"], values)
+        return
+    await gateway.client.write_registers(call.data["address"], values, call.data["slave"], force=call.data["force"])
+
+
+def _read_handler(table: str) -> Handler:
+    async def handle_read(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+        address = call.data["address"]
+        count = call.data["count"]
+        if address + count > 65536:
+            raise vol.Invalid("address + count exceeds the address space")
+        data_type = call.data.get("data_type", "uint16")
+        if count % DATA_TYPES[data_type][1]:
+            raise vol.Invalid(f"count must be a multiple of {DATA_TYPES[data_type][1]} for {data_type}")
+        started = time.monotonic()
+        values = await async_read_range(gateway.client, table, address, count, call.data["slave"])
+        if table.endswith("registers"):
+            values = decode_registers(values, data_type, call.data["word_order"])
+        return {
+            "slave": call.data["slave"],
+            "address": address,
+            "values": values,
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+
+    return handle_read
+
+
+def _ranges(gateway: Gateway, call: ServiceCall, table: str) -> list[tuple[int, int]]:
+    """Ranges given in the call, else the register map's exact address runs."""
+    if call.data.get(table):
+        return [(r["address"], r["count"]) for r in call.data[table]]
+    return list(gateway.register_map.strict_plan[table])
+
+
+def _backup_dir(hass: HomeAssistant, gateway: Gateway) -> str:
+    # slave IDs repeat across gateways, so each gateway keeps its own directory
+    return hass.config.path(DOMAIN, BACKUP_DIR, gateway.entry_id)
+
+
+def _load_backups(hass: HomeAssistant, gateway: Gateway, targets: list[int]) -> list[tuple[int, Any]]:
+    """Backups of ``targets`` (blocking); files saved before per-gateway directories are still found."""
+    base_dir = _backup_dir(hass, gateway)
+    legacy_dir = hass.config.path(DOMAIN, BACKUP_DIR)
+    backups = []
+    for slave_id in targets:
+        path = backup_path(base_dir, slave_id)
+        if not os.path.exists(path):
+            path = backup_path(legacy_dir, slave_id)
+        backups.append((slave_id, load_backup(path)))
+    return backups
+
+
+async def _backup_device(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    started = time.monotonic()
+    base_dir = _backup_dir(hass, gateway)
+    results = await async_backup_devices(
+        gateway.client,
+        call.data["slaves"],
+        _ranges(gateway, call, "coils"),
+        _ranges(gateway, call, "registers"),
+        concurrency=call.data["concurrency"],
+    )
+    devices = []
+    for slave_id, data, error in results:
+        path = None
+        if data is not None:
+            path = backup_path(base_dir, slave_id)
+            await hass.async_add_executor_job(save_backup, path, data)
+        devices.append({"slave": slave_id, "status": "failed" if error else "ok", "file": path, "error": error})
+    ok = sum(1 for d in devices if d["status"] == "ok")
+    return {
+        "devices": devices,
+        "ok": ok,
+        "failed": len(devices) - ok,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+
+
+async def _restore_device(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    try:
+        backups = await hass.async_add_executor_job(_load_backups, hass, gateway, call.data["slaves"])
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+    # never re-address a device unless asked to
+    skip = () if call.data["include_slave_id"] else (gateway.register_map.slave_id_address,)
+    result = await async_restore_devices(gateway.client, backups, skip, concurrency=call.data["concurrency"])
+    await gateway.coordinator.async_request_refresh()
+    return result
+
+
+def _profile_addresses(register_map: RegisterMap, mapping: dict[str, Any], table: str) -> dict[int, Any]:
+    """Map profile keys (a register map key such as button_mode, or a plain address) to addresses.
+
+    Values of select entries may be given as option names.
+    """
+    resolved: dict[int, Any] = {}
+    for key, value in mapping.items():
+        map_entry = register_map.by_key.get(key)
+        if map_entry is not None and map_entry.table == table:
+            address = map_entry.address
+            if isinstance(value, str) and value in map_entry.to_raw:
+                value = map_entry.to_raw[value]
+        elif key.isdigit() and int(key) <= 65535:
+            address = int(key)
+        else:
+            raise vol.Invalid(f"unknown {table} profile key: {key}")
+        if table == "registers":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise vol.Invalid(f"{key}: expected a number or option name, got {value!r}") from None
+            if not 0 <= value <= 65535:
+                raise vol.Invalid(f"{key}: value out of range")
+        resolved[address] = value
+    return resolved
+
+
+async def _apply_profile(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    coils = _profile_addresses(gateway.register_map, call.data.get("coils", {}), "coils")
+    registers = _profile_addresses(gateway.register_map, call.data.get("registers", {}), "registers")
+    if not coils and not registers:
+        raise vol.Invalid("the profile sets no coils or registers")
+    targets = call.data.get("slaves") or sorted(gateway.slaves)
+    if not targets:
+        raise vol.Invalid("no slaves given and none known yet (run scan_bus first)")
+    result = await async_apply_profile(
+        gateway.client,
+        targets,
+        coils,
+        registers,
+        dry_run=call.data["dry_run"],
+        concurrency=call.data["concurrency"],
+    )
+    if not call.data["dry_run"]:
+        await gateway.coordinator.async_request_refresh()
+    return result
+
+
+async def _scan_bus(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    start = call.data["start"]
+    end = call.data["end"]
+    if start > end:
+        raise vol.Invalid("start must not be greater than end")
+    result = await async_scan_bus(
+        gateway.client,
+        start=start,
+        end=end,
+        address=call.data.get("hr_address", gateway.register_map.slave_id_address),
+        timeout=call.data["timeout"],
+        concurrency=call.data["concurrency"],
+        max_found=call.data.get("max_found"),
+    )
+    gateway.slaves.update(result["slaves"])
+    await gateway.coordinator.async_request_refresh()
+    return result
+
+
+async def _link_test(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    register_map = gateway.register_map
+    mode = call.data["mode"]
+    coil_address = call.data.get("coil_address")
+    if coil_address is None and mode != "read":
+        map_entry = register_map.by_key.get(LINK_TEST_COIL_KEY)
+        if map_entry is None or map_entry.table != "coils":
+            raise vol.Invalid(f"register map has no {LINK_TEST_COIL_KEY} coil; pass coil_address")
+        coil_address = map_entry.address
+    return await async_link_test(
+        gateway.client,
+        call.data["slave"],
+        mode,
+        register_address=call.data.get("register_address", register_map.slave_id_address),
+        coil_address=coil_address,
+        operations=call.data["operations"],
+        duration=call.data.get("duration"),
+        max_concurrency=call.data["max_concurrency"],
+    )
+
+
+async def _sweep(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    targets = call.data.get("slaves") or sorted(gateway.slaves)
+    if not targets:
+        raise vol.Invalid("no slaves given and none known yet (run scan_bus first)")
+    if call.data.get("coils"):
+        addresses = sorted(
+            {
+                address
+                for r in call.data["coils"]
+                for address in range(r["address"], min(r["address"] + r["count"], 65536))
+            }
+        )
+    else:
+        map_entry = gateway.register_map.by_key.get(LINK_TEST_COIL_KEY)
+        if map_entry is None or map_entry.table != "coils":
+            raise vol.Invalid(f"register map has no {LINK_TEST_COIL_KEY} coil; pass coils")
+        addresses = [map_entry.address]
+    result = await async_sweep(
+        gateway.client,
+        {slave_id: addresses for slave_id in targets},
+        call.data["pattern"],
+        call.data["on_time"],
+        cycles=call.data["cycles"],
+        restore=call.data["restore"],
+    )
+    await gateway.coordinator.async_request_refresh()
+    return result
+
+
+async def _provision_slaves(hass: HomeAssistant, gateway: Gateway, call: ServiceCall) -> dict[str, Any]:
+    hr_address = call.data.get("hr_address", gateway.register_map.slave_id_address)
+    verify_timeout = call.data["verify_timeout"]
+    devices = call.data.get("devices")
+    if devices:
+        pairs = [(d["current"], d["new"]) for d in devices]
+        try:
+            check_pairs(pairs)
+        except ValueError as err:
+            raise vol.Invalid(str(err)) from err
+        # known slaves the batch does not move keep their IDs
+        staying = set(gateway.slaves) - {current for current, _ in pairs}
+        taken = sorted(new for _, new in pairs if new in staying)
+        if taken:
+            raise vol.Invalid(f"new slave IDs already used by known slaves: {taken}")
+        result = await async_provision_slaves(
+            gateway.client,
+            pairs,
+            hr_address=hr_address,
+            concurrency=call.data["concurrency"],
+            verify_timeout=verify_timeout,
+        )
+    else:
+        start_id = call.data.get("start_id")
+        count = call.data.get("count")
+        if start_id is None or count is None:
+            raise vol.Invalid("provide either devices or start_id and count")
+        if start_id + count - 1 > 247:
+            raise vol.Invalid("start_id + count - 1 must not exceed 247")
+        result = await async_provision_broadcast(
+            gateway.client,
+            start_id,
+            count,
+            hr_address=hr_address,
+            verify_timeout=verify_timeout,
+            interval=call.data["interval"],
+        )
+
+    for device in result["devices"]:
+        if device["status"] == "ok":
+            gateway.slaves.discard(device["current"])
+            gateway.slaves.add(device["new"])
+    await gateway.coordinator.async_request_refresh()
+    return result
+
+
+# Gateway selection, accepted by every service
+TARGET_SCHEMA: dict[Any, Any] = {
+    vol.Optional("entry_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+}
+
+_RANGE_LIST = vol.All(
+    cv.ensure_list,
+    [
+        vol.Schema(
+            {
+                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Required("count"): vol.All(vol.Coerce(int), vol.Range(min=1, max=65536)),
+            }
+        )
+    ],
+)
+_SLAVE_LIST = vol.All(cv.ensure_list, vol.Length(min=1), [vol.All(vol.Coerce(int), vol.Range(min=1, max=247))])
+_CONCURRENCY = vol.All(vol.Coerce(int), vol.Range(min=1, max=32))
+
+
+def _services() -> list[tuple[str, Handler, dict[Any, Any], SupportsResponse]]:
+    """(service, handler, schema, response support) of every service."""
+    services: list[tuple[str, Handler, dict[Any, Any], SupportsResponse]] = [
+        (
+            "set_slave_id",
+            _set_slave_id,
+            {
+                vol.Required("new_slave"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional("target_slave", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
+                vol.Optional("hr_address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+            },
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            "write_coil",
+            _write_coil,
+            {
+                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
+                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Required("value"): cv.boolean,
+                vol.Optional("force", default=False): cv.boolean,
+                vol.Optional("deliver_eventually", default=False): cv.boolean,
+            },
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            "write_register",
+            _write_register,
+            {
+                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
+                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Required("value"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional("force", default=False): cv.boolean,
+                vol.Optional("deliver_eventually", default=False): cv.boolean,
+            },
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            "write_coils",
+            _write_coils,
+            {
+                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
+                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Required("values"): vol.All(cv.ensure_list, vol.Length(min=1), [cv.boolean]),
+                vol.Optional("force", default=False): cv.boolean,
+                vol.Optional("deliver_eventually", default=False): cv.boolean,
+            },
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            "write_registers",
+            _write_registers,
+            {
+                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=0, max=247)),
+                vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Required("values"): vol.All(
+                    cv.ensure_list, vol.Length(min=1), [vol.All(vol.Coerce(int), vol.Range(min=0, max=65535))]
+                ),
+                vol.Optional("force", default=False): cv.boolean,
+                vol.Optional("deliver_eventually", default=False): cv.boolean,
+            },
+            SupportsResponse.OPTIONAL,
+        ),
+    ]
+
+    for table in READ_TABLES:
+        schema: dict[Any, Any] = {
+            vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+            vol.Required("address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+            vol.Optional("count", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=65536)),
+        }
+        if table.endswith("registers"):
+            schema[vol.Optional("data_type", default="uint16")] = vol.In(list(DATA_TYPES))
+            schema[vol.Optional("word_order", default="big")] = vol.In(WORD_ORDERS)
+        services.append((f"read_{table}", _read_handler(table), schema, SupportsResponse.ONLY))
+
+    services += [
+        (
+            "backup_device",
+            _backup_device,
+            {
+                vol.Required("slaves"): _SLAVE_LIST,
+                vol.Optional("coils"): _RANGE_LIST,
+                vol.Optional("registers"): _RANGE_LIST,
+                vol.Optional("concurrency", default=DEFAULT_BACKUP_CONCURRENCY): _CONCURRENCY,
+            },
+            SupportsResponse.ONLY,
+        ),
+        (
+            "restore_device",
+            _restore_device,
+            {
+                vol.Required("slaves"): _SLAVE_LIST,
+                vol.Optional("include_slave_id", default=False): cv.boolean,
+                vol.Optional("concurrency", default=DEFAULT_BACKUP_CONCURRENCY): _CONCURRENCY,
+            },
+            SupportsResponse.ONLY,
+        ),
+        (
+            "apply_profile",
+            _apply_profile,
+            {
+                vol.Optional("slaves"): _SLAVE_LIST,
+                vol.Optional("registers", default={}): {cv.string: vol.Any(int, cv.string)},
+                vol.Optional("coils", default={}): {cv.string: cv.boolean},
+                vol.Optional("dry_run", default=False): cv.boolean,
+                vol.Optional("concurrency", default=DEFAULT_PROFILE_CONCURRENCY): _CONCURRENCY,
+            },
+            SupportsResponse.ONLY,
+        ),
+        (
+            "scan_bus",
+            _scan_bus,
+            {
+                vol.Optional("start", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional("end", default=247): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional("hr_address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional("timeout", default=DEFAULT_SCAN_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.01, max=10)
+                ),
+                vol.Optional("concurrency", default=DEFAULT_SCAN_CONCURRENCY): _CONCURRENCY,
+                vol.Optional("max_found"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+            },
+            SupportsResponse.ONLY,
+        ),
+        (
+            "link_test",
+            _link_test,
+            {
+                vol.Required("slave"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional("mode", default="mixed"): vol.In(LINK_TEST_MODES),
+                vol.Optional("operations", default=DEFAULT_LINK_TEST_OPERATIONS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=100000)
+                ),
+                vol.Optional("duration"): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=600)),
+                vol.Optional("max_concurrency", default=DEFAULT_LINK_TEST_CONCURRENCY): _CONCURRENCY,
+                vol.Optional("register_address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional("coil_address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+            },
+            SupportsResponse.ONLY,
+        ),
+        (
+            "sweep",
+            _sweep,
+            {
+                vol.Optional("slaves"): _SLAVE_LIST,
+                vol.Optional("coils"): _RANGE_LIST,
+                vol.Optional("pattern", default="chase"): vol.In(SWEEP_PATTERNS),
+                vol.Optional("on_time", default=DEFAULT_SWEEP_ON_TIME): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.02, max=60)
+                ),
+                vol.Optional("cycles", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional("restore", default=True): cv.boolean,
+            },
+            SupportsResponse.ONLY,
+        ),
+        (
+            "provision_slaves",
+            _provision_slaves,
+            {
+                vol.Optional("devices"): vol.All(
+                    cv.ensure_list,
+                    [
+                        vol.Schema(
+                            {
+                                vol.Required("current"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                                vol.Required("new"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                            }
+                        )
+                    ],
+                ),
+                vol.Optional("start_id"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional("count"): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional("hr_address"): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional("concurrency", default=DEFAULT_PROVISION_CONCURRENCY): _CONCURRENCY,
+                vol.Optional("verify_timeout", default=DEFAULT_PROVISION_VERIFY_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.05, max=30)
+                ),
+                vol.Optional("interval", default=DEFAULT_PROVISION_INTERVAL): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=600)
+                ),
+            },
+            SupportsResponse.ONLY,
+        ),
+    ]
+    return services
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services once for all entries; each call picks its gateways."""
+    for service, handler, schema, supports_response in _services():
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            _fan_out(hass, handler),
+            schema=vol.Schema({**TARGET_SCHEMA, **schema}),
+            supports_response=supports_response,
+        )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Optional
+
+from .compat import load_api
+from .exceptions import GatewayError
+
+# Samples kept per latency window (function code, slave, lock wait)
+LATENCY_WINDOW = 512
+
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_EXCEPTION = "exception"
+OUTCOME_ERROR = "error"
+
+
+def outcome_of(err: BaseException) -> str:
+    """Classify a failed request: no reply in time, Modbus exception reply, or other.
+
+    A gateway exception (0x0A/0x0B) means the slave never answered the gateway, so it
+    counts as a timeout rather than an exception reply from the slave.
+    """
+    if isinstance(err, (asyncio.TimeoutError, GatewayError)) or isinstance(err, load_api().timeout_errors):
+        return OUTCOME_TIMEOUT
+    if isinstance(err, RuntimeError):
+        return OUTCOME_EXCEPTION
+    return OUTCOME_ERROR
+
+
+class LatencyWindow:
+    """Rolling window of latency samples (seconds) with percentile estimates."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def summary(self) -> dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            "count": self.count,
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(max(self._samples) if self._samples else None),
+        }
+
+
+class LinkStats:
+    """Per-request latency and error counters of one gateway link."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyWindow()
+        self.by_function: dict[str, LatencyWindow] = {}
+        self.by_slave: dict[int, LatencyWindow] = {}
+        self.lock_wait = LatencyWindow()
+        self.outcomes: dict[str, int] = {OUTCOME_OK: 0, OUTCOME_TIMEOUT: 0, OUTCOME_EXCEPTION: 0, OUTCOME_ERROR: 0}
+        self.slave_errors: dict[int, int] = {}
+        self.connects = 0
+        self.connect_failures = 0
+
+    @property
+    def requests(self) -> int:
+        return sum(self.outcomes.values())
+
+    @property
+    def timeouts(self) -> int:
+        return self.outcomes[OUTCOME_TIMEOUT]
+
+    @property
+    def exceptions(self) -> int:
+        return self.outcomes[OUTCOME_EXCEPTION]
+
+    @property
+    def reconnects(self) -> int:
+        return max(0, self.connects - 1)
+
+    def record(self, function: str, slave_id: int, seconds: float, outcome: str = OUTCOME_OK) -> None:
+        self.outcomes[outcome] += 1
+        if outcome != OUTCOME_OK:
+            self.slave_errors[slave_id] = self.slave_errors.get(slave_id, 0) + 1
+            if outcome == OUTCOME_TIMEOUT:
+                # a timeout says nothing about link latency
+                return
+        self.latency.add(seconds)
+        self.by_function.setdefault(function, LatencyWindow()).add(seconds)
+        self.by_slave.setdefault(slave_id, LatencyWindow()).add(seconds)
+
+    def record_lock_wait(self, seconds: float) -> None:
+        self.lock_wait.add(seconds)
+
+    def record_connect(self, ok: bool) -> None:
+        if ok:
+            self.connects += 1
+        else:
+            self.connect_failures += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "outcomes": dict(self.outcomes),
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "connect_failures": self.connect_failures,
+            "latency": self.latency.summary(),
+            "lock_wait": self.lock_wait.summary(),
+            "by_function": {name: w.summary() for name, w in sorted(self.by_function.items())},
+            "by_slave": {
+                str(slave): {**w.summary(), "errors": self.slave_errors.get(slave, 0)}
+                for slave, w in sorted(self.by_slave.items())
+            },
+            "slave_errors": {str(slave): n for slave, n in sorted(self.slave_errors.items())},
+        }
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from .const import (
+    MAX_READ_BITS,
+    MAX_WRITE_BITS,
+    PRIORITY_SERVICE,
+    SWEEP_CLEANUP_RETRY,
+    SWEEP_CLEANUP_TIMEOUT,
+    SWEEP_LATE_FRACTION,
+    SWEEP_MAX_REPORTED,
+    SWEEP_START_DELAY,
+)
+from .modbus_client import AsyncModbusTcpClientCompat
+from .register_map import plan_runs
+from .stats import LatencyWindow
+
+PATTERNS = ("chase", "all_on_off", "blink")
+
+Step = dict[tuple[int, int], bool]
+
+
+def _steps(pattern: str, outputs: dict[int, list[int]], cycles: int) -> list[Step]:
+    """Coil values to write at each step; every pattern ends with the outputs off.
+
+    chase: one output on at a time, in order. all_on_off: every output on, then
+    off. blink: each slave's outputs on and off together, one slave after another.
+    """
+    flat = [(slave_id, address) for slave_id, addresses in outputs.items() for address in addresses]
+    steps: list[Step] = []
+    if pattern == "chase":
+        sequence = flat * cycles
+        for index in range(len(sequence) + 1):
+            step: Step = {}
+            if index:
+                step[sequence[index - 1]] = False
+            if index < len(sequence):
+                step[sequence[index]] = True
+            steps.append(step)
+    elif pattern == "all_on_off":
+        for _ in range(cycles):
+            steps.append(dict.fromkeys(flat, True))
+            steps.append(dict.fromkeys(flat, False))
+    else:
+        for slave_id, addresses in outputs.items():
+            for _ in range(cycles):
+                steps.append(dict.fromkeys(((slave_id, address) for address in addresses), True))
+                steps.append(dict.fromkeys(((slave_id, address) for address in addresses), False))
+    return steps
+
+
+def _frames(step: Step) -> list[tuple[int, int, list[bool]]]:
+    """(slave, start, values) frames of one step: neighbouring coils share an FC15."""
+    slots: dict[int, dict[int, bool]] = {}
+    for (slave_id, address), value in step.items():
+        slots.setdefault(slave_id, {})[address] = value
+    return [
+        (slave_id, start, values)
+        for slave_id, slot in slots.items()
+        for start, values in plan_runs(slot, MAX_WRITE_BITS)
+    ]
+
+
+async def _write(client: AsyncModbusTcpClientCompat, slave_id: int, start: int, values: list[bool]) -> None:
+    # the sweep must switch the output even if the cache thinks it already is
+    if len(values) == 1:
+        await client.write_coil(start, values[0], slave_id, force=True, priority=PRIORITY_SERVICE)
+    else:
+        await client.write_coils(start, values, slave_id, force=True, priority=PRIORITY_SERVICE)
+
+
+async def async_sweep(
+    client: AsyncModbusTcpClientCompat,
+    outputs: dict[int, list[int]],
+    pattern: str,
+    on_time: float,
+    cycles: int = 1,
+    restore: bool = True,
+) -> dict[str, Any]:
+    """Switch the coils of ``outputs`` (slave -> coil addresses) in ``pattern``.
+
+    Step ``n`` is due at ``start + n * on_time``. Its frames are handed to the
+    client then without waiting for earlier steps to be confirmed, except that
+    frames to the same slave stay in order. On pymodbus 3.6+ each socket carries
+    one frame at a time, so only as many frames as there are gateway sockets
+    (two by default) are actually in flight. A frame that fails is missed; one
+    confirmed more than ``SWEEP_LATE_FRACTION`` of ``on_time`` after its due time
+    is late. Slaves whose coils cannot be read first are left out.
+
+    With ``restore`` the coils get their initial values back at the end. If the
+    link drops mid-sweep the remaining steps are skipped and the coils are
+    restored (or, without ``restore``, switched off) once the link is back,
+    retried for up to ``SWEEP_CLEANUP_TIMEOUT`` seconds; coils that may still be
+    on are listed in ``left_on``.
+    """
+    loop = asyncio.get_running_loop()
+    t_start = loop.time()
+    initial: dict[int, list[tuple[int, list[bool]]]] = {}
+    unreachable: list[int] = []
+    for slave_id, addresses in outputs.items():
+        try:
+            initial[slave_id] = [
+                (start, await client.read_coils(start, len(run), slave_id, priority=PRIORITY_SERVICE))
+                for start, run in plan_runs(dict.fromkeys(addresses), MAX_READ_BITS)
+            ]
+        except ConnectionError:
+            raise
+        except Exception:
+            unreachable.append(slave_id)
+    outputs = {slave_id: addresses for slave_id, addresses in outputs.items() if slave_id in initial}
+    start_values = {
+        (slave_id, first + offset): value
+        for slave_id, runs in initial.items()
+        for first, values in runs
+        for offset, value in enumerate(values)
+    }
+    # last value each coil was confirmed at; None once a write to it went unconfirmed
+    state: dict[tuple[int, int], Optional[bool]] = dict(start_values)
+
+    steps = _steps(pattern, outputs, cycles)
+    late_after = on_time * SWEEP_LATE_FRACTION
+    locks = {slave_id: asyncio.Lock() for slave_id in outputs}
+    lag = LatencyWindow(max(1, sum(len(step) for step in steps)))
+    counts = {"frames": 0, "missed": 0, "late": 0}
+    problems: list[dict[str, Any]] = []
+    aborted: Optional[str] = None
+
+    def report(problem: dict[str, Any]) -> None:
+        if len(problems) < SWEEP_MAX_REPORTED:
+            problems.append(problem)
+
+    async def send(index: int, due: float, slave_id: int, start: int, values: list[bool]) -> None:
+        nonlocal aborted
+        frame = {"step": index, "slave": slave_id, "address": start, "count": len(values)}
+        async with locks[slave_id]:
+            try:
+                await _write(client, slave_id, start, values)
+            except Exception as err:
+                if isinstance(err, ConnectionError):
+                    aborted = str(err)
+                state.update(((slave_id, start + offset), None) for offset in range(len(values)))
+                counts["missed"] += 1
+                report({**frame, "status": "missed", "error": str(err) or type(err).__name__})
+                return
+            state.update(((slave_id, start + offset), value) for offset, value in enumerate(values))
+        delay = loop.time() - due
+        lag.add(delay)
+        if delay > late_after:
+            counts["late"] += 1
+            report({**frame, "status": "late", "lag_ms": round(delay * 1000, 1)})
+
+    tasks: list[asyncio.Task] = []
+    start = loop.time() + SWEEP_START_DELAY
+    try:
+        for index, step in enumerate(steps):
+            if aborted is not None:
+                break
+            due = start + index * on_time
+            # absolute due times: a slow step does not push the following ones back
+            wait = due - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            for slave_id, first, values in _frames(step):
+                counts["frames"] += 1
+                tasks.append(asyncio.create_task(send(index, due, slave_id, first, values)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    sweep_elapsed = loop.time() - start
+
+    # restore the start values, or after an abort without restore switch everything off
+    wanted = start_values if restore else dict.fromkeys(start_values, False)
+
+    async def cleanup(slave_id: int) -> bool:
+        slot = {address: wanted[(slave_id, address)] for address in outputs[slave_id]}
+        try:
+            for first, values in plan_runs(slot, MAX_WRITE_BITS):
+                await _write(client, slave_id, first, values)
+        except Exception:
+            return False
+        state.update(((slave_id, address), value) for address, value in slot.items())
+        return True
+
+    pending = sorted(outputs) if restore or aborted is not None else []
+    deadline = loop.time() + SWEEP_CLEANUP_TIMEOUT
+    while pending:
+        pending = [slave_id for slave_id in pending if not await cleanup(slave_id)]
+        if not pending or aborted is None or loop.time() >= deadline:
+            break
+        # the link dropped: the client reconnects (with backoff) on a later call
+        await asyncio.sleep(SWEEP_CLEANUP_RETRY)
+    left_on: dict[int, list[int]] = {}
+    for (slave_id, address), value in sorted(state.items()):
+        if value is not False and not wanted[(slave_id, address)]:
+            left_on.setdefault(slave_id, []).append(address)
+
+    summary = lag.summary()
+    return {
+        "pattern": pattern,
+        "slaves": sorted(outputs),
+        "unreachable": unreachable,
+        "outputs": sum(len(addresses) for addresses in outputs.values()),
+        "steps": len(steps),
+        "frames": counts["frames"],
+        "on_time": on_time,
+        "missed": counts["missed"],
+        "late": counts["late"],
+        "lag": {key: summary[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+        "problems": problems,
+        "sweep_elapsed": round(sweep_elapsed, 3),
+        "restored": restore and not pending,
+        "restore_failed": pending,
+        "left_on": [{"slave": slave_id, "coils": addresses} for slave_id, addresses in left_on.items()],
+        "aborted": aborted,
+        "elapsed": round(loop.time() - t_start, 3),
+    }
@@ -6,58 +6,44 @@ from homeassistant.components.switch import SwitchEntity, SwitchEntityDescriptio
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.helpers.restore_state import RestoreEntity
 
-from . import async_run_blocking, get_client, get_state
-from .const import DOMAIN
+from . import get_client, get_coordinator, get_register_map, get_slaves
+from .const import PRIORITY_INTERACTIVE
+from .devices import SlaveRecord, track_slaves
+from .entity import SEToolsSlaveEntity
+from .register_map import MapEntry
 
 
 @dataclass(frozen=True, kw_only=True)
 class SEToolsSwitchDescription(SwitchEntityDescription):
-    key_state: str
+    map_entry: MapEntry
 
 
-DESCRIPTIONS: tuple[SEToolsSwitchDescription, ...] = (
-    SEToolsSwitchDescription(
-        key="test_output",
-        key_state="test_output",
-        name="Test output",
-        icon="mdi:flash",
-        entity_category=EntityCategory.DIAGNOSTIC,
-    ),
-)
+def _description(map_entry: MapEntry) -> SEToolsSwitchDescription:
+    return SEToolsSwitchDescription(
+        key=map_entry.key,
+        name=map_entry.name,
+        icon=map_entry.icon,
+        entity_category=EntityCategory(map_entry.category) if map_entry.category else None,
+        map_entry=map_entry,
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
-    async_add_entities([SEToolsSwitch(hass, entry, d) for d in DESCRIPTIONS])
+    coordinator = get_coordinator(hass, entry.entry_id)
+    descriptions = [_description(m) for m in get_register_map(hass, entry.entry_id).for_platform("switch")]
 
+    def factory(record: SlaveRecord) -> list[SEToolsSwitch]:
+        return [SEToolsSwitch(hass, entry, coordinator, record, d) for d in descriptions]
 
-class SEToolsSwitch(SwitchEntity, RestoreEntity):
-    _attr_has_entity_name = True
+    if descriptions:
+        entry.async_on_unload(track_slaves(get_slaves(hass, entry.entry_id), async_add_entities, factory))
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, description: SEToolsSwitchDescription) -> None:
-        self.hass = hass
-        self.entry = entry
-        self.entity_description = description
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "SmartElektra Tools",
-        }
 
+class SEToolsSwitch(SEToolsSlaveEntity, SwitchEntity):
     @property
-    def is_on(self) -> bool:
-        state = get_state(self.hass, self.entry.entry_id)
-        return bool(state.get(self.entity_description.key_state, False))
-
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last is None or last.state in (None, "unknown", "unavailable"):
-            return
-        state = get_state(self.hass, self.entry.entry_id)
-        state[self.entity_description.key_state] = last.state == "on"
-        self.async_write_ha_state()
+    def is_on(self) -> bool | None:
+        return self._value
 
     async def async_turn_on(self, **kwargs) -> None:
         await self._write(True)
@@ -66,16 +52,9 @@ class SEToolsSwitch(SwitchEntity, RestoreEntity):
         await self._write(False)
 
     async def _write(self, value: bool) -> None:
-        state = get_state(self.hass, self.entry.entry_id)
         client = get_client(self.hass, self.entry.entry_id)
-
-        slave = int(state.get("target_slave", 0))
-        coil_address = int(state.get("coil_test_output", 0))
-
-        if slave == 0:
-            raise ValueError("Set Target slave (current) to the device ID first (not 0/broadcast)")
-
-        await async_run_blocking(self.hass, client.write_coil, coil_address, bool(value), slave)
-
-        state[self.entity_description.key_state] = bool(value)
-        self.async_write_ha_state()
+        await client.queue_write_coil(
+            self._map_entry.address, value, self._record.slave_id, priority=PRIORITY_INTERACTIVE
+        )
+        self._set_value(value)
+        self._publish()
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.smartelektra_tools import cache as cache_module
+from custom_components.smartelektra_tools.cache import ShadowCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=100.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_values_expire_after_ttl(clock):
+    cache = ShadowCache(ttl=2.0, max_entries=16)
+    cache.put_block(1, "registers", 10, [5, 6])
+    assert cache.get(1, "registers", 11) == 6
+    clock.value += 2.0
+    assert cache.get(1, "registers", 10) == 5
+    clock.value += 0.1
+    assert cache.get(1, "registers", 10) is None
+    # the expired entry is dropped on access
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ShadowCache(ttl=10.0, max_entries=3)
+    cache.put_block(1, "coils", 0, [True, False, True])
+    # reading address 0 makes address 1 the oldest
+    assert cache.get(1, "coils", 0) is True
+    cache.put_block(2, "coils", 0, [False])
+    assert len(cache) == 3
+    assert cache.get(1, "coils", 1) is None
+    assert cache.get(1, "coils", 0) is True
+    assert cache.get(2, "coils", 0) is False
+
+
+def test_noop_writes_are_counted(clock):
+    cache = ShadowCache(ttl=10.0, max_entries=16)
+    cache.put_block(1, "registers", 0, [1, 2, 3])
+    assert cache.is_noop(1, "registers", 0, [1, 2, 3])
+    assert not cache.is_noop(1, "registers", 1, [2, 4])
+    assert not cache.is_noop(1, "registers", 3, [0])
+    assert cache.stats() == {"entries": 3, "hits": 1, "misses": 2, "hit_ratio": 0.333}
+
+
+def test_disabled_cache_keeps_nothing(clock):
+    cache = ShadowCache(ttl=0, max_entries=16)
+    cache.put_block(1, "registers", 0, [1])
+    assert len(cache) == 0
+    assert not cache.is_noop(1, "registers", 0, [1])
+    assert cache.stats()["hit_ratio"] is None
+
+
+def test_invalidate_slave_and_clear(clock):
+    cache = ShadowCache(ttl=10.0, max_entries=16)
+    cache.put_block(1, "registers", 0, [1, 2])
+    cache.put_block(2, "coils", 0, [True])
+    cache.invalidate_slave(1)
+    assert cache.get(1, "registers", 0) is None
+    assert cache.get(2, "coils", 0) is True
+    cache.clear()
+    assert len(cache) == 0
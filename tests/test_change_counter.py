@@ -0,0 +1,52 @@
+from custom_components.smartelektra_tools.change_counter import ChangeCounters
+
+
+def test_first_poll_needs_full_read():
+    counters = ChangeCounters(300.0)
+    assert counters.supported(1)
+    assert not counters.unchanged(1, 7, 0.0)
+
+
+def test_unchanged_counter_reuses_full_read():
+    counters = ChangeCounters(300.0)
+    counters.record(1, 7, 0.0)
+    assert counters.unchanged(1, 7, 10.0)
+    assert not counters.unchanged(2, 7, 10.0)
+
+
+def test_moved_counter_needs_full_read():
+    counters = ChangeCounters(300.0)
+    counters.record(1, 7, 0.0)
+    assert not counters.unchanged(1, 8, 10.0)
+    counters.record(1, 8, 10.0)
+    assert counters.unchanged(1, 8, 20.0)
+
+
+def test_full_refresh_expires():
+    counters = ChangeCounters(300.0)
+    counters.record(1, 7, 0.0)
+    assert counters.unchanged(1, 7, 299.9)
+    assert not counters.unchanged(1, 7, 300.0)
+    counters.record(1, 7, 300.0)
+    assert counters.unchanged(1, 7, 301.0)
+
+
+def test_rejected_slave_is_always_read_in_full():
+    counters = ChangeCounters(300.0)
+    counters.record(1, 7, 0.0)
+    counters.reject(1)
+    assert not counters.supported(1)
+    assert not counters.unchanged(1, 7, 10.0)
+    assert counters.snapshot()["without_counter"] == [1]
+
+
+def test_retain_drops_slaves_no_longer_polled():
+    counters = ChangeCounters(300.0)
+    counters.record(1, 7, 0.0)
+    counters.record(2, 3, 0.0)
+    counters.reject(3)
+    counters.retain([2])
+    assert not counters.unchanged(1, 7, 10.0)
+    assert counters.unchanged(2, 3, 10.0)
+    assert counters.supported(3)
+    assert counters.snapshot() == {"full_refresh_interval": 300.0, "tracked": 1, "without_counter": []}
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("pymodbus")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+from simulator import Simulator  # noqa: E402
+
+from custom_components.smartelektra_tools.const import PRIORITY_INTERACTIVE  # noqa: E402
+from custom_components.smartelektra_tools.modbus_client import AsyncModbusTcpClientCompat  # noqa: E402
+from custom_components.smartelektra_tools.scanner import async_scan_bus  # noqa: E402
+
+# gateway RTU wait of the simulated bus and the turnaround configured for it
+RTU_TIMEOUT = 0.05
+TURNAROUND = 0.06
+INTERACTIVE_TARGET = 0.1
+
+
+async def _writes_during_scan() -> tuple[list[float], dict]:
+    sim = Simulator(range(1, 11), latency=0.005, rtu_timeout=RTU_TIMEOUT)
+    port = await sim.start()
+    # two one-frame slots: the scan gets one, the other is kept for the writes
+    client = AsyncModbusTcpClientCompat(
+        "127.0.0.1", port, timeout=1.0, max_inflight=1, connections=2, turnaround=TURNAROUND
+    )
+    try:
+        await client.connect()
+        scan = asyncio.create_task(async_scan_bus(client, 1, 60))
+        await asyncio.sleep(0.3)
+        latencies = []
+        for i in range(10):
+            t0 = time.monotonic()
+            await client.write_coil(0, bool(i % 2), 1 + i, force=True, priority=PRIORITY_INTERACTIVE)
+            latencies.append(time.monotonic() - t0)
+            await asyncio.sleep(0.1)
+        result = await scan
+    finally:
+        await client.close()
+        await sim.close()
+    return latencies, result
+
+
+def test_interactive_writes_stay_fast_during_a_bus_scan():
+    latencies, result = asyncio.run(_writes_during_scan())
+    # one frame to an absent slave may be on the bus ahead of each write, never more
+    assert max(latencies) < INTERACTIVE_TARGET, [round(s * 1000) for s in latencies]
+    assert result["slaves"] == list(range(1, 11))
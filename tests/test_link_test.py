@@ -0,0 +1,62 @@
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.smartelektra_tools.exceptions import exception_error
+from custom_components.smartelektra_tools.link_test import _levels, async_link_test, best_concurrency
+
+
+def _level(concurrency, ops_s, timeout_rate=0.0):
+    return {"concurrency": concurrency, "ops_s": ops_s, "timeout_rate": timeout_rate}
+
+
+def test_levels_double_up_to_max():
+    assert _levels(1) == [1]
+    assert _levels(2) == [1, 2]
+    assert _levels(8) == [1, 2, 4, 8]
+    assert _levels(6) == [1, 2, 4, 6]
+    assert _levels(32) == [1, 2, 4, 8, 16, 32]
+
+
+def test_best_is_smallest_level_near_top_throughput():
+    levels = [_level(1, 50.0), _level(2, 95.0), _level(4, 100.0), _level(8, 101.0)]
+    assert best_concurrency(levels) == (2, True)
+
+
+def test_levels_over_timeout_limit_are_skipped():
+    levels = [_level(1, 50.0), _level(2, 60.0), _level(4, 200.0, 0.05)]
+    assert best_concurrency(levels) == (2, True)
+
+
+def test_lossy_link_falls_back_to_lowest_timeout_rate():
+    levels = [_level(1, 40.0, 0.03), _level(2, 80.0, 0.02), _level(4, 90.0, 0.02), _level(8, 150.0, 0.2)]
+    assert best_concurrency(levels) == (4, False)
+
+
+def test_unmeasured_levels_are_ignored():
+    assert best_concurrency([]) == (None, False)
+    assert best_concurrency([_level(1, None, None), _level(2, 0.0, 0.0)]) == (None, False)
+    assert best_concurrency([_level(1, None, None), _level(2, 30.0)]) == (2, True)
+
+
+class _FlakyClient:
+    """Reads fail in turn with a gateway exception (0x0B), a slave exception (0x02) and succeed."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def read_holding_registers(self, address, count, slave_id, priority):
+        self.calls += 1
+        code = (0x0B, 0x02, None)[self.calls % 3]
+        if code is not None:
+            raise exception_error("read_holding_registers", SimpleNamespace(exception_code=code))
+        return [0]
+
+
+def test_gateway_exceptions_count_as_timeouts():
+    client = _FlakyClient()
+    result = asyncio.run(async_link_test(client, 1, "read", 0, None, 30, None, 1))
+    assert result["operations"] == 30
+    assert result["timeouts"] == 10
+    assert result["errors"] == 10
+    assert result["timeout_rate"] == round(10 / 30, 4)
+    assert result["aborted"] is None
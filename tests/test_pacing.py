@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.smartelektra_tools.const import (
+    PACING_MAX_BOOST,
+    PACING_MIN_SAMPLES,
+    PACING_OFFLINE_AFTER,
+    PACING_TIMEOUT_FACTOR,
+)
+from custom_components.smartelektra_tools.exceptions import exception_error
+from custom_components.smartelektra_tools.pacing import AdaptivePacer
+from custom_components.smartelektra_tools.stats import OUTCOME_OK, OUTCOME_TIMEOUT, LinkStats, outcome_of
+
+GAP_STEP = 0.01
+
+
+def _pacer(max_timeout=3.0, turnaround=0.0):
+    stats = LinkStats()
+    pacer = AdaptivePacer(stats, max_timeout, min_timeout=0.1, gap_step=GAP_STEP, max_gap=0.1, turnaround=turnaround)
+    return stats, pacer
+
+
+def _reply(stats, pacer, slave_id, seconds):
+    stats.record("read_holding_registers", slave_id, seconds, OUTCOME_OK)
+    pacer.record(slave_id, OUTCOME_OK)
+
+
+def _miss(stats, pacer, slave_id, outcome=OUTCOME_TIMEOUT):
+    stats.record("read_holding_registers", slave_id, 0.0, outcome)
+    pacer.record(slave_id, outcome)
+
+
+def test_timeout_is_learnt_from_replies():
+    stats, pacer = _pacer()
+    assert pacer.timeout(1) == 3.0
+    for _ in range(PACING_MIN_SAMPLES):
+        _reply(stats, pacer, 1, 0.05)
+    assert pacer.timeout(1) == pytest.approx(0.05 * PACING_TIMEOUT_FACTOR)
+    # slaves without replies of their own use the link-wide value
+    assert pacer.timeout(2) == pytest.approx(0.05 * PACING_TIMEOUT_FACTOR)
+
+
+def test_learnt_timeout_keeps_the_minimum():
+    stats, pacer = _pacer()
+    for _ in range(PACING_MIN_SAMPLES):
+        _reply(stats, pacer, 1, 0.005)
+    assert pacer.timeout(1) == 0.1
+
+
+def test_timeout_never_below_gateway_turnaround_per_queued_frame():
+    stats, pacer = _pacer(max_timeout=0.5, turnaround=0.3)
+    for _ in range(PACING_MIN_SAMPLES):
+        _reply(stats, pacer, 1, 0.005)
+    assert pacer.timeout(1) == pytest.approx(0.3)
+    assert pacer.timeout(1, queued=2) == pytest.approx(0.9)
+    assert pacer.floor(1) == pytest.approx(0.6)
+
+
+def test_misses_boost_the_timeout_until_the_slave_is_offline():
+    stats, pacer = _pacer()
+    for _ in range(PACING_MIN_SAMPLES):
+        _reply(stats, pacer, 1, 0.1)
+    learnt = pacer.timeout(1)
+    _miss(stats, pacer, 1)
+    assert pacer.timeout(1) == pytest.approx(learnt * 2)
+    for _ in range(PACING_OFFLINE_AFTER - 1):
+        _miss(stats, pacer, 1)
+    # offline: back to the plain timeout so polling it stays cheap
+    assert pacer.timeout(1) == pytest.approx(learnt)
+    _reply(stats, pacer, 1, 0.1)
+    assert pacer.timeout(1) == pytest.approx(learnt * PACING_MAX_BOOST / 2)
+
+
+def test_gap_grows_on_a_miss_and_shrinks_with_replies():
+    stats, pacer = _pacer()
+    _reply(stats, pacer, 1, 0.01)
+    _miss(stats, pacer, 1)
+    assert pacer.gap == pytest.approx(GAP_STEP)
+    assert pacer.gap_increases == 1
+    # further misses of the same slave are not new congestion
+    _miss(stats, pacer, 1)
+    assert pacer.gap == pytest.approx(GAP_STEP)
+    _reply(stats, pacer, 1, 0.01)
+    _reply(stats, pacer, 2, 0.01)
+    assert pacer.gap == pytest.approx(GAP_STEP - 2 * GAP_STEP / 10)
+
+
+def test_gap_doubles_up_to_the_maximum():
+    stats, pacer = _pacer()
+    for _ in range(6):
+        _reply(stats, pacer, 1, 0.01)
+        _miss(stats, pacer, 1)
+    assert pacer.gap == pytest.approx(0.1)
+
+
+def test_dead_slaves_do_not_grow_the_gap():
+    stats, pacer = _pacer()
+    for slave_id in range(10, 20):
+        _miss(stats, pacer, slave_id)
+    assert pacer.gap == 0.0
+    assert pacer.gap_increases == 0
+
+
+def test_gateway_exception_is_a_miss():
+    stats, pacer = _pacer()
+    _reply(stats, pacer, 1, 0.01)
+    _miss(stats, pacer, 1, outcome_of(exception_error("read_coils", SimpleNamespace(exception_code=0x0B))))
+    assert pacer.gap == pytest.approx(GAP_STEP)
+    assert stats.timeouts == 1
@@ -0,0 +1,38 @@
+import pytest
+
+from custom_components.smartelektra_tools.provisioning import check_pairs
+
+
+def test_plain_moves_and_unchanged_ids_pass():
+    check_pairs([(1, 10), (2, 11), (3, 3)])
+    check_pairs([])
+
+
+def test_chains_pass():
+    check_pairs([(1, 2), (2, 3), (3, 4)])
+    check_pairs([(3, 4), (2, 3), (1, 2)])
+
+
+@pytest.mark.parametrize(
+    "pairs",
+    [
+        [(1, 2), (2, 1)],
+        [(1, 2), (2, 3), (3, 1)],
+        [(5, 6), (1, 2), (2, 3), (3, 1)],
+    ],
+)
+def test_cycles_are_rejected(pairs):
+    with pytest.raises(ValueError, match="cycle"):
+        check_pairs(pairs)
+
+
+def test_duplicate_new_ids_are_rejected():
+    with pytest.raises(ValueError, match="new slave IDs"):
+        check_pairs([(1, 5), (2, 5)])
+    with pytest.raises(ValueError, match="new slave IDs"):
+        check_pairs([(1, 2), (2, 2)])
+
+
+def test_duplicate_current_ids_are_rejected():
+    with pytest.raises(ValueError, match="current slave IDs"):
+        check_pairs([(1, 5), (1, 6)])
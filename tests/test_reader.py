@@ -0,0 +1,47 @@
+import asyncio
+import struct
+
+import pytest
+
+from custom_components.smartelektra_tools.reader import async_read_range, decode_registers
+
+
+def _float_words(value):
+    return list(struct.unpack(">2H", struct.pack(">f", value)))
+
+
+def test_16_bit_types():
+    assert decode_registers([0, 1, 0xFFFF]) == [0, 1, 0xFFFF]
+    assert decode_registers([0, 1, 0xFFFF, 0x8000], "int16") == [0, 1, -1, -32768]
+
+
+def test_32_bit_types_and_word_order():
+    assert decode_registers([0x0001, 0x0002], "uint32") == [0x00010002]
+    assert decode_registers([0x0002, 0x0001], "uint32", "little") == [0x00010002]
+    assert decode_registers([0xFFFF, 0xFFFE], "int32") == [-2]
+    assert decode_registers(_float_words(1.5) + _float_words(-0.25), "float32") == [1.5, -0.25]
+    assert decode_registers(list(reversed(_float_words(1.5))), "float32", "little") == [1.5]
+
+
+def test_non_finite_floats_become_none():
+    assert decode_registers(_float_words(float("nan")) + _float_words(float("inf")), "float32") == [None, None]
+
+
+def test_odd_register_count_for_32_bit_types():
+    with pytest.raises(ValueError, match="multiple of 2"):
+        decode_registers([1, 2, 3], "uint32")
+
+
+def test_range_is_split_into_frames_and_reassembled():
+    class Client:
+        def __init__(self):
+            self.frames = []
+
+        async def read_holding_registers(self, address, count, slave_id, priority):
+            self.frames.append((address, count))
+            return list(range(address, address + count))
+
+    client = Client()
+    values = asyncio.run(async_read_range(client, "holding_registers", 10, 300, 1))
+    assert values == list(range(10, 310))
+    assert client.frames == [(10, 125), (135, 125), (260, 50)]
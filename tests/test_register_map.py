@@ -0,0 +1,28 @@
+from custom_components.smartelektra_tools.register_map import plan_blocks, plan_runs
+
+
+def test_blocks_merge_neighbours_within_the_gap():
+    assert plan_blocks([0, 1, 2, 5, 6], 125) == [(0, 3), (5, 2)]
+    assert plan_blocks([0, 1, 2, 5, 6], 125, max_gap=2) == [(0, 7)]
+    assert plan_blocks([0, 1, 2, 5, 6], 125, max_gap=1) == [(0, 3), (5, 2)]
+
+
+def test_blocks_ignore_order_and_duplicates():
+    assert plan_blocks([6, 0, 5, 0, 1], 125, max_gap=3) == [(0, 7)]
+    assert plan_blocks([], 125, max_gap=3) == []
+
+
+def test_blocks_stay_within_max_count():
+    assert plan_blocks(range(10), 4) == [(0, 4), (4, 4), (8, 2)]
+    assert plan_blocks([0, 3, 4], 4, max_gap=2) == [(0, 4), (4, 1)]
+    assert all(count <= 2000 for _, count in plan_blocks(range(0, 5000, 3), 2000, max_gap=2))
+
+
+def test_runs_split_on_holes():
+    assert plan_runs({4: 1, 2: 7, 3: 8, 9: 0}) == [(2, [7, 8, 1]), (9, [0])]
+    assert plan_runs({}) == []
+
+
+def test_runs_respect_the_limit():
+    values = {addr: addr * 10 for addr in range(5)}
+    assert plan_runs(values, 2) == [(0, [0, 10]), (2, [20, 30]), (4, [40])]
@@ -0,0 +1,143 @@
+import asyncio
+
+from custom_components.smartelektra_tools.const import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    PRIORITY_SERVICE,
+)
+from custom_components.smartelektra_tools.scheduler import RequestScheduler
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _queue(scheduler, requests, granted):
+    """Start one acquire per (priority, slave, tag) and log the tags as they are granted."""
+
+    async def one(priority, slave_id, tag):
+        await scheduler.acquire(priority, slave_id)
+        granted.append((priority, tag))
+
+    tasks = []
+    for priority, slave_id, tag in requests:
+        tasks.append(asyncio.create_task(one(priority, slave_id, tag)))
+        await _settle()
+    return tasks
+
+
+async def _drain(scheduler, granted, start=0):
+    """Release every grant in turn until nothing is left waiting."""
+    index = start
+    while index < len(granted):
+        scheduler.release(granted[index][0])
+        index += 1
+        await _settle()
+
+
+def test_priority_classes_go_in_order():
+    async def run():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire(PRIORITY_SERVICE, 1)
+        granted = []
+        await _queue(
+            scheduler,
+            [(PRIORITY_BULK, 1, "bulk"), (PRIORITY_POLL, 1, "poll"), (PRIORITY_SERVICE, 1, "service"),
+             (PRIORITY_INTERACTIVE, 1, "interactive")],
+            granted,
+        )
+        assert granted == []
+        scheduler.release(PRIORITY_SERVICE)
+        await _settle()
+        await _drain(scheduler, granted)
+        return granted, scheduler
+
+    granted, scheduler = asyncio.run(run())
+    assert [tag for _, tag in granted] == ["interactive", "service", "poll", "bulk"]
+    assert scheduler.active == 0
+
+
+def test_slaves_take_turns_within_a_class():
+    async def run():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire(PRIORITY_POLL, 9)
+        granted = []
+        await _queue(
+            scheduler,
+            [(PRIORITY_POLL, 1, "1a"), (PRIORITY_POLL, 1, "1b"), (PRIORITY_POLL, 1, "1c"),
+             (PRIORITY_POLL, 2, "2a"), (PRIORITY_POLL, 3, "3a")],
+            granted,
+        )
+        scheduler.release(PRIORITY_POLL)
+        await _settle()
+        await _drain(scheduler, granted)
+        return granted
+
+    # a busy slave does not starve the others
+    assert [tag for _, tag in asyncio.run(run())] == ["1a", "2a", "3a", "1b", "1c"]
+
+
+def test_background_leaves_a_slot_for_interactive_frames():
+    async def run():
+        scheduler = RequestScheduler(2)
+        granted = []
+        await _queue(scheduler, [(PRIORITY_BULK, n, f"scan{n}") for n in range(1, 4)], granted)
+        # the scan holds one slot only, the other stays free
+        assert [tag for _, tag in granted] == ["scan1"]
+        await _queue(scheduler, [(PRIORITY_INTERACTIVE, 5, "switch")], granted)
+        assert [tag for _, tag in granted] == ["scan1", "switch"]
+        assert scheduler.active == 2
+        await _drain(scheduler, granted)
+        return granted, scheduler
+
+    granted, scheduler = asyncio.run(run())
+    assert [tag for _, tag in granted] == ["scan1", "switch", "scan2", "scan3"]
+    assert scheduler.active == 0
+
+
+def test_single_slot_is_not_reserved():
+    async def run():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire(PRIORITY_BULK, 1)
+        return scheduler.active
+
+    assert asyncio.run(run()) == 1
+
+
+def test_cancelled_waiter_is_skipped():
+    async def run():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire(PRIORITY_SERVICE, 1)
+        granted = []
+        tasks = await _queue(scheduler, [(PRIORITY_SERVICE, 2, "gone"), (PRIORITY_SERVICE, 3, "next")], granted)
+        tasks[0].cancel()
+        await _settle()
+        scheduler.release(PRIORITY_SERVICE)
+        await _settle()
+        assert [tag for _, tag in granted] == ["next"]
+        scheduler.release(PRIORITY_SERVICE)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.active == 0
+    assert scheduler.snapshot()["waiting"]["service"] == 0
+
+
+def test_cancellation_after_the_grant_gives_the_slot_back():
+    async def run():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire(PRIORITY_POLL, 1)
+        waiter = asyncio.create_task(scheduler.acquire(PRIORITY_POLL, 2))
+        await _settle()
+        # grant and cancel before the waiter runs again
+        scheduler.release(PRIORITY_POLL)
+        waiter.cancel()
+        await _settle()
+        assert waiter.cancelled()
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.active == 0
+    assert scheduler.snapshot()["background"] == 0
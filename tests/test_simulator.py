@@ -0,0 +1,61 @@
+import asyncio
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+from simulator import EX_TARGET_FAILED, HR_SLAVE_ID, Simulator  # noqa: E402
+
+
+def _write_register(address, value):
+    return struct.pack(">BHH", 6, address, value)
+
+
+def _read_registers(address, count):
+    return struct.pack(">BHH", 3, address, count)
+
+
+def _run(sim, *frames):
+    async def run():
+        return [await sim._transact(unit, pdu) for unit, pdu in frames]
+
+    return asyncio.run(run())
+
+
+def test_readdress_to_a_free_id_moves_the_module():
+    sim = Simulator([1, 2], latency=0)
+    reply, read = _run(sim, (1, _write_register(HR_SLAVE_ID, 5)), (5, _read_registers(HR_SLAVE_ID, 1)))
+    assert reply == _write_register(HR_SLAVE_ID, 5)
+    assert read == bytes([3, 2]) + struct.pack(">H", 5)
+    assert sorted(sim.slaves) == [2, 5]
+
+
+def test_readdress_to_a_taken_id_collides():
+    sim = Simulator([1, 2], latency=0, gateway_exceptions=True)
+    _, read, write = _run(
+        sim,
+        (1, _write_register(HR_SLAVE_ID, 2)),
+        (2, _read_registers(HR_SLAVE_ID, 1)),
+        (2, _write_register(2, 1)),
+    )
+    assert list(sim.slaves) == [2]
+    assert len(sim.slaves[2]) == 2
+    # both modules answer at once: the gateway reports the slave as unreachable
+    assert read == bytes([0x83, EX_TARGET_FAILED])
+    assert write == bytes([0x86, EX_TARGET_FAILED])
+    assert sim.collisions == 2
+    # yet both modules heard the write
+    assert [module.registers[2] for module in sim.slaves[2]] == [1, 1]
+
+
+def test_broadcast_readdress_puts_every_module_on_one_id():
+    sim = Simulator([1, 2, 3], latency=0)
+    reply, read = _run(sim, (0, _write_register(HR_SLAVE_ID, 9)), (9, _read_registers(HR_SLAVE_ID, 1)))
+    assert reply is None
+    assert read is None
+    assert list(sim.slaves) == [9]
+    assert len(sim.slaves[9]) == 3
+    # moving them on one by one is impossible, as on a real bus
+    _run(sim, (9, _write_register(HR_SLAVE_ID, 10)))
+    assert list(sim.slaves) == [10]
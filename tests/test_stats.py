@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.smartelektra_tools.exceptions import GatewayError, ModbusExceptionError, exception_error
+from custom_components.smartelektra_tools.stats import (
+    OUTCOME_ERROR,
+    OUTCOME_EXCEPTION,
+    OUTCOME_OK,
+    OUTCOME_TIMEOUT,
+    LinkStats,
+    outcome_of,
+)
+
+
+def _reply(code):
+    return SimpleNamespace(exception_code=code)
+
+
+def test_gateway_exceptions_count_as_timeouts():
+    for code in (0x0A, 0x0B):
+        err = exception_error("read_coils", _reply(code))
+        assert isinstance(err, GatewayError)
+        assert outcome_of(err) == OUTCOME_TIMEOUT
+
+
+def test_slave_exceptions_stay_exceptions():
+    for code in (0x01, 0x02, 0x03, 0x04):
+        err = exception_error("read_coils", _reply(code))
+        assert isinstance(err, ModbusExceptionError)
+        assert err.code == code
+        assert outcome_of(err) == OUTCOME_EXCEPTION
+
+
+def test_other_failures():
+    assert outcome_of(asyncio.TimeoutError()) == OUTCOME_TIMEOUT
+    assert outcome_of(ConnectionError("gone")) == OUTCOME_ERROR
+
+
+def test_timeouts_counter_includes_gateway_exceptions():
+    stats = LinkStats()
+    stats.record("read_coils", 3, 0.01)
+    stats.record("read_coils", 3, 0.2, outcome_of(exception_error("read_coils", _reply(0x0B))))
+    stats.record("read_coils", 3, 0.01, outcome_of(exception_error("read_coils", _reply(0x02))))
+    assert stats.timeouts == 1
+    assert stats.exceptions == 1
+    assert stats.outcomes[OUTCOME_OK] == 1
+    assert stats.slave_errors == {3: 2}
+    # the gateway timeout carries no latency sample
+    assert stats.latency.count == 2
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from custom_components.smartelektra_tools.const import PRIORITY_INTERACTIVE, PRIORITY_SERVICE
+from custom_components.smartelektra_tools.modbus_client import _WriteCoalescer
+
+
+class _Client:
+    """Records the write frames the coalescer sends."""
+
+    def __init__(self, fail=False):
+        self.frames = []
+        self.fail = fail
+
+    async def _write(self, name, address, value, slave_id, force, priority):
+        self.frames.append((name, slave_id, address, value, priority))
+        if self.fail:
+            raise ConnectionError("gone")
+
+    async def write_coil(self, address, value, slave_id, force, priority):
+        await self._write("write_coil", address, value, slave_id, force, priority)
+
+    async def write_coils(self, address, values, slave_id, force, priority):
+        await self._write("write_coils", address, values, slave_id, force, priority)
+
+    async def write_register(self, address, value, slave_id, force, priority):
+        await self._write("write_register", address, value, slave_id, force, priority)
+
+    async def write_registers(self, address, values, slave_id, force, priority):
+        await self._write("write_registers", address, values, slave_id, force, priority)
+
+
+def _run(client, writes):
+    async def run():
+        coalescer = _WriteCoalescer(client, 0.01)
+        futures = [coalescer.submit(*write) for write in writes]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    return asyncio.run(run())
+
+
+def test_neighbours_merge_into_one_frame():
+    client = _Client()
+    results = _run(
+        client,
+        [("coils", 1, 2, True), ("coils", 1, 0, True), ("coils", 1, 1, False), ("coils", 1, 5, True),
+         ("registers", 1, 7, 300), ("registers", 1, 8, 301)],
+    )
+    assert results == [None] * 6
+    assert sorted(client.frames) == [
+        ("write_coil", 1, 5, True, PRIORITY_SERVICE),
+        ("write_coils", 1, 0, [True, False, True], PRIORITY_SERVICE),
+        ("write_registers", 1, 7, [300, 301], PRIORITY_SERVICE),
+    ]
+
+
+def test_same_address_keeps_the_last_value():
+    client = _Client()
+    results = _run(client, [("registers", 3, 4, 1), ("registers", 3, 4, 2), ("registers", 3, 4, 3)])
+    assert results == [None] * 3
+    assert client.frames == [("write_register", 3, 4, 3, PRIORITY_SERVICE)]
+
+
+def test_slaves_are_not_merged():
+    client = _Client()
+    _run(client, [("coils", 1, 0, True), ("coils", 2, 1, True)])
+    assert sorted(client.frames) == [
+        ("write_coil", 1, 0, True, PRIORITY_SERVICE),
+        ("write_coil", 2, 1, True, PRIORITY_SERVICE),
+    ]
+
+
+def test_merged_frame_takes_the_most_urgent_priority():
+    client = _Client()
+    _run(client, [("coils", 1, 0, True, PRIORITY_SERVICE), ("coils", 1, 1, True, PRIORITY_INTERACTIVE)])
+    assert client.frames == [("write_coils", 1, 0, [True, True], PRIORITY_INTERACTIVE)]
+
+
+def test_failure_reaches_every_merged_write():
+    results = _run(_Client(fail=True), [("coils", 1, 0, True), ("coils", 1, 1, True)])
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_cancel_fails_pending_writes():
+    async def run():
+        coalescer = _WriteCoalescer(_Client(), 10.0)
+        fut = coalescer.submit("coils", 1, 0, True)
+        coalescer.cancel()
+        with pytest.raises(ConnectionError):
+            await fut
+
+    asyncio.run(run())
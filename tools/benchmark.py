@@ -0,0 +1,282 @@
+"""Throughput benchmark of the integration's Modbus paths against tools/simulator.py.
+
+Each scenario starts a fresh in-process simulator and client and calls the
+client, scanner and provisioning functions the services are built on directly
+(not the Home Assistant service handlers, so target resolution and schema
+validation are not measured), then reports ops/s, latency percentiles and the
+frames the simulator saw. Only pymodbus and PyYAML are needed: the integration
+modules are imported without Home Assistant.
+
+    python tools/benchmark.py                      # print the results
+    python tools/benchmark.py --save out.json      # keep them
+    python tools/benchmark.py --baseline tools/benchmark_baseline.json
+                                                   # exit 1 on a regression
+
+With ``--baseline`` a scenario fails on any error or when it needs more frames
+than the baseline; both are deterministic. Its ops/s are compared too (failing
+more than ``--tolerance`` below the baseline), but only when the installed
+pymodbus is the version the baseline was recorded with, as throughput depends
+on how that version pipelines frames.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+import types
+from typing import Any, Awaitable, Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from simulator import Simulator  # noqa: E402
+
+INTEGRATION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components", "smartelektra_tools"
+)
+PACKAGE = "smartelektra_tools"
+
+
+def _load_integration() -> types.SimpleNamespace:
+    """Import the Home Assistant independent modules (the package __init__ is skipped)."""
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [INTEGRATION_DIR]
+    sys.modules[PACKAGE] = package
+    modules = {
+        name: importlib.import_module(f"{PACKAGE}.{name}")
+        for name in ("const", "modbus_client", "provisioning", "scanner")
+    }
+    return types.SimpleNamespace(**modules)
+
+
+def _percentile(ordered: list[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+def _result(ops: int, elapsed: float, latencies: list[float], errors: int, **extra: Any) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "ops": ops,
+        "elapsed": round(elapsed, 3),
+        "ops_s": round(ops / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "errors": errors,
+        **extra,
+    }
+
+
+async def _timed(calls: list[Callable[[], Awaitable[Any]]], concurrent: bool) -> tuple[float, list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(call: Callable[[], Awaitable[Any]]) -> None:
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            await call()
+        except Exception:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(*(one(call) for call in calls))
+    else:
+        for call in calls:
+            await one(call)
+    return time.perf_counter() - t0, latencies, errors
+
+
+class Bench:
+    def __init__(self, se: types.SimpleNamespace, args: argparse.Namespace) -> None:
+        self.se = se
+        self.args = args
+        self.slaves = list(range(1, args.slaves + 1))
+
+    def simulator(self) -> Simulator:
+        return Simulator(
+            self.slaves,
+            latency=self.args.latency / 1000,
+            jitter=self.args.jitter / 1000,
+            drop=self.args.drop,
+            rtu_timeout=self.args.rtu_timeout / 1000,
+            seed=1,
+        )
+
+    def client(self, port: int) -> Any:
+        # the simulated gateway answers or gives up within its RTU wait plus one frame
+        turnaround = (self.args.rtu_timeout + self.args.latency + self.args.jitter) / 1000
+        return self.se.modbus_client.AsyncModbusTcpClientCompat(
+            "127.0.0.1", port, timeout=self.args.timeout, turnaround=turnaround
+        )
+
+    async def write_sequential(self, client: Any, simulator: Simulator) -> dict[str, Any]:
+        """write_register service, one call after another."""
+        slaves, n = self.slaves, self.args.ops
+        calls = [
+            (lambda i=i: client.write_register(1, i % 2, slaves[i % len(slaves)], force=True)) for i in range(n)
+        ]
+        return _result(n, *await _timed(calls, concurrent=False))
+
+    async def write_concurrent(self, client: Any, simulator: Simulator) -> dict[str, Any]:
+        """write_coil/write_register services fired together (coalesced per slave)."""
+        slaves, n = self.slaves, self.args.ops
+        calls = [
+            (
+                lambda i=i: client.queue_write_register(2, i % 2, slaves[i % len(slaves)], force=True)
+                if i % 2
+                else client.queue_write_coil(0, bool(i % 4), slaves[i % len(slaves)], force=True)
+            )
+            for i in range(n)
+        ]
+        return _result(n, *await _timed(calls, concurrent=True), frames=simulator.frames)
+
+    async def write_sync(self, client: Any, simulator: Simulator) -> dict[str, Any]:
+        """Blocking ModbusTcpClientCompat, as used from executor threads."""
+        port = client.port
+        sync_client = self.se.modbus_client.ModbusTcpClientCompat("127.0.0.1", port, timeout=self.args.timeout)
+        slaves, n = self.slaves, self.args.ops
+
+        def run() -> tuple[float, list[float], int]:
+            latencies: list[float] = []
+            errors = 0
+            t_start = time.perf_counter()
+            for i in range(n):
+                t0 = time.perf_counter()
+                try:
+                    sync_client.write_register(1, i % 2, slaves[i % len(slaves)])
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+            return time.perf_counter() - t_start, latencies, errors
+
+        try:
+            return _result(n, *await asyncio.get_running_loop().run_in_executor(None, run))
+        finally:
+            sync_client.close()
+
+    async def broadcast(self, client: Any, simulator: Simulator) -> dict[str, Any]:
+        """set_slave_id-style broadcasts (slave 0, no reply)."""
+        n = max(1, self.args.ops // 10)
+        calls = [(lambda i=i: client.broadcast_write_coil(0, bool(i % 2))) for i in range(n)]
+        return _result(n, *await _timed(calls, concurrent=False))
+
+    async def scan(self, client: Any, simulator: Simulator) -> dict[str, Any]:
+        """scan_bus service over IDs 1..247."""
+        t0 = time.perf_counter()
+        result = await self.se.scanner.async_scan_bus(client, 1, 247, timeout=self.args.scan_timeout)
+        elapsed = time.perf_counter() - t0
+        return _result(result["probed"], elapsed, [], 0, found=len(result["slaves"]))
+
+    async def provision(self, client: Any, simulator: Simulator) -> dict[str, Any]:
+        """provision_slaves service: move every slave to ID + 100 and back, verified."""
+        provision = self.se.provisioning.async_provision_slaves
+        latencies: list[float] = []
+        failed = 0
+        t0 = time.perf_counter()
+        for pairs in ([(s, s + 100) for s in self.slaves], [(s + 100, s) for s in self.slaves]):
+            result = await provision(client, pairs)
+            failed += result["failed"]
+            latencies.extend(device["elapsed"] for device in result["devices"] if device["status"] == "ok")
+        elapsed = time.perf_counter() - t0
+        return _result(2 * len(self.slaves), elapsed, latencies, failed)
+
+    async def run(self, name: str) -> dict[str, Any]:
+        simulator = self.simulator()
+        port = await simulator.start()
+        client = self.client(port)
+        try:
+            await client.connect()
+            result = await getattr(self, name)(client, simulator)
+        finally:
+            await client.close()
+            await simulator.close()
+        result.setdefault("frames", simulator.frames)
+        return result
+
+
+SCENARIOS = ("write_sequential", "write_concurrent", "write_sync", "broadcast", "scan", "provision")
+
+
+def _regressions(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    failures = []
+    same_pymodbus = baseline.get("pymodbus") == importlib.import_module("pymodbus").__version__
+    for name, result in results.items():
+        expected = (baseline.get("scenarios") or {}).get(name, {})
+        if result["errors"]:
+            failures.append(f"{name}: {result['errors']} errors")
+        if expected.get("frames") is not None and result["frames"] > expected["frames"]:
+            failures.append(f"{name}: {result['frames']} frames, baseline {expected['frames']} frames")
+        if not same_pymodbus or not expected.get("ops_s") or result["ops_s"] is None:
+            continue
+        if result["ops_s"] < expected["ops_s"] * (1 - tolerance):
+            failures.append(f"{name}: {result['ops_s']} ops/s, baseline {expected['ops_s']} ops/s")
+    return failures
+
+
+async def _main(args: argparse.Namespace) -> int:
+    se = _load_integration()
+    bench = Bench(se, args)
+    names = args.scenario or list(SCENARIOS)
+    results: dict[str, Any] = {}
+    print(f"{'scenario':<18}{'ops':>6}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'frames':>8}{'errors':>8}")
+    for name in names:
+        result = results[name] = await bench.run(name)
+        print(
+            f"{name:<18}{result['ops']:>6}{result['ops_s'] or '-':>10}{result['p50_ms'] or '-':>9}"
+            f"{result['p95_ms'] or '-':>9}{result['p99_ms'] or '-':>9}{result['frames']:>8}{result['errors']:>8}",
+            flush=True,
+        )
+    report = {
+        "pymodbus": importlib.import_module("pymodbus").__version__,
+        "settings": {
+            key: getattr(args, key)
+            for key in ("slaves", "ops", "latency", "jitter", "drop", "rtu_timeout", "timeout", "scan_timeout")
+        },
+        "scenarios": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline.get("pymodbus") != report["pymodbus"]:
+            print(f"pymodbus {report['pymodbus']}, baseline {baseline.get('pymodbus')}: ops/s not compared")
+        failures = _regressions(results, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only these (repeatable)")
+    parser.add_argument("--slaves", type=int, default=32, help="simulated slaves, IDs 1..N")
+    parser.add_argument("--ops", type=int, default=400, help="operations per write scenario")
+    parser.add_argument("--latency", type=float, default=2.0, help="simulated bus time per frame (ms)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="+/- random part of the latency (ms)")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability that a frame gets no reply")
+    parser.add_argument("--rtu-timeout", type=float, default=20.0, help="gateway wait for an absent slave (ms)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="client timeout (s)")
+    parser.add_argument("--scan-timeout", type=float, default=0.1, help="scan probe timeout (s)")
+    parser.add_argument("--save", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare with a saved result and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed ops/s drop against the baseline")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
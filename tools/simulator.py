@@ -0,0 +1,287 @@
+"""Simulated SmartElektra RS-485 bus behind a Modbus TCP gateway.
+
+Every simulated slave runs the SmartElektra Arduino firmware register map:
+HR0 holds the slave ID (writing 1..247 re-addresses the module), HR1 the button
+mode (0 mono, 1 bi), HR2 the output level (0 low, 1 high) and coil 0 the test
+output. With ``--change-counter`` HR3 counts (mod 65536) the writes that
+changed a value, like firmware with a change sequence register. Further
+coils/registers are plain storage up to ``--coils``/``--registers``; addresses
+beyond answer with exception 02.
+
+The gateway side speaks Modbus TCP (MBAP) directly on asyncio streams, so frames
+can be delayed, jittered and dropped individually. Like a real gateway it puts
+one frame at a time on the bus: a frame occupies the bus for ``latency`` +/-
+``jitter``; a frame to an absent slave for ``rtu_timeout``, after which the
+gateway stays silent (or answers exception 0x0B with ``--gateway-exceptions``).
+Broadcasts (unit 0) reach every slave and get no reply. Re-addressing a module
+to an ID already in use (or broadcasting a new ID) leaves several modules on one
+ID: all of them act on its frames and answer at once, so the gateway sees a
+garbled reply and treats it like an absent slave.
+
+    python tools/simulator.py --port 5020 --slaves 1-32 --latency 5 --jitter 2 --drop 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import struct
+from typing import Iterable, Optional
+
+HR_SLAVE_ID = 0
+HR_BUTTON_MODE = 1
+HR_OUTPUT_LEVEL = 2
+HR_CHANGE_COUNTER = 3
+COIL_TEST_OUTPUT = 0
+
+EX_ILLEGAL_FUNCTION = 0x01
+EX_ILLEGAL_ADDRESS = 0x02
+EX_ILLEGAL_VALUE = 0x03
+EX_TARGET_FAILED = 0x0B
+
+
+class SimulatedSlave:
+    """Coils and holding registers of one module (inputs mirror them)."""
+
+    __slots__ = ("coils", "registers")
+
+    def __init__(self, slave_id: int, coils: int, registers: int) -> None:
+        self.coils = [False] * coils
+        self.registers = [0] * registers
+        self.registers[HR_SLAVE_ID] = slave_id
+
+
+def parse_slaves(spec: str) -> list[int]:
+    """'1-32,40' -> [1, ..., 32, 40]"""
+    slaves: list[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        slaves.extend(range(int(first), int(last or first) + 1))
+    return slaves
+
+
+def _exception(fc: int, code: int) -> bytes:
+    return bytes([fc | 0x80, code])
+
+
+def _pack_bits(bits: list[bool]) -> bytes:
+    out = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            out[i // 8] |= 1 << (i % 8)
+    return bytes(out)
+
+
+class Simulator:
+    """Modbus TCP gateway with many simulated slaves on one half-duplex bus."""
+
+    def __init__(
+        self,
+        slaves: Iterable[int],
+        latency: float = 0.002,
+        jitter: float = 0.0,
+        drop: float = 0.0,
+        rtu_timeout: float = 0.05,
+        gateway_exceptions: bool = False,
+        change_counter: bool = False,
+        coils: int = 16,
+        registers: int = 16,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._coils = max(1, coils)
+        self._registers = max(HR_CHANGE_COUNTER + 1, registers)
+        # modules listening on each slave ID; more than one is an address collision
+        self.slaves: dict[int, list[SimulatedSlave]] = {
+            slave_id: [SimulatedSlave(slave_id, self._coils, self._registers)] for slave_id in slaves
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.drop = drop
+        self.rtu_timeout = rtu_timeout
+        self.gateway_exceptions = gateway_exceptions
+        self.change_counter = change_counter
+        self._random = random.Random(seed)
+        self._bus = asyncio.Lock()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.frames = 0
+        self.dropped = 0
+        self.unanswered = 0
+        self.collisions = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen and return the bound port (``port`` 0 picks a free one)."""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _frame_time(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                tid, _pid, length, unit = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                reply = await self._transact(unit, pdu)
+                if reply is None:
+                    continue
+                writer.write(struct.pack(">HHHB", tid, 0, len(reply) + 1, unit) + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # client gone, or the server is closing
+            pass
+        finally:
+            writer.close()
+
+    async def _transact(self, unit: int, pdu: bytes) -> Optional[bytes]:
+        async with self._bus:
+            self.frames += 1
+            if unit != 0 and unit not in self.slaves:
+                await asyncio.sleep(self.rtu_timeout)
+                self.unanswered += 1
+                return _exception(pdu[0], EX_TARGET_FAILED) if self.gateway_exceptions else None
+            await asyncio.sleep(self._frame_time())
+            if self.drop and self._random.random() < self.drop:
+                self.dropped += 1
+                return None
+            if unit == 0:
+                for slave in [slave for modules in self.slaves.values() for slave in modules]:
+                    self._apply(slave, pdu)
+                return None
+            modules = list(self.slaves[unit])
+            replies = [self._apply(slave, pdu) for slave in modules]
+            if len(modules) > 1:
+                # every module answers at once: the gateway gets no valid reply
+                self.collisions += 1
+                self.unanswered += 1
+                return _exception(pdu[0], EX_TARGET_FAILED) if self.gateway_exceptions else None
+            return replies[0]
+
+    def _changed(self, slave: SimulatedSlave) -> None:
+        if self.change_counter:
+            slave.registers[HR_CHANGE_COUNTER] = (slave.registers[HR_CHANGE_COUNTER] + 1) & 0xFFFF
+
+    def _readdress(self, slave: SimulatedSlave, new_id: int) -> None:
+        slave_id = slave.registers[HR_SLAVE_ID]
+        if 1 <= new_id <= 247 and new_id != slave_id:
+            modules = self.slaves[slave_id]
+            modules.remove(slave)
+            if not modules:
+                del self.slaves[slave_id]
+            # like the firmware, the module takes the ID even if another one already has it
+            self.slaves.setdefault(new_id, []).append(slave)
+            slave.registers[HR_SLAVE_ID] = new_id
+
+    def _apply(self, slave: SimulatedSlave, pdu: bytes) -> bytes:
+        fc = pdu[0]
+        if fc in (1, 2, 3, 4):
+            address, count = struct.unpack(">HH", pdu[1:5])
+            table = slave.coils if fc in (1, 2) else slave.registers
+            if count < 1 or address + count > len(table):
+                return _exception(fc, EX_ILLEGAL_ADDRESS)
+            if fc in (1, 2):
+                data = _pack_bits(slave.coils[address : address + count])
+            else:
+                data = struct.pack(f">{count}H", *slave.registers[address : address + count])
+            return bytes([fc, len(data)]) + data
+        if fc == 5:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            if address >= len(slave.coils):
+                return _exception(fc, EX_ILLEGAL_ADDRESS)
+            if value not in (0x0000, 0xFF00):
+                return _exception(fc, EX_ILLEGAL_VALUE)
+            if slave.coils[address] != (value == 0xFF00):
+                slave.coils[address] = value == 0xFF00
+                self._changed(slave)
+            return pdu[:5]
+        if fc == 6:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            if address >= len(slave.registers):
+                return _exception(fc, EX_ILLEGAL_ADDRESS)
+            if address == HR_SLAVE_ID:
+                self._readdress(slave, value)
+            elif slave.registers[address] != value:
+                slave.registers[address] = value
+                self._changed(slave)
+            return pdu[:5]
+        if fc == 15:
+            address, count, _nbytes = struct.unpack(">HHB", pdu[1:6])
+            if address + count > len(slave.coils):
+                return _exception(fc, EX_ILLEGAL_ADDRESS)
+            bits = [bool((pdu[6 + i // 8] >> (i % 8)) & 1) for i in range(count)]
+            if slave.coils[address : address + count] != bits:
+                slave.coils[address : address + count] = bits
+                self._changed(slave)
+            return pdu[:5]
+        if fc == 16:
+            address, count, _nbytes = struct.unpack(">HHB", pdu[1:6])
+            if address + count > len(slave.registers):
+                return _exception(fc, EX_ILLEGAL_ADDRESS)
+            values = struct.unpack(f">{count}H", pdu[6 : 6 + 2 * count])
+            changed = False
+            for i, value in enumerate(values):
+                if address + i != HR_SLAVE_ID and slave.registers[address + i] != value:
+                    slave.registers[address + i] = value
+                    changed = True
+            if changed:
+                self._changed(slave)
+            if address == HR_SLAVE_ID:
+                self._readdress(slave, values[0])
+            return pdu[:5]
+        return _exception(fc, EX_ILLEGAL_FUNCTION)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    simulator = Simulator(
+        parse_slaves(args.slaves),
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        drop=args.drop,
+        rtu_timeout=args.rtu_timeout / 1000,
+        gateway_exceptions=args.gateway_exceptions,
+        change_counter=args.change_counter,
+        coils=args.coils,
+        registers=args.registers,
+        seed=args.seed,
+    )
+    port = await simulator.start(args.host, args.port)
+    print(f"Simulating {len(simulator.slaves)} slaves on {args.host}:{port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--slaves", default="1-32", help="slave IDs, e.g. 1-32,40")
+    parser.add_argument("--latency", type=float, default=2.0, help="bus time per frame (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- random part of the latency (ms)")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability that a frame gets no reply")
+    parser.add_argument("--rtu-timeout", type=float, default=50.0, help="gateway wait for an absent slave (ms)")
+    parser.add_argument("--gateway-exceptions", action="store_true", help="answer 0x0B for absent slaves")
+    parser.add_argument("--change-counter", action="store_true", help="HR3 counts value changes")
+    parser.add_argument("--coils", type=int, default=16)
+    parser.add_argument("--registers", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=None)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()